@@ -0,0 +1,5 @@
+"""
+Benchmarks for the hot API endpoints against synthetic data.
+
+Run with ``python -m benchmarks`` from the backend directory; see ``--help``.
+"""
@@ -0,0 +1,91 @@
+"""
+Time the credit score factors on one user's synthetic split history, without a database.
+
+Example::
+
+    python -m benchmarks.credit_score_factors --splits 1000,10000 --repeat 20
+
+"records" converts the rows into SplitRecords, parsing each timestamp once,
+"score" runs the four factors on the records, and "rows_to_score" is both, as
+calculate_user_credit_score does. Times are the best of --repeat runs.
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from unittest.mock import MagicMock
+
+from core.supabase.operations.credit_score_operations import CreditScoreOperations
+from core.supabase.operations.credit_score_records import ExpenseRecord, SplitRecord
+
+
+def synthetic_history(splits: int, rng: random.Random) -> List[Tuple[Dict, Dict]]:
+    """(split row, expense row) pairs shaped like the credit_history projections."""
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = []
+    for index in range(splits):
+        created_at = start + timedelta(minutes=rng.randint(0, 500_000), microseconds=rng.randint(0, 999_999))
+        expense = {
+            "id": f"expense-{index}",
+            "created_at": created_at.isoformat(),
+            "due_date": (created_at + timedelta(days=14)).isoformat() if rng.random() < 0.7 else None,
+        }
+        requested = created_at + timedelta(hours=rng.randint(1, 500))
+        split = {
+            "id": f"split-{index}",
+            "expenseid": expense["id"],
+            "amount_owed": rng.randint(100, 10_000),
+            "paid_request": requested.isoformat().replace("+00:00", "Z") if rng.random() < 0.8 else None,
+            "paid_confirmed": (requested + timedelta(hours=rng.randint(0, 900))).isoformat() if rng.random() < 0.7 else None,
+        }
+        rows.append((split, expense))
+    return rows
+
+
+def best_ms(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started_at)
+    return round(best * 1000, 3)
+
+
+def run(splits: int, repeat: int, seed: int) -> Dict[str, Any]:
+    operations = CreditScoreOperations(MagicMock())
+    rows = synthetic_history(splits, random.Random(seed))
+
+    def to_records() -> List[SplitRecord]:
+        return [SplitRecord.from_row(split, ExpenseRecord.from_row(expense)) for split, expense in rows]
+
+    records = to_records()
+    timings = {
+        "records": best_ms(to_records, repeat),
+        "score": best_ms(lambda: operations._score_splits(records), repeat),
+        "rows_to_score": best_ms(lambda: operations._score_splits(to_records()), repeat),
+    }
+    return {
+        "splits": splits,
+        "credit_score": operations._score_splits(records),
+        "ms": timings,
+        "us_per_split": {name: round(ms * 1000 / splits, 3) for name, ms in timings.items()},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.credit_score_factors", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--splits", default="1000,10000", help="Comma-separated history lengths")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the history")
+    args = parser.parse_args(argv)
+
+    report = [run(int(splits), args.repeat, args.seed) for splits in args.splits.split(",") if splits]
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
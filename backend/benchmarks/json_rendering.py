@@ -0,0 +1,117 @@
+"""
+Measure the bytes and CPU time of rendering and compressing group expense responses, without a database.
+
+Example::
+
+    python -m benchmarks.json_rendering --expenses 100,1000,10000 --repeat 10
+
+The payloads are shaped like /api/expenses/group-expenses/ responses, built from
+the synthetic rows of benchmarks.seed. "render" compares the stock JSONRenderer
+with FastJSONRenderer (orjson when installed), "compress" times the encodings
+CompressionMiddleware can choose on the rendered body, and "per_response" sums
+both for the stock setup and the new one. CPU times are the best of --repeat
+runs, in process time.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .seed import build_rows
+
+
+def group_expenses_payload(expenses: int, seed: int) -> Dict[str, Any]:
+    """A group-expenses response with this many expenses and their splits and debtors."""
+    from core.supabase.operations.expense_operations import ExpenseOperations
+
+    # About three splits per expense
+    rows = build_rows(expenses * 3, seed)
+    users_by_id = {user["id"]: user for user in rows["users"]}
+    splits_by_expense: Dict[str, List[Dict]] = {}
+    for split in rows["splits"]:
+        splits_by_expense.setdefault(split["expenseid"], []).append(split)
+    selected = [dict(expense) for expense in rows["expenses"][:expenses]]
+    return {"expenses": ExpenseOperations._attach_all_splits(selected, splits_by_expense, users_by_id)}
+
+
+def best_cpu_ms(function: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started_at = time.process_time()
+        function()
+        best = min(best, time.process_time() - started_at)
+    return round(best * 1000, 3)
+
+
+def run(expenses: int, repeat: int, seed: int) -> Dict[str, Any]:
+    from rest_framework.renderers import JSONRenderer
+
+    from core.middleware import CompressionMiddleware, brotli
+    from core.renderers import FastJSONRenderer, orjson
+
+    payload = group_expenses_payload(expenses, seed)
+    renderers = {"JSONRenderer": JSONRenderer(), "FastJSONRenderer": FastJSONRenderer()}
+    bodies = {name: renderer.render(payload) for name, renderer in renderers.items()}
+    assert json.loads(bodies["JSONRenderer"]) == json.loads(bodies["FastJSONRenderer"])
+
+    render = {
+        name: {"bytes": len(bodies[name]), "cpu_ms": best_cpu_ms(lambda: renderer.render(payload), repeat)}
+        for name, renderer in renderers.items()
+    }
+
+    body = bodies["FastJSONRenderer"]
+    middleware = CompressionMiddleware(lambda request: None)
+    compressors = {
+        "identity": lambda: body,
+        f"gzip-{middleware.gzip_level}": lambda: b"".join(middleware._gzip_sequence([body])),
+    }
+    if middleware.gzip_level != 6:
+        # Django's GZipMiddleware level, for comparison
+        compressors["gzip-6"] = lambda: gzip.compress(body, compresslevel=6, mtime=0)
+    if brotli is not None:
+        compressors["br"] = lambda: brotli.compress(body, quality=middleware.brotli_quality)
+    compress = {
+        name: {"bytes": len(compressor()), "cpu_ms": best_cpu_ms(compressor, repeat)}
+        for name, compressor in compressors.items()
+    }
+
+    # Stock renderer sent as is, against FastJSONRenderer with the encoding a client accepting both gets
+    encoding = "br" if "br" in compress else f"gzip-{middleware.gzip_level}"
+    return {
+        "expenses": expenses,
+        "orjson": orjson is not None,
+        "render": render,
+        "compress": compress,
+        "per_response": {
+            "before": render["JSONRenderer"],
+            "after": {
+                "encoding": encoding,
+                "bytes": compress[encoding]["bytes"],
+                "cpu_ms": round(render["FastJSONRenderer"]["cpu_ms"] + compress[encoding]["cpu_ms"], 3),
+            },
+        },
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.json_rendering", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--expenses", default="100,1000,10000", help="Comma-separated numbers of expenses per response")
+    parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for the rows")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+
+    report = [run(int(expenses), args.repeat, args.seed) for expenses in args.expenses.split(",") if expenses]
+    print(json.dumps(report, indent=2))
+    return report
+
+
+if __name__ == "__main__":
+    main()
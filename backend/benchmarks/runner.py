@@ -0,0 +1,249 @@
+"""
+Drive the hot endpoints through DRF's test client and report latency, query counts and memory.
+
+Example::
+
+    python -m benchmarks --scales 1k,10k --iterations 50 --latency-ms 5 --output bench.json
+
+With ``--backend supabase`` or ``--backend postgres`` the rows are seeded into the
+tables of the configured (non-production) environment and latency is not injected.
+"""
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+
+@dataclass
+class Scenario:
+    """One endpoint to benchmark, with a function that picks request data from the seeded rows."""
+    name: str
+    path: str
+    payload: Callable[[Any, random.Random], Dict]
+    # Endpoints that touch every user run fewer times
+    heavy: bool = False
+
+
+SCENARIOS = [
+    Scenario(
+        "expenses.dashboard",
+        "/api/expenses/dashboard/",
+        lambda data, rng: {"firebaseId": rng.choice(data.users)["firebase_id"]},
+    ),
+    Scenario(
+        "expenses.group_expenses",
+        "/api/expenses/group-expenses/",
+        lambda data, rng: {"groupId": rng.choice(data.groups)},
+    ),
+    Scenario(
+        "groups.user_groups",
+        "/api/groups/user-groups/",
+        lambda data, rng: {"firebaseId": rng.choice(data.users)["firebase_id"]},
+    ),
+    Scenario(
+        "friend.friend_analytics",
+        "/api/friend/friend-analytics/",
+        lambda data, rng: dict(zip(("current_user_email", "friend_email"), rng.choice(data.friendships))),
+    ),
+    Scenario(
+        "credit_score.calculate_all",
+        "/api/credit-score/calculate-all/",
+        lambda data, rng: {},
+        heavy=True,
+    ),
+]
+
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Percentile with linear interpolation between the closest ranks."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: List[float], digits: int = 3) -> Dict[str, Optional[float]]:
+    """p50/p95/p99, mean and max of a list of measurements."""
+    if not values:
+        return {"p50": None, "p95": None, "p99": None, "mean": None, "max": None}
+    return {
+        "p50": round(percentile(values, 0.50), digits),
+        "p95": round(percentile(values, 0.95), digits),
+        "p99": round(percentile(values, 0.99), digits),
+        "mean": round(sum(values) / len(values), digits),
+        "max": round(max(values), digits),
+    }
+
+
+def clear_caches() -> None:
+    """Drop process-wide caches so every iteration measures a cold read."""
+    from django.core.cache import cache
+
+    from core.supabase.leaderboard import credit_score_leaderboard
+    from core.supabase.operations.credit_score_operations import credit_score_stats_cache
+    from core.supabase.operations.user_operations import user_cache
+
+    user_cache.clear()
+    credit_score_leaderboard.invalidate()
+    credit_score_stats_cache.clear()
+    cache.clear()
+
+
+def send(client, scenario: Scenario, payload: Dict):
+    """POST the payload and read the whole body, so streamed responses are timed to their last byte."""
+    response = client.post(scenario.path, payload, format="json")
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def run_scenario(client, scenario: Scenario, data, iterations: int, rng: random.Random, warm: bool) -> Dict[str, Any]:
+    """Run one scenario and summarize its latency, query counts and peak memory."""
+    latencies, queries, db_times, statuses = [], [], [], {}
+    payloads = [scenario.payload(data, rng) for _ in range(iterations)]
+
+    for payload in payloads:
+        if not warm:
+            clear_caches()
+        started_at = time.perf_counter()
+        response = send(client, scenario, payload)
+        latencies.append((time.perf_counter() - started_at) * 1000)
+        queries.append(int(response.get("X-DB-Queries", 0)))
+        db_times.append(float(response.get("X-DB-Time-ms", 0)))
+        statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    # Memory is measured in a separate run, since tracing slows everything down
+    if not warm:
+        clear_caches()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    send(client, scenario, payloads[0])
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "path": scenario.path,
+        "iterations": iterations,
+        "latency_ms": summarize(latencies),
+        "queries": summarize(queries, digits=1),
+        "db_time_ms": summarize(db_times),
+        "peak_memory_bytes": peak_memory,
+        "status_codes": statuses,
+    }
+
+
+def run_scale(label: str, splits: int, args) -> Dict[str, Any]:
+    """Seed a fresh database at one scale and run every selected scenario against it."""
+    from rest_framework.test import APIClient
+    from core.supabase import supabase
+    from core.supabase.fake import get_database
+    from .seed import seed
+
+    fake = args.backend == "fake"
+    if fake:
+        get_database().reset()
+        supabase.base_client.client.latency_ms = 0
+    clear_caches()
+
+    started_at = time.perf_counter()
+    data = seed(supabase.base_client, splits, seed=args.seed)
+    seed_seconds = time.perf_counter() - started_at
+    if fake:
+        supabase.base_client.client.latency_ms = args.latency_ms
+
+    client = APIClient(HTTP_HOST="localhost")
+    rng = random.Random(args.seed)
+    scenarios = {}
+    for scenario in SCENARIOS:
+        if args.scenarios and scenario.name not in args.scenarios:
+            continue
+        iterations = args.heavy_iterations if scenario.heavy else args.iterations
+        print(f"[{label}] {scenario.name} x{iterations}", file=sys.stderr)
+        # Views print debugging output, keep it out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            scenarios[scenario.name] = run_scenario(client, scenario, data, iterations, rng, args.warm)
+
+    return {
+        "splits": splits,
+        "rows": data.counts,
+        "seed_seconds": round(seed_seconds, 3),
+        "scenarios": scenarios,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default="1k,10k", help=f"Comma-separated scales out of {', '.join(SCALES)}")
+    parser.add_argument("--iterations", type=int, default=30, help="Requests per scenario")
+    parser.add_argument("--heavy-iterations", type=int, default=1, help="Requests for scenarios that touch every user")
+    parser.add_argument("--backend", choices=("fake", "supabase", "postgres"), default="fake",
+                        help="Database backend to benchmark (default: the in-memory fake)")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency injected into every fake database request")
+    parser.add_argument("--scenarios", default="", help="Comma-separated scenario names (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed for data and request parameters")
+    parser.add_argument("--warm", action="store_true", help="Keep caches between requests")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    args.scales = [scale.strip() for scale in args.scales.split(",") if scale.strip()]
+    unknown = [scale for scale in args.scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+    args.scenarios = {name.strip() for name in args.scenarios.split(",") if name.strip()}
+    if args.backend != "fake" and os.getenv("ENVIRONMENT") == "production":
+        parser.error("refusing to seed benchmark rows into production tables")
+    return args
+
+
+def main(argv: Optional[List[str]] = None) -> Dict[str, Any]:
+    args = parse_args(argv)
+
+    # The backend is chosen when the Supabase client is first imported
+    os.environ["DB_BACKEND"] = args.backend
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+    import django
+
+    django.setup()
+    # Per-request logs would dominate the timings; N+1 warnings are kept
+    logging.disable(logging.INFO)
+
+    report = {
+        "commit": _git_commit(),
+        "backend": args.backend,
+        "latency_ms_per_query": args.latency_ms,
+        "iterations": args.iterations,
+        "warm_caches": args.warm,
+        "scales": {label: run_scale(label, SCALES[label], args) for label in args.scales},
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as report_file:
+            report_file.write(output + "\n")
+    else:
+        print(output)
+    return report
@@ -0,0 +1,166 @@
+"""Synthetic users, groups, expenses and splits for benchmarking."""
+
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+CATEGORIES = [
+    "food_drinks", "transport", "entertainment", "shopping", "travel",
+    "utilities", "health", "education", "home", "work", None,
+]
+
+# Rows per insert request while seeding
+CHUNK_SIZE = 1000
+
+
+@dataclass
+class SeedData:
+    """IDs of the seeded rows, used to pick request parameters."""
+    users: List[Dict] = field(default_factory=list)
+    groups: List[str] = field(default_factory=list)
+    friendships: List[tuple] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _timestamp(moment: datetime) -> str:
+    return moment.isoformat()
+
+
+def build_rows(splits: int, seed: int = 0, now: datetime = None) -> Dict[str, List[Dict]]:
+    """
+    Generate rows for every table with roughly the given number of splits.
+
+    There is one user per 20 splits (at least 50), groups of 4-8 members and 1-5
+    splits per expense. About half of the splits are confirmed as paid, a fifth have
+    a pending payment request and the rest are unpaid. Members of a group are friends.
+    """
+    rng = random.Random(seed)
+    now = now or datetime.now(timezone.utc)
+
+    user_count = max(50, splits // 20)
+    users = [
+        {
+            "id": _uuid(rng),
+            "email": f"user{index}@bench.local",
+            "firebase_id": f"fb-bench-{index}",
+            "name": f"Bench User {index}",
+            "date_joined": _timestamp(now - timedelta(days=365)),
+        }
+        for index in range(user_count)
+    ]
+
+    groups, memberships, members_by_group = [], [], {}
+    shuffled = users[:]
+    rng.shuffle(shuffled)
+    position = 0
+    while position < len(shuffled):
+        size = rng.randint(4, 8)
+        members = shuffled[position:position + size]
+        position += size
+        if len(members) < 2:
+            members += rng.sample(users, 2)
+        group_id = _uuid(rng)
+        groups.append({
+            "id": group_id,
+            "name": f"Bench Group {len(groups)}",
+            "description": "Synthetic benchmark group",
+            "total_budget": float(rng.randint(100, 5000)),
+            "created_by": members[0]["id"],
+            "created_at": _timestamp(now - timedelta(days=200)),
+        })
+        members_by_group[group_id] = list({member["id"]: member for member in members}.values())
+        memberships += [
+            {"id": _uuid(rng), "group_id": group_id, "user_id": member["id"]}
+            for member in members_by_group[group_id]
+        ]
+
+    friend_requests, seen = [], set()
+    for members in members_by_group.values():
+        for index, member in enumerate(members):
+            for friend in members[index + 1:]:
+                pair = tuple(sorted((member["email"], friend["email"])))
+                if pair in seen:
+                    continue
+                seen.add(pair)
+                friend_requests.append({
+                    "id": _uuid(rng),
+                    "from_user": pair[0],
+                    "to_user": pair[1],
+                    "request_completed": rng.random() < 0.9,
+                    "created_at": _timestamp(now - timedelta(days=rng.randint(1, 300))),
+                })
+
+    expenses, split_rows = [], []
+    group_ids = list(members_by_group)
+    while len(split_rows) < splits:
+        group_id = rng.choice(group_ids)
+        members = members_by_group[group_id]
+        lender = rng.choice(members)
+        debtors = [member for member in members if member["id"] != lender["id"]]
+        debtors = rng.sample(debtors, min(len(debtors), rng.randint(1, 5), splits - len(split_rows)))
+
+        created_at = now - timedelta(days=rng.uniform(0, 180))
+        amounts = [rng.randint(100, 10000) for _ in debtors]
+        expense = {
+            "id": _uuid(rng),
+            "title": f"Expense {len(expenses)}",
+            "total_amount": sum(amounts) + rng.randint(0, 5000),
+            "created_by": lender["id"],
+            "group_id": group_id,
+            "due_date": (created_at + timedelta(days=14)).date().isoformat() if rng.random() < 0.6 else None,
+            "category": rng.choice(CATEGORIES),
+            "created_at": _timestamp(created_at),
+        }
+        expenses.append(expense)
+
+        for debtor, amount in zip(debtors, amounts):
+            state = rng.random()
+            paid_request = paid_confirmed = None
+            if state < 0.7:
+                requested_at = created_at + timedelta(days=rng.uniform(0, 20))
+                paid_request = _timestamp(min(requested_at, now))
+                if state < 0.5:
+                    paid_confirmed = _timestamp(min(requested_at + timedelta(hours=rng.uniform(1, 120)), now))
+            split_rows.append({
+                "id": _uuid(rng),
+                "expenseid": expense["id"],
+                "userid": debtor["id"],
+                "amount_owed": amount,
+                "paid_request": paid_request,
+                "paid_confirmed": paid_confirmed,
+                "created_at": _timestamp(created_at),
+            })
+
+    return {
+        "users": users,
+        "groups": groups,
+        "group_memberships": memberships,
+        "friend_requests": friend_requests,
+        "expenses": expenses,
+        "splits": split_rows,
+    }
+
+
+def seed(base_client, splits: int, seed: int = 0) -> SeedData:
+    """Insert synthetic rows through the client, in bulk requests of CHUNK_SIZE rows."""
+    rows = build_rows(splits, seed)
+    for table, table_rows in rows.items():
+        table_name = base_client.get_table_name(table)
+        for start in range(0, len(table_rows), CHUNK_SIZE):
+            base_client.client.table(table_name).insert(table_rows[start:start + CHUNK_SIZE]).execute()
+
+    return SeedData(
+        users=[{"id": user["id"], "email": user["email"], "firebase_id": user["firebase_id"]} for user in rows["users"]],
+        groups=[group["id"] for group in rows["groups"]],
+        friendships=[
+            (request["from_user"], request["to_user"])
+            for request in rows["friend_requests"] if request["request_completed"]
+        ],
+        counts={table: len(table_rows) for table, table_rows in rows.items()},
+    )
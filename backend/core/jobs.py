@@ -0,0 +1,161 @@
+"""
+In-process background jobs, so slow follow-up work does not hold up the response.
+
+Jobs are keyed: a job submitted while another with the same key is still waiting
+is merged into it, and jobs with the same key never run at the same time. Set
+``JOB_QUEUE_WORKERS`` (default 2) to the number of worker threads, or to 0 to
+run jobs inline when they are submitted.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueue:
+    """Queue of keyed jobs run by a pool of worker threads, started on the first submit."""
+
+    def __init__(self, name: str, workers: Optional[int] = None):
+        self.name = name
+        self.workers = workers if workers is not None else int(os.getenv("JOB_QUEUE_WORKERS", "2"))
+        # Waiting jobs in submission order: key -> (function, time first submitted)
+        self._pending: "OrderedDict[Hashable, Tuple[Callable[[], Any], float]]" = OrderedDict()
+        self._running: Set[Hashable] = set()
+        self._condition = threading.Condition()
+        self._threads = []
+        self._stopping = False
+        self.submitted = 0
+        self.merged = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+
+    def submit(self, key: Hashable, function: Callable[[], Any]) -> bool:
+        """Queue a job. Returns False if it was merged into a waiting job with the same key."""
+        if self.workers <= 0:
+            with self._condition:
+                self.submitted += 1
+            self._run(key, function, time.perf_counter())
+            return True
+
+        with self._condition:
+            self.submitted += 1
+            if key in self._pending:
+                self.merged += 1
+                # The waiting job runs the latest function but keeps its place and age
+                self._pending[key] = (function, self._pending[key][1])
+                return False
+            self._pending[key] = (function, time.perf_counter())
+            self._start_workers()
+            self._condition.notify()
+            return True
+
+    def _start_workers(self) -> None:
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        for index in range(len(self._threads), self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _next_job(self) -> Optional[Tuple[Hashable, Callable[[], Any], float]]:
+        """The oldest waiting job whose key is not running, or None if there is none."""
+        for key, (function, submitted_at) in self._pending.items():
+            if key not in self._running:
+                del self._pending[key]
+                self._running.add(key)
+                return key, function, submitted_at
+        return None
+
+    def _work(self) -> None:
+        while True:
+            with self._condition:
+                job = self._next_job()
+                while job is None:
+                    if self._stopping:
+                        return
+                    self._condition.wait()
+                    job = self._next_job()
+            key, function, submitted_at = job
+            try:
+                self._run(key, function, submitted_at)
+            finally:
+                with self._condition:
+                    self._running.discard(key)
+                    # Wake workers waiting for this key, and wait_idle
+                    self._condition.notify_all()
+
+    def _run(self, key: Hashable, function: Callable[[], Any], submitted_at: float) -> None:
+        lag_ms = (time.perf_counter() - submitted_at) * 1000
+        try:
+            function()
+            failed = False
+        except Exception as e:
+            failed = True
+            logger.error(f"Job {self.name}:{key} failed: {e}")
+        with self._condition:
+            self.last_lag_ms = lag_ms
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Wait until no job is waiting or running. Returns False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while self._pending or self._running:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+            return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers once the waiting jobs have run. A later submit starts new workers."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        with self._condition:
+            self._threads = []
+            self._stopping = False
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, lag and job counters for monitoring."""
+        with self._condition:
+            oldest = next(iter(self._pending.values()), None)
+            return {
+                "workers": self.workers,
+                "depth": len(self._pending),
+                "running": len(self._running),
+                "oldest_pending_ms": round((time.perf_counter() - oldest[1]) * 1000, 3) if oldest else 0.0,
+                "last_lag_ms": round(self.last_lag_ms, 3),
+                "max_lag_ms": round(self.max_lag_ms, 3),
+                "submitted": self.submitted,
+                "merged": self.merged,
+                "completed": self.completed,
+                "failed": self.failed,
+            }
+
+
+# Credit scores are recomputed after the payment endpoints respond
+credit_score_jobs = JobQueue("credit-score")
+
+
+def schedule_credit_score_updates(user_ids: Iterable[Optional[str]]) -> None:
+    """Recompute the credit scores of users in the background."""
+    from core.supabase import supabase
+
+    for user_id in dict.fromkeys(user_id for user_id in user_ids if user_id):
+        credit_score_jobs.submit(
+            ("credit_score", user_id),
+            lambda user_id=user_id: supabase.credit_scores.update_user_credit_score(user_id),
+        )
@@ -0,0 +1,218 @@
+"""Middleware for the core application."""
+
+import gzip
+import json
+import logging
+import secrets
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.text import StreamingBuffer
+from core.supabase import supabase
+from core.supabase.instrumentation import collect_queries
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+
+class SupabaseRequestScopeMiddleware:
+    """Memoize Supabase loader lookups (e.g. user rows) for the duration of each request."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with supabase.request_scope():
+            return self.get_response(request)
+
+    async def __acall__(self, request):
+        with supabase.request_scope():
+            return await self.get_response(request)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Count the Supabase queries made by each request and how long they took.
+
+    Totals are added to the response as X-DB-Queries and X-DB-Time-ms headers and
+    logged. A warning is logged when the same table and filter keys are queried more
+    than DB_N_PLUS_ONE_THRESHOLD times in one request, which usually means a query
+    inside a loop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.threshold = getattr(settings, "DB_N_PLUS_ONE_THRESHOLD", 5)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with collect_queries() as collector:
+            response = self.get_response(request)
+        return self._report(request, response, collector)
+
+    async def __acall__(self, request):
+        with collect_queries() as collector:
+            response = await self.get_response(request)
+        return self._report(request, response, collector)
+
+    def _report(self, request, response, collector):
+        response["X-DB-Queries"] = str(collector.count)
+        response["X-DB-Time-ms"] = f"{collector.total_time_ms:.1f}"
+
+        log_entry = {
+            "event": "db_queries",
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            **collector.summary(),
+        }
+        logger.info(json.dumps(log_entry))
+
+        repeated = collector.repeated_shapes(self.threshold)
+        if repeated:
+            logger.warning(json.dumps({
+                "event": "db_n_plus_one",
+                "method": request.method,
+                "path": request.path,
+                "threshold": self.threshold,
+                "repeated": repeated,
+            }))
+        return response
+
+
+def accepted_encodings(header: str) -> dict:
+    """Content codings from an Accept-Encoding header, with their quality values."""
+    encodings = {}
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[coding.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compress response bodies of at least RESPONSE_COMPRESSION_MIN_BYTES (default 1024)
+    with brotli or gzip, as the client's Accept-Encoding allows.
+
+    Brotli is preferred when the ``brotli`` package is installed, at
+    RESPONSE_BROTLI_QUALITY (default 4). gzip runs at RESPONSE_GZIP_LEVEL (default
+    1): on large JSON lists level 6 saves under a fifth more bytes for more than
+    twice the CPU time. Otherwise this works like Django's GZipMiddleware: gzip
+    output gets a random-length file name against BREACH, strong ETags are made
+    weak, and a body is only replaced when the compressed one is shorter.
+    Streaming responses are compressed as they are sent, except async ones.
+    """
+
+    sync_capable = True
+    async_capable = True
+    max_random_bytes = 100
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, "RESPONSE_COMPRESSION_MIN_BYTES", 1024)
+        self.brotli_quality = getattr(settings, "RESPONSE_BROTLI_QUALITY", 4)
+        self.gzip_level = getattr(settings, "RESPONSE_GZIP_LEVEL", 1)
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self._compress(request, self.get_response(request))
+
+    async def __acall__(self, request):
+        return self._compress(request, await self.get_response(request))
+
+    def _encoding(self, request):
+        """The coding to use for this request, or None to send the body as it is."""
+        encodings = accepted_encodings(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+        fallback = encodings.get("*", 0.0)
+        candidates = (["br"] if brotli is not None else []) + ["gzip"]
+        acceptable = [coding for coding in candidates if encodings.get(coding, fallback) > 0]
+        return max(acceptable, key=lambda coding: encodings.get(coding, fallback), default=None)
+
+    def _compress(self, request, response):
+        if response.has_header("Content-Encoding") or (response.streaming and response.is_async):
+            return response
+        if not response.streaming and len(response.content) < self.min_bytes:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = self._encoding(request)
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = (
+                self._brotli_sequence(response.streaming_content) if encoding == "br"
+                else self._gzip_sequence(response.streaming_content)
+            )
+            # The compressed size is not known until it has been sent
+            del response.headers["Content-Length"]
+        else:
+            compressed = (
+                brotli.compress(response.content, quality=self.brotli_quality) if encoding == "br"
+                else b"".join(self._gzip_sequence([response.content]))
+            )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A compressed body is not byte-for-byte the same representation
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    def _gzip_sequence(self, sequence):
+        buffer = StreamingBuffer()
+        # The random-length file name varies the compressed size, as in Django's compress_sequence
+        filename = b"a" * secrets.randbelow(self.max_random_bytes)
+        with gzip.GzipFile(filename=filename, mode="wb", compresslevel=self.gzip_level, fileobj=buffer, mtime=0) as zfile:
+            # Output headers...
+            yield buffer.read()
+            for chunk in sequence:
+                zfile.write(chunk)
+                data = buffer.read()
+                if data:
+                    yield data
+        yield buffer.read()
+
+    def _brotli_sequence(self, sequence):
+        compressor = brotli.Compressor(quality=self.brotli_quality)
+        for chunk in sequence:
+            data = compressor.process(chunk)
+            # Send each chunk's output now rather than when brotli's buffer fills
+            data += compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
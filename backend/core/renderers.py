@@ -0,0 +1,50 @@
+"""Response renderers for the REST API."""
+
+import logging
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed, and with the standard
+    library (as JSONRenderer does) otherwise.
+
+    The output is the same as JSONRenderer's: compact, UTF-8, with datetimes,
+    decimals and other non-JSON types converted by its encoder, and U+2028/U+2029
+    escaped. Indented output (``Accept: application/json; indent=4``), the
+    ASCII-only and non-compact settings, and data orjson cannot encode (e.g.
+    integers over 64 bits) go through JSONRenderer instead. Unlike it, NaN and
+    infinite floats become null rather than raising under STRICT_JSON.
+    """
+
+    if orjson is not None:
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render `data` into JSON, returning a bytestring."""
+        if data is None:
+            return b''
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError as e:
+            logger.debug("orjson could not encode the response, using the standard library: %s", e)
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escaped as JSONRenderer does, so the output is also valid JavaScript
+        return ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
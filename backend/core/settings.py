@@ -50,7 +50,10 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "core.middleware.CompressionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "core.middleware.QueryInstrumentationMiddleware",
+    "core.middleware.SupabaseRequestScopeMiddleware",
 ]
 
 ROOT_URLCONF = "core.urls"
@@ -79,6 +82,23 @@ SUPABASE_URL = os.getenv("DB_URL")
 SUPABASE_ANON_KEY = os.getenv("DB_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("DB_SERVICE_ROLE_KEY")    
 
+# Warn when a request repeats the same table/filter query more than this many times
+DB_N_PLUS_ONE_THRESHOLD = int(os.getenv("DB_N_PLUS_ONE_THRESHOLD", "5"))
+
+# /metrics is open in development; elsewhere it needs "Authorization: Bearer <METRICS_TOKEN>"
+# and is not served at all without a token
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Response bodies at least this large are compressed (brotli when installed, else gzip)
+RESPONSE_COMPRESSION_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESSION_MIN_BYTES", "1024"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "4"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "1"))
+
+# Unpaged requests to the group expense, user expense and friend lists stream their
+# JSON from keyset pages of STREAMING_PAGE_SIZE rows instead of building the whole list
+STREAM_LIST_RESPONSES = os.getenv("STREAM_LIST_RESPONSES", "true").lower() == "true"
+STREAMING_PAGE_SIZE = int(os.getenv("STREAMING_PAGE_SIZE", "200"))
+
 # Database - Using Supabase for all data operations
 # Django ORM is not used for application data
 DATABASES = {
@@ -88,6 +108,27 @@ DATABASES = {
     }
 }
 
+# Holds the per-user dashboard data and the version tokens behind ETags. All workers must
+# share it, or a write only invalidates the worker that handled it: set REDIS_URL (needs the
+# redis package), or CACHE_BACKEND and CACHE_LOCATION for another shared backend such as
+# django.core.cache.backends.memcached.PyMemcacheCache. The in-memory default is private to
+# each process, so outside development the dashboard cache and ETags stay off with it unless
+# CACHE_SHARED=true says there is only one worker
+REDIS_URL = os.getenv("REDIS_URL")
+CACHE_BACKEND = os.getenv(
+    "CACHE_BACKEND",
+    "django.core.cache.backends.redis.RedisCache" if REDIS_URL else "django.core.cache.backends.locmem.LocMemCache",
+)
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.getenv("CACHE_LOCATION", REDIS_URL or "ece452-dashboard"),
+    }
+}
+CACHE_SHARED = os.getenv(
+    "CACHE_SHARED", str(CACHE_BACKEND != "django.core.cache.backends.locmem.LocMemCache" or DEBUG)
+).lower() == "true"
+
 # Supabase HTTP API Configuration
 SUPABASE_CONFIG = {
     "url": SUPABASE_URL,
@@ -126,6 +167,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Let the frontend read the per-request query totals
+CORS_EXPOSE_HEADERS = ["X-DB-Queries", "X-DB-Time-ms", "X-Next-Cursor", "ETag"]
+
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
@@ -133,6 +177,7 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 # REST Framework settings
 REST_FRAMEWORK = {
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        # orjson-backed when installed; set to rest_framework.renderers.JSONRenderer to compare
+        os.getenv("JSON_RENDERER", "core.renderers.FastJSONRenderer"),
     ],
 }
\ No newline at end of file
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import time
+import weakref
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Union
+from supabase import acreate_client, AsyncClient, AsyncClientOptions
+from .base_client import BaseSupabaseClient, in_filter_chunks, missing_functions, record_rpc_failure
+from .http_pool import http_pool
+from .instrumentation import record_query
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBaseSupabaseClient(BaseSupabaseClient):
+    """
+    Async variant of BaseSupabaseClient using the Supabase async client.
+
+    The async client is bound to the event loop it was created on, so it is created
+    lazily on first use and recreated if queries arrive from a different loop (for
+    example when async views run under the WSGI development server). The HTTP client
+    of a replaced async client is closed, so each loop does not leave a pool behind.
+    """
+
+    def __init__(self):
+        self._client_loop = None
+        self._http_client = None
+        self._client_locks = weakref.WeakKeyDictionary()
+        super().__init__()
+
+    def _create_client(self) -> Optional[AsyncClient]:
+        """The async client is created on first use by _get_client."""
+        return None
+
+    def _create_fake_client(self) -> Any:
+        """Create the in-memory async client, sharing its database with the sync client."""
+        from .fake import FakeAsyncSupabaseClient
+
+        return FakeAsyncSupabaseClient(latency_ms=self.fake_latency_ms)
+
+    def _create_postgres_client(self) -> Any:
+        """Create the async client over the connection pool shared with the sync client."""
+        from .postgres import AsyncPostgresClient, get_engine
+
+        self.engine = get_engine()
+        return AsyncPostgresClient(self.engine)
+
+    async def _get_client(self) -> Optional[AsyncClient]:
+        """Get the async client for the running event loop, creating it if needed."""
+        if self.backend in ("fake", "postgres"):
+            return self.client
+        if not self.supabase_url or not self.supabase_key:
+            return None
+
+        loop = asyncio.get_running_loop()
+        if self.client is not None and self._client_loop is loop:
+            return self.client
+
+        lock = self._client_locks.setdefault(loop, asyncio.Lock())
+        async with lock:
+            if self.client is None or self._client_loop is not loop:
+                await self._close_http_client()
+                try:
+                    self._http_client = http_pool.async_client()
+                    self.client = await acreate_client(
+                        self.supabase_url,
+                        self.supabase_key,
+                        options=AsyncClientOptions(httpx_client=self._http_client),
+                    )
+                    self._client_loop = loop
+                    logger.info(f"Async Supabase client created for env: '{self.environment}'")
+                except Exception as e:
+                    logger.error(f"Failed to create async Supabase client: {e}")
+                    self.client = None
+        return self.client
+
+    async def _close_http_client(self) -> None:
+        """Close the HTTP client of the current async client before it is replaced."""
+        http_client, self._http_client = self._http_client, None
+        if http_client is None:
+            return
+        try:
+            await http_client.aclose()
+        except Exception as e:
+            # Connections opened on a loop that has since closed cannot be shut down
+            # cleanly; they are released with the client
+            logger.debug(f"Failed to close the previous async HTTP client: {e}")
+
+    async def _execute_query(self, table_name: str, operation: str, data: Optional[Union[Dict, List[Dict]]] = None, filters: Optional[Dict] = None, limit: Optional[int] = None, select_statement: str = "*", order_by: Optional[Dict[str, str]] = None, offset: Optional[int] = None, after: Optional[Tuple] = None) -> Any:
+        """
+        Execute a query using the async Supabase client.
+
+        Takes the same arguments and returns the same results as
+        BaseSupabaseClient._execute_query.
+        """
+        client = await self._get_client()
+        if not client:
+            logger.error("Supabase client is not available.")
+            return None
+
+        started_at = time.perf_counter()
+        try:
+            query = self._build_query(
+                client, table_name, operation, data=data, filters=filters, limit=limit,
+                select_statement=select_statement, order_by=order_by, offset=offset, after=after,
+            )
+            if query is None:
+                return None
+            result = self._shape_result(table_name, operation, await query.execute(), bulk=isinstance(data, list))
+            record_query(table_name, operation, filters, result, started_at)
+            return result
+
+        except Exception as e:
+            record_query(table_name, operation, filters, None, started_at, failed=True)
+            logger.error(f"Database query failed: {e}")
+            return None
+
+    async def select_in(self, table_name: str, column: str, values: Iterable[Any], filters: Optional[Dict] = None, select_statement: str = "*") -> Optional[List[Dict]]:
+        """Rows whose column has one of the values; same arguments and result as BaseSupabaseClient.select_in."""
+        rows: List[Dict] = []
+        for chunk in in_filter_chunks(values):
+            page = await self._execute_query(
+                table_name=table_name,
+                operation='select',
+                filters={column: chunk, **(filters or {})},
+                select_statement=select_statement,
+            )
+            if page is None:
+                return None
+            rows.extend(page)
+        return rows
+
+    async def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a database function; same arguments and result as BaseSupabaseClient.rpc."""
+        client = await self._get_client()
+        if not client:
+            logger.error("Supabase client is not available.")
+            return None
+        if missing_functions.get(function_name):
+            return None
+
+        started_at = time.perf_counter()
+        try:
+            result = (await client.rpc(function_name, params or {}).execute()).data
+            record_query(function_name, "rpc", params, result, started_at)
+            return result
+
+        except Exception as e:
+            record_query(function_name, "rpc", params, None, started_at, failed=True)
+            record_rpc_failure(function_name, e)
+            return None
+
+    async def test_connection(self) -> bool:
+        """Test the database connection."""
+        return await self._execute_query(
+            table_name=self.get_table_name("users"),
+            operation='select',
+            limit=1,
+            select_statement="id"
+        ) is not None
+
+    def close_connection(self):
+        """Drop the async client; a new one is created on the next query."""
+        # The connection pool is shared with the sync client and closed when the worker exits
+        if self.backend in ("fake", "postgres"):
+            return
+        self.client = None
+        self._client_loop = None
+        logger.info("Async Supabase client connection closed.")
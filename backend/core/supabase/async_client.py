@@ -0,0 +1,51 @@
+import logging
+from .async_base_client import AsyncBaseSupabaseClient
+from .loaders import AsyncUserLoader, request_scope
+from .operations.async_user_operations import AsyncUserOperations
+from .operations.async_expense_operations import AsyncExpenseOperations
+from .operations.async_group_operations import AsyncGroupOperations
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSupabaseClient:
+    """
+    Singleton async Supabase client with the operation groups used by async views.
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AsyncSupabaseClient, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if not self._initialized:
+            self.base_client = AsyncBaseSupabaseClient()
+
+            # Request-scoped user loader shared by all operation modules
+            self.user_loader = AsyncUserLoader(self.base_client)
+
+            # Initialize operation modules
+            self.users = AsyncUserOperations(self.base_client, self.user_loader)
+            self.expenses = AsyncExpenseOperations(self.base_client, self.user_loader)
+            self.groups = AsyncGroupOperations(self.base_client, self.user_loader)
+
+            self._initialized = True
+            logger.info("AsyncSupabaseClient initialized with Supabase async client.")
+
+    def request_scope(self):
+        """Context manager that memoizes loader lookups for the duration of one request."""
+        return request_scope()
+
+    async def test_connection(self) -> bool:
+        """Test connection to Supabase."""
+        return await self.base_client.test_connection()
+
+    def close_connection(self):
+        """Close the connection."""
+        self.base_client.close_connection()
+
+# Global instance
+async_supabase = AsyncSupabaseClient()
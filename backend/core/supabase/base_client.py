@@ -1,11 +1,74 @@
 import os
 import logging
-from typing import List, Optional, Dict, Any, Tuple
-from supabase import create_client, Client
+import time
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
+from supabase import create_client, Client, ClientOptions
 from dotenv import load_dotenv
+from .cache import TTLCache
+from .http_pool import http_pool
+from .instrumentation import record_query
 
 logger = logging.getLogger(__name__)
 
+# Database functions found not to exist, which rpc skips until the entry expires (for
+# example once scripts/create_functions.py has been run); shared by every client in the process
+missing_functions = TTLCache(
+    maxsize=64,
+    ttl=float(os.getenv("DB_MISSING_FUNCTION_TTL_SECONDS", "300")),
+)
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """Whether a failed function call means the function does not exist (PostgREST PGRST202, PostgreSQL 42883)."""
+    return getattr(error, "code", None) == "PGRST202" or getattr(error, "pgcode", None) == "42883"
+
+
+def record_rpc_failure(function_name: str, error: Exception) -> None:
+    """Log a failed function call, remembering and logging only once a function that does not exist."""
+    if is_missing_function_error(error):
+        missing_functions.set(function_name, True)
+        logger.warning(f"Database function {function_name} does not exist; its callers fall back to queries")
+    else:
+        logger.error(f"Database function {function_name} failed: {error}")
+
+# Values per IN filter of select_in, keeping request URLs well within length limits
+IN_FILTER_CHUNK_SIZE = 200
+
+# Operators that can follow a column name in a filter key, e.g. 'paid_request__not'
+FILTER_OPERATORS = ('eq', 'neq', 'gt', 'gte', 'lt', 'lte', 'like', 'ilike', 'in', 'is', 'not')
+
+
+def parse_filter_key(key: str, value: Any) -> Tuple[str, str]:
+    """
+    Split a filter key into its column and PostgREST operator.
+
+    ``column__op`` uses one of FILTER_OPERATORS. ``__not`` means IS NOT NULL (or
+    IS NOT true/false) for None and booleans, NOT IN for lists and <> otherwise.
+    A key without a suffix is ``in`` for list values, ``is`` for None and ``eq``
+    for anything else.
+    """
+    column, separator, operator = key.rpartition('__')
+    if separator and column and operator in FILTER_OPERATORS:
+        return column, operator
+    if isinstance(value, (list, tuple, set)):
+        return key, 'in'
+    if value is None:
+        return key, 'is'
+    return key, 'eq'
+
+
+def in_filter_chunks(values: Iterable[Any], size: int = IN_FILTER_CHUNK_SIZE) -> Iterator[Any]:
+    """
+    The distinct non-empty values in chunks of at most ``size``, in their first order.
+
+    A chunk of one value is given as the value itself, so it is matched with equality.
+    """
+    values = list(dict.fromkeys(value for value in values if value))
+    for start in range(0, len(values), size):
+        chunk = values[start:start + size]
+        yield chunk if len(chunk) > 1 else chunk[0]
+
+
 class BaseSupabaseClient:
     """
     Base client for managing Supabase connection using the official Python client.
@@ -17,86 +80,274 @@ class BaseSupabaseClient:
         # Environment configuration
         self.environment = os.getenv("ENVIRONMENT", "development")
         self.table_prefix = f"{self.environment}_" if self.environment != "production" else ""
+
+        # Use PostgREST embedded selects to fetch related rows in the same request
+        self.embedded_selects = os.getenv("DB_EMBEDDED_SELECTS", "false").lower() == "true"
         
         # Supabase configuration using DB_URL and DB_KEY
-        supabase_url = os.getenv("DB_URL")
-        supabase_key = os.getenv("DB_KEY")
+        self.supabase_url = os.getenv("DB_URL")
+        self.supabase_key = os.getenv("DB_KEY")
+
+        # "supabase" (default), "postgres" for direct connections, or "fake" for the in-memory backend used offline
+        self.backend = os.getenv("DB_BACKEND", "supabase").lower()
+        self.fake_latency_ms = float(os.getenv("DB_FAKE_LATENCY_MS", "0"))
+        self.engine = None
         
-        if not supabase_url or not supabase_key:
+        if self.backend == "fake":
+            self.client = self._create_fake_client()
+        elif self.backend == "postgres":
+            self.client = self._create_postgres_client()
+            # Embedded resources are PostgREST-only
+            self.embedded_selects = False
+        elif not self.supabase_url or not self.supabase_key:
             logger.error("DB_URL and DB_KEY must be set in environment variables")
             self.client = None
         else:
-            try:
-                self.client = create_client(supabase_url, supabase_key)
-                logger.info(f"Supabase client created for env: '{self.environment}'")
-                logger.info(f"Table prefix: '{self.table_prefix}'")
-            except Exception as e:
-                logger.error(f"Failed to create Supabase client: {e}")
-                self.client = None
+            self.client = self._create_client()
+
+    def _create_client(self) -> Optional[Client]:
+        """Create the Supabase client, or return None if it cannot be created."""
+        try:
+            client = create_client(
+                self.supabase_url,
+                self.supabase_key,
+                options=ClientOptions(httpx_client=http_pool.client()),
+            )
+            logger.info(f"Supabase client created for env: '{self.environment}'")
+            logger.info(f"Table prefix: '{self.table_prefix}'")
+            return client
+        except Exception as e:
+            logger.error(f"Failed to create Supabase client: {e}")
+            return None
+
+    def _create_fake_client(self) -> Any:
+        """Create the in-memory client, with tables from scripts/create_tables.py."""
+        from .fake import FakeSupabaseClient
+
+        logger.info(f"Using in-memory fake database (latency: {self.fake_latency_ms}ms per request)")
+        return FakeSupabaseClient(latency_ms=self.fake_latency_ms)
+
+    def _create_postgres_client(self) -> Any:
+        """Create a client that runs queries over the shared PostgreSQL connection pool."""
+        from .postgres import PostgresClient, get_engine
+
+        self.engine = get_engine()
+        logger.info(f"Using direct PostgreSQL connections (pool size: {self.engine.max_connections})")
+        return PostgresClient(self.engine)
 
     def get_table_name(self, base_table_name: str) -> str:
         """Get the environment-specific table name with prefix."""
         return f"{self.table_prefix}{base_table_name}"
     
-    def _execute_query(self, table_name: str, operation: str, data: Optional[Dict] = None, filters: Optional[Dict] = None, limit: Optional[int] = None, select_statement: str = "*") -> Any:
+    def embed(self, base_table_name: str, columns: str = "*", alias: Optional[str] = None, inner: bool = False) -> str:
+        """
+        Build a PostgREST embedded resource for use in a select statement.
+
+        For example ``embed("users", "name", alias="debtor")`` gives
+        ``debtor:development_users(name)``. With ``inner=True`` parent rows without a
+        matching related row are dropped, which allows filtering on the embedded columns.
+        """
+        resource = self.get_table_name(base_table_name)
+        if inner:
+            resource += "!inner"
+        prefix = f"{alias}:" if alias else ""
+        return f"{prefix}{resource}({columns})"
+
+    @staticmethod
+    def _apply_filters(query: Any, filters: Optional[Dict]) -> Any:
+        """
+        Apply column filters to a query.
+
+        Keys are column names with an optional operator suffix (see parse_filter_key).
+        Without a suffix, list values are matched with IN, None with IS NULL and
+        anything else with equality.
+        """
+        for key, value in (filters or {}).items():
+            column, operator = parse_filter_key(key, value)
+            if operator == 'in':
+                query = query.in_(column, list(value))
+            elif operator == 'is':
+                query = query.is_(column, value)
+            elif operator == 'not':
+                if value is None or isinstance(value, bool):
+                    query = query.not_.is_(column, value)
+                elif isinstance(value, (list, tuple, set)):
+                    query = query.not_.in_(column, list(value))
+                else:
+                    query = query.neq(column, value)
+            else:
+                query = getattr(query, operator)(column, value)
+        return query
+
+    @staticmethod
+    def _apply_keyset(query: Any, after: Tuple, order_by: Optional[Dict[str, str]]) -> Any:
+        """
+        Only keep rows that sort after a keyset cursor.
+
+        With several columns, e.g. ``(('created_at', 'id'), (created_at, id))``, rows
+        compare on the first column and ties are broken by the following ones.
+        """
+        columns, values = after
+        if isinstance(columns, str):
+            columns, values = (columns,), (values,)
+        order_by = order_by or {}
+        operators = [
+            'lt' if order_by.get(column, 'asc').lower().startswith('desc') else 'gt'
+            for column in columns
+        ]
+
+        if len(columns) == 1:
+            return getattr(query, operators[0])(columns[0], values[0])
+
+        def quote(value: Any) -> str:
+            escaped = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            return f'"{escaped}"'
+
+        conditions = []
+        for position, column in enumerate(columns):
+            parts = [f"{columns[index]}.eq.{quote(values[index])}" for index in range(position)]
+            parts.append(f"{column}.{operators[position]}.{quote(values[position])}")
+            conditions.append(parts[0] if len(parts) == 1 else f"and({','.join(parts)})")
+        return query.or_(",".join(conditions))
+
+    def _execute_query(self, table_name: str, operation: str, data: Optional[Union[Dict, List[Dict]]] = None, filters: Optional[Dict] = None, limit: Optional[int] = None, select_statement: str = "*", order_by: Optional[Dict[str, str]] = None, offset: Optional[int] = None, after: Optional[Tuple] = None) -> Any:
         """
         Execute a query using the Supabase client.
         
         :param table_name: The table to query
         :param operation: The operation to perform ('select', 'insert', 'update', 'delete')
-        :param data: Data for insert/update operations
-        :param filters: Filters for select/update/delete operations
+        :param data: Data for insert/update operations. A list of rows is inserted in one
+                     request, and all of the inserted rows are returned.
+        :param filters: Filters for select/update/delete operations. List, tuple and set
+                        values are matched with an IN clause instead of equality.
         :param limit: Limit for select operations
         :param select_statement: The select statement to use for 'select' operations
+        :param order_by: Columns to sort select results by, e.g. ``{'created_at': 'desc', 'id': 'desc'}``.
+                         A direction can end in ``.nullsfirst`` or ``.nullslast``.
+        :param offset: Number of rows to skip, for select operations
+        :param after: Keyset cursor ``(column, value)`` or ``((column, ...), (value, ...))``.
+                      Only rows after the cursor in the order_by direction are returned.
         :return: Query result
         """
         if not self.client:
             logger.error("Supabase client is not available.")
             return None
             
+        started_at = time.perf_counter()
         try:
-            table = self.client.table(table_name)
-            
-            if operation == 'select':
-                query = table.select(select_statement)
-                if filters:
-                    for key, value in filters.items():
-                        query = query.eq(key, value)
-                if limit:
-                    query = query.limit(limit)
-                result = query.execute()
-                return result.data
-                
-            elif operation == 'insert':
-                # Ensure we don't include any null values
-                clean_data = {k: v for k, v in data.items() if v is not None}
-                logger.info(f"Inserting data into {table_name}: {clean_data}")
-                
-                # Insert the data - UUIDs will be auto-generated by the database
-                result = table.insert(clean_data).execute()
-                logger.info(f"Insert result: {result.data}")
-                return result.data[0] if result.data else None
-                
-            elif operation == 'update':
-                query = table.update(data)
-                if filters:
-                    for key, value in filters.items():
-                        query = query.eq(key, value)
-                result = query.execute()
-                return result.data[0] if result.data else None
-                
-            elif operation == 'delete':
-                query = table.delete()
-                if filters:
-                    for key, value in filters.items():
-                        query = query.eq(key, value)
-                result = query.execute()
-                return len(result.data) > 0
+            query = self._build_query(
+                self.client, table_name, operation, data=data, filters=filters, limit=limit,
+                select_statement=select_statement, order_by=order_by, offset=offset, after=after,
+            )
+            if query is None:
+                return None
+            result = self._shape_result(table_name, operation, query.execute(), bulk=isinstance(data, list))
+            record_query(table_name, operation, filters, result, started_at)
+            return result
                 
         except Exception as e:
+            record_query(table_name, operation, filters, None, started_at, failed=True)
             logger.error(f"Database query failed: {e}")
             return None
 
+    def select_in(self, table_name: str, column: str, values: Iterable[Any], filters: Optional[Dict] = None, select_statement: str = "*") -> Optional[List[Dict]]:
+        """
+        Rows whose column has one of the values, read with one query per IN_FILTER_CHUNK_SIZE values.
+
+        Duplicate and empty values are dropped, and no query is made without any.
+        Other filters apply to every chunk. None if any of the queries fails.
+        """
+        rows: List[Dict] = []
+        for chunk in in_filter_chunks(values):
+            page = self._execute_query(
+                table_name=table_name,
+                operation='select',
+                filters={column: chunk, **(filters or {})},
+                select_statement=select_statement,
+            )
+            if page is None:
+                return None
+            rows.extend(page)
+        return rows
+
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Call a database function from scripts/create_functions.py.
+
+        :param function_name: The function to call, with its environment prefix (see get_table_name)
+        :param params: Named arguments of the function
+        :return: The function's result, or None if the call failed or the function does not exist
+        """
+        if not self.client:
+            logger.error("Supabase client is not available.")
+            return None
+        if missing_functions.get(function_name):
+            return None
+
+        started_at = time.perf_counter()
+        try:
+            result = self.client.rpc(function_name, params or {}).execute().data
+            record_query(function_name, "rpc", params, result, started_at)
+            return result
+
+        except Exception as e:
+            record_query(function_name, "rpc", params, None, started_at, failed=True)
+            record_rpc_failure(function_name, e)
+            return None
+
+    def _build_query(self, client: Any, table_name: str, operation: str, data: Optional[Union[Dict, List[Dict]]] = None, filters: Optional[Dict] = None, limit: Optional[int] = None, select_statement: str = "*", order_by: Optional[Dict[str, str]] = None, offset: Optional[int] = None, after: Optional[Tuple] = None) -> Any:
+        """Build the request for an operation, without executing it."""
+        table = client.table(table_name)
+        
+        if operation == 'select':
+            query = self._apply_filters(table.select(select_statement), filters)
+            if after:
+                query = self._apply_keyset(query, after, order_by)
+            for column, direction in (order_by or {}).items():
+                direction, _, nulls = direction.lower().partition('.')
+                nullsfirst = {'nullsfirst': True, 'nullslast': False}.get(nulls)
+                query = query.order(column, desc=direction == 'desc', nullsfirst=nullsfirst)
+            if offset:
+                query = query.offset(offset)
+            if limit:
+                query = query.limit(limit)
+            return query
+            
+        elif operation == 'insert':
+            # Ensure we don't include any null values
+            if isinstance(data, list):
+                clean_data = [{k: v for k, v in row.items() if v is not None} for row in data]
+            else:
+                clean_data = {k: v for k, v in data.items() if v is not None}
+            logger.info(f"Inserting data into {table_name}: {clean_data}")
+            
+            # Insert the data - UUIDs will be auto-generated by the database
+            return table.insert(clean_data)
+            
+        elif operation == 'update':
+            return self._apply_filters(table.update(data), filters)
+            
+        elif operation == 'delete':
+            return self._apply_filters(table.delete(), filters)
+
+        return None
+
+    @staticmethod
+    def _shape_result(table_name: str, operation: str, result: Any, bulk: bool = False) -> Any:
+        """Convert an executed request into what _execute_query returns for the operation."""
+        if operation == 'select':
+            return result.data
+        elif operation == 'insert':
+            logger.info(f"Insert result: {result.data}")
+            if bulk:
+                return result.data
+            return result.data[0] if result.data else None
+        elif operation == 'update':
+            return result.data[0] if result.data else None
+        elif operation == 'delete':
+            return len(result.data) > 0
+        return None
+
     def test_connection(self) -> bool:
         """Test the database connection."""
         if not self.client:
@@ -113,6 +364,6 @@ class BaseSupabaseClient:
 
     def close_connection(self):
         """Close the Supabase client connection."""
-        if self.client:
-            # The Supabase client handles connection management automatically
-            logger.info("Supabase client connection closed.") 
\ No newline at end of file
+        # The PostgreSQL and HTTP pools are shared by every client in the worker and closed when it exits
+        if self.engine or self.client:
+            logger.info("Supabase client connection closed.")
\ No newline at end of file
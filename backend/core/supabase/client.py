@@ -2,9 +2,11 @@ import os
 from dotenv import load_dotenv
 import logging
 from .base_client import BaseSupabaseClient
+from .loaders import UserLoader, request_scope
 from .operations.user_operations import UserOperations
 from .operations.friend_request_operations import FriendRequestOperations
 from .operations.expense_operations import ExpenseOperations
+from .operations.credit_score_operations import CreditScoreOperations
 from .operations.group_operations import GroupOperations
 from .operations.notification_operations import NotificationOperations
 
@@ -30,16 +32,24 @@ class SupabaseClient:
             # Initialize base client (no parameters needed now)
             self.base_client = BaseSupabaseClient()
             
+            # Request-scoped user loader shared by all operation modules
+            self.user_loader = UserLoader(self.base_client)
+            
             # Initialize operation modules
-            self.users = UserOperations(self.base_client)
+            self.users = UserOperations(self.base_client, self.user_loader)
             self.friend_requests = FriendRequestOperations(self.base_client)
-            self.expenses = ExpenseOperations(self.base_client)
-            self.groups = GroupOperations(self.base_client)
+            self.credit_scores = CreditScoreOperations(self.base_client)
+            self.expenses = ExpenseOperations(self.base_client, self.user_loader, credit_scores=self.credit_scores)
+            self.groups = GroupOperations(self.base_client, self.user_loader)
             self.notifications = NotificationOperations(self.base_client)
             
             self._initialized = True
             logger.info("SupabaseClient initialized with Supabase Python client.")
     
+    def request_scope(self):
+        """Context manager that memoizes loader lookups for the duration of one request."""
+        return request_scope()
+    
     def test_connection(self) -> bool:
         """Test connection to Supabase."""
         return self.base_client.test_connection()
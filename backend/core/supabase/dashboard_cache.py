@@ -0,0 +1,110 @@
+"""Per-user cache of dashboard data in the Django cache, dropped when the user's expenses or splits are written."""
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from .versions import VersionTokens, version_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardCache:
+    """
+    Dashboard data cached per user in a Django cache (``CACHES[alias]``).
+
+    Each user's dashboard has a version token (see VersionTokens), and the data is
+    stored under the current version. Invalidating a user replaces the token, so a
+    build that started before the write and finishes after it is stored under the
+    old version and never read. The token also serves as the dashboard's ETag.
+    Entries expire after ``timeout`` seconds (default ``DASHBOARD_CACHE_TTL_SECONDS``,
+    300; 0 disables the cache), which bounds how stale names and titles written
+    elsewhere can get. If the cache cannot be reached, or is private to each worker
+    process (CACHE_SHARED), the data is built as if it had been a miss.
+    """
+
+    def __init__(
+        self,
+        prefix: str = "dashboard",
+        alias: str = "default",
+        timeout: Optional[int] = None,
+        versions: Optional[VersionTokens] = None,
+    ):
+        self.prefix = prefix
+        self.alias = alias
+        self.timeout = timeout if timeout is not None else int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "300"))
+        self.versions = versions or version_tokens
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.errors = 0
+
+    @property
+    def cache(self):
+        """The Django cache, or None when it is disabled or the version tokens are (e.g. an unshared cache)."""
+        if self.timeout <= 0 or not self.versions.enabled:
+            return None
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    def version(self, user_id: str) -> Optional[str]:
+        """The token of the user's current dashboard data, or None without a cache."""
+        return self.versions.get(self.prefix, user_id)
+
+    def _count(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get_or_build(self, user_id: str, build: Callable[[], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """The user's cached dashboard data, or build() stored for next time. None results are not cached."""
+        cache = self.cache
+        version = self.version(user_id) if cache is not None and user_id else None
+        if version is None:
+            return build()
+
+        try:
+            data_key = f"{self.prefix}:{user_id}:data:{version}"
+            data = cache.get(data_key)
+        except Exception as e:
+            logger.warning("Dashboard cache read failed for user %s: %s", user_id, e)
+            self._count('errors')
+            return build()
+
+        if data is not None:
+            self._count('hits')
+            return data
+
+        self._count('misses')
+        data = build()
+        if data is not None:
+            try:
+                cache.set(data_key, data, self.timeout)
+            except Exception as e:
+                logger.warning("Dashboard cache write failed for user %s: %s", user_id, e)
+                self._count('errors')
+        return data
+
+    def invalidate(self, user_ids: Iterable[Optional[str]]) -> None:
+        """Drop the cached dashboard data of these users, e.g. after writing an expense or split they are part of."""
+        user_ids = {user_id for user_id in user_ids if user_id}
+        self.versions.bump(self.prefix, user_ids)
+        with self._lock:
+            self.invalidations += len(user_ids)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of this worker process."""
+        cache = self.cache
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'backend': type(cache).__name__ if cache is not None else None,
+                'timeout': self.timeout,
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations,
+                'errors': self.errors,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None,
+            }
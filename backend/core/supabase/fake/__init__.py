@@ -0,0 +1,6 @@
+"""In-memory, PostgREST-compatible stand-in for Supabase, selected with DB_BACKEND=fake."""
+
+from .client import FakeSupabaseClient, FakeAsyncSupabaseClient
+from .database import FakeDatabase, get_database
+
+__all__ = ["FakeSupabaseClient", "FakeAsyncSupabaseClient", "FakeDatabase", "get_database"]
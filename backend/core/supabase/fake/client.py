@@ -0,0 +1,449 @@
+import asyncio
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from postgrest.base_request_builder import APIResponse
+from postgrest.exceptions import APIError
+from ..filters import Condition, parse_logic_tree
+from .database import FakeDatabase, FakeTable, get_database
+from .functions import FUNCTIONS
+
+
+@dataclass
+class SelectField:
+    """A column or an embedded resource in a PostgREST select statement."""
+    name: str
+    alias: Optional[str] = None
+    inner: bool = False
+    children: Optional[List["SelectField"]] = None
+
+    @property
+    def key(self) -> str:
+        return self.alias or self.name
+
+
+def _split_top_level(text: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for char in text:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_select(select_statement: str) -> List[SelectField]:
+    """Parse a select statement such as ``*, debtor:users!inner(name)``."""
+    fields = []
+    for part in _split_top_level(select_statement or "*"):
+        children = None
+        if "(" in part:
+            head = part[:part.index("(")]
+            children = parse_select(part[part.index("(") + 1:part.rindex(")")])
+        else:
+            head = part
+        alias, _, name = head.rpartition(":")
+        name, _, hint = name.partition("!")
+        fields.append(SelectField(
+            name=name.strip(),
+            alias=alias.strip() or None,
+            inner=hint.strip() == "inner",
+            children=children,
+        ))
+    return fields
+
+
+def _like_pattern(pattern: str, ignore_case: bool) -> "re.Pattern":
+    regex = "".join(".*" if char in "%*" else "." if char == "_" else re.escape(char) for char in pattern)
+    return re.compile(f"^{regex}$", re.IGNORECASE if ignore_case else 0)
+
+
+def _matches(table: FakeTable, row: Dict[str, Any], condition: Condition) -> bool:
+    """Evaluate a filter with SQL semantics: comparisons with null are never true."""
+    stored = row.get(condition.column)
+    operator, value = condition.operator, condition.value
+
+    if operator in ("and", "or"):
+        combine = all if operator == "and" else any
+        result = combine(_matches(table, row, child) for child in value)
+        return not result if condition.negate else result
+
+    if operator == "is":
+        result = stored is value if value is None else stored == value
+        return not result if condition.negate else result
+    if stored is None:
+        return False
+
+    column = table.column(condition.column)
+    if operator == "eq":
+        result = stored == value
+    elif operator == "neq":
+        result = stored != value
+    elif operator == "in":
+        result = stored in value
+    elif operator in ("gt", "gte", "lt", "lte"):
+        if value is None:
+            return False
+        left, right = column.sort_key(stored), column.sort_key(value)
+        result = {
+            "gt": left > right,
+            "gte": left >= right,
+            "lt": left < right,
+            "lte": left <= right,
+        }[operator]
+    elif operator in ("like", "ilike"):
+        result = bool(_like_pattern(value, operator == "ilike").match(str(stored)))
+    else:
+        raise APIError({"message": f"unsupported operator: {operator}", "code": "PGRST100"})
+    return not result if condition.negate else result
+
+
+class FakeRequestBuilder:
+    """Filters, ordering and paging for a fake query, mirroring the postgrest-py builders."""
+
+    def __init__(self, client: "FakeSupabaseClient", table_name: str, operation: str,
+                 select_statement: str = "*", data: Any = None):
+        self.client = client
+        self.table_name = table_name
+        self.operation = operation
+        self.fields = parse_select(select_statement)
+        self.data = data
+        self.filters: List[Condition] = []
+        self.ordering: List[Tuple[str, bool, Optional[bool]]] = []
+        self.limit_count: Optional[int] = None
+        self.offset_count = 0
+        self.negate_next = False
+
+    @property
+    def not_(self) -> "FakeRequestBuilder":
+        """Negate the filter applied next."""
+        self.negate_next = True
+        return self
+
+    def filter(self, column: str, operator: str, value: Any) -> "FakeRequestBuilder":
+        self.filters.append(Condition(column, operator, value, self.negate_next))
+        self.negate_next = False
+        return self
+
+    def eq(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "FakeRequestBuilder":
+        return self.filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "FakeRequestBuilder":
+        return self.filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "FakeRequestBuilder":
+        return self.filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "FakeRequestBuilder":
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        return self.filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "FakeRequestBuilder":
+        return self.filter(column, "in", list(values))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "FakeRequestBuilder":
+        if reference_table:
+            raise ValueError("The fake backend does not filter embedded resources with or")
+        self.filters.append(parse_logic_tree("or", filters, self.negate_next))
+        self.negate_next = False
+        return self
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None,
+              foreign_table: Optional[str] = None) -> "FakeRequestBuilder":
+        if foreign_table:
+            raise ValueError("The fake backend does not order embedded resources")
+        self.ordering.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "FakeRequestBuilder":
+        if foreign_table:
+            raise ValueError("The fake backend does not limit embedded resources")
+        self.limit_count = size
+        return self
+
+    def offset(self, size: int) -> "FakeRequestBuilder":
+        self.offset_count = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "FakeRequestBuilder":
+        if foreign_table:
+            raise ValueError("The fake backend does not page embedded resources")
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    def execute(self) -> APIResponse:
+        """Run the query against the in-memory database, after the configured latency."""
+        self.client.wait()
+        return self._run()
+
+    def _run(self) -> APIResponse:
+        database = self.client.database
+        with database.lock:
+            table = database.table(self.table_name)
+            if self.operation == "select":
+                data = self._select(database, table)
+            elif self.operation == "insert":
+                data = self._insert(table)
+            elif self.operation == "update":
+                data = [
+                    dict(table.update(row_id, self.data))
+                    for row_id in self._matching_row_ids(table, self._own_filters(table))
+                ]
+            elif self.operation == "delete":
+                row_ids = self._matching_row_ids(table, self._own_filters(table))
+                data = [dict(row) for row in database.delete_rows(table, row_ids)]
+            else:
+                raise APIError({"message": f"unsupported operation: {self.operation}", "code": "PGRST100"})
+        return APIResponse(data=data, count=None)
+
+    def _own_filters(self, table: FakeTable) -> List[Condition]:
+        """Filters on the table's own columns, with values converted to the column types."""
+        return [self._normalized(table, condition) for condition in self.filters if "." not in condition.column]
+
+    @staticmethod
+    def _normalized(table: FakeTable, condition: Condition) -> Condition:
+        value = condition.value
+        if condition.operator in ("and", "or"):
+            value = [FakeRequestBuilder._normalized(table, child) for child in value]
+        elif condition.operator == "in":
+            value = [table.normalize(condition.column, item) for item in value]
+        elif condition.operator in ("eq", "neq", "gt", "gte", "lt", "lte"):
+            value = table.normalize(condition.column, value)
+        return Condition(condition.column, condition.operator, value, condition.negate)
+
+    @staticmethod
+    def _matching_row_ids(table: FakeTable, filters: List[Condition]) -> List[int]:
+        """Row IDs matching all filters, narrowed down with the most selective index first."""
+        candidates = None
+        for condition in filters:
+            if condition.negate or condition.operator not in ("eq", "in", "is"):
+                continue
+            if condition.operator == "is" and condition.value is not None:
+                continue
+            values = condition.value if condition.operator == "in" else [condition.value]
+            row_ids = table.lookup(condition.column, values)
+            if row_ids is not None and (candidates is None or len(row_ids) < len(candidates)):
+                candidates = row_ids
+
+        row_ids = sorted(candidates) if candidates is not None else list(table.rows)
+        return [
+            row_id for row_id in row_ids
+            if all(_matches(table, table.rows[row_id], condition) for condition in filters)
+        ]
+
+    def _insert(self, table: FakeTable) -> List[Dict[str, Any]]:
+        rows = self.data if isinstance(self.data, list) else [self.data]
+        explicit_columns = {key for row in rows for key in row} if isinstance(self.data, list) else None
+        return [dict(table.insert(row, explicit_columns)) for row in rows]
+
+    def _select(self, database: FakeDatabase, table: FakeTable) -> List[Dict[str, Any]]:
+        results = []
+        for row_id in self._matching_row_ids(table, self._own_filters(table)):
+            row = table.rows[row_id]
+            projected = _project(database, table, row, self.fields, self.filters, prefix="")
+            if projected is not None:
+                results.append((row, projected))
+
+        for column, desc, nullsfirst in reversed(self.ordering):
+            key_column = table.column(column)
+            nulls_first = desc if nullsfirst is None else nullsfirst
+            present = [item for item in results if item[0].get(column) is not None]
+            missing = [item for item in results if item[0].get(column) is None]
+            present.sort(key=lambda item: key_column.sort_key(item[0][column]), reverse=desc)
+            results = missing + present if nulls_first else present + missing
+
+        results = results[self.offset_count:]
+        if self.limit_count is not None:
+            results = results[:self.limit_count]
+        return [projected for _, projected in results]
+
+
+def _relationship(parent: FakeTable, child: FakeTable) -> Tuple[bool, str, str]:
+    """
+    How an embedded table relates to its parent: (to_many, parent_column, child_column).
+
+    A foreign key on the parent embeds a single row; one on the child embeds a list.
+    """
+    for foreign_key in parent.schema.foreign_keys:
+        if foreign_key.references == child.name:
+            return False, foreign_key.column, foreign_key.referenced_column
+    for foreign_key in child.schema.foreign_keys:
+        if foreign_key.references == parent.name:
+            return True, foreign_key.referenced_column, foreign_key.column
+    raise APIError({
+        "message": f"Could not find a relationship between '{parent.name}' and '{child.name}'",
+        "code": "PGRST200",
+    })
+
+
+def _project(database: FakeDatabase, table: FakeTable, row: Dict[str, Any], fields: List[SelectField],
+             filters: List[Condition], prefix: str) -> Optional[Dict[str, Any]]:
+    """
+    Build the selected columns and embedded resources of a row.
+
+    Returns None when an ``!inner`` embed has no matching rows, so the row is dropped.
+    """
+    result: Dict[str, Any] = {}
+    for select_field in fields:
+        if select_field.children is None:
+            if select_field.name == "*":
+                result.update(row)
+            else:
+                result[select_field.key] = row.get(select_field.name)
+            continue
+
+        child = database.table(select_field.name)
+        to_many, parent_column, child_column = _relationship(table, child)
+        child_prefix = f"{prefix}{select_field.key}."
+        child_filters = [
+            FakeRequestBuilder._normalized(child, Condition(
+                condition.column[len(child_prefix):], condition.operator, condition.value, condition.negate
+            ))
+            for condition in filters
+            if condition.column.startswith(child_prefix) and "." not in condition.column[len(child_prefix):]
+        ]
+        related_ids = FakeRequestBuilder._matching_row_ids(
+            child, [Condition(child_column, "eq", row.get(parent_column))] + child_filters
+        ) if row.get(parent_column) is not None else []
+
+        embedded = []
+        for related_id in related_ids:
+            projected = _project(database, child, child.rows[related_id], select_field.children, filters, child_prefix)
+            if projected is not None:
+                embedded.append(projected)
+
+        if select_field.inner and not embedded:
+            return None
+        result[select_field.key] = embedded if to_many else (embedded[0] if embedded else None)
+    return result
+
+
+class FakeQueryBuilder:
+    """Entry point returned by ``table()``, mirroring postgrest-py's request builder."""
+
+    builder_class = FakeRequestBuilder
+
+    def __init__(self, client: "FakeSupabaseClient", table_name: str):
+        self.client = client
+        self.table_name = table_name
+
+    def select(self, *columns: str, count: Optional[str] = None) -> FakeRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "select", ",".join(columns) or "*")
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False, default_to_null: bool = True) -> FakeRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "insert", data=json)
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None,
+               returning: str = "representation") -> FakeRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "update", data=json)
+
+    def delete(self, *, count: Optional[str] = None, returning: str = "representation") -> FakeRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "delete")
+
+
+class FakeRpcBuilder:
+    """Call of a database function, run by its Python version in fake/functions.py."""
+
+    def __init__(self, client: "FakeSupabaseClient", function_name: str, params: Dict[str, Any]):
+        self.client = client
+        self.function_name = function_name
+        self.params = params
+
+    def execute(self) -> APIResponse:
+        self.client.wait()
+        return self._run()
+
+    def _run(self) -> APIResponse:
+        # Functions are created per environment, like tables; the prefix is the part before the known name
+        for name, function in FUNCTIONS.items():
+            if self.function_name.endswith(name):
+                table_prefix = self.function_name[:-len(name)]
+                with self.client.database.lock:
+                    data = function(self.client.database, table_prefix, self.params)
+                # Functions returning a single value are not wrapped in a list by PostgREST
+                return APIResponse.model_construct(data=data, count=None)
+        raise APIError({
+            "message": f"Could not find the function public.{self.function_name} in the schema cache",
+            "code": "PGRST202",
+        })
+
+
+class FakeSupabaseClient:
+    """
+    Drop-in replacement for the Supabase client that serves tables from memory.
+
+    Every executed request first sleeps for ``latency_ms`` so that the cost of
+    making many small requests shows up as it would against the real API.
+    """
+
+    query_builder_class = FakeQueryBuilder
+    rpc_builder_class = FakeRpcBuilder
+
+    def __init__(self, database: Optional[FakeDatabase] = None, latency_ms: float = 0.0):
+        self.database = database if database is not None else get_database()
+        self.latency_ms = latency_ms
+
+    def wait(self) -> None:
+        if self.latency_ms > 0:
+            time.sleep(self.latency_ms / 1000)
+
+    def table(self, table_name: str) -> FakeQueryBuilder:
+        return self.query_builder_class(self, table_name)
+
+    def from_(self, table_name: str) -> FakeQueryBuilder:
+        return self.table(table_name)
+
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> FakeRpcBuilder:
+        return self.rpc_builder_class(self, function_name, params or {})
+
+
+class FakeAsyncRequestBuilder(FakeRequestBuilder):
+    """Request builder whose execute is awaitable, like the async postgrest-py builders."""
+
+    async def execute(self) -> APIResponse:
+        if self.client.latency_ms > 0:
+            await asyncio.sleep(self.client.latency_ms / 1000)
+        return self._run()
+
+
+class FakeAsyncQueryBuilder(FakeQueryBuilder):
+    builder_class = FakeAsyncRequestBuilder
+
+
+class FakeAsyncRpcBuilder(FakeRpcBuilder):
+    async def execute(self) -> APIResponse:
+        if self.client.latency_ms > 0:
+            await asyncio.sleep(self.client.latency_ms / 1000)
+        return self._run()
+
+
+class FakeAsyncSupabaseClient(FakeSupabaseClient):
+    """Async variant of FakeSupabaseClient, sharing the same in-memory database."""
+
+    query_builder_class = FakeAsyncQueryBuilder
+    rpc_builder_class = FakeAsyncRpcBuilder
@@ -0,0 +1,203 @@
+import itertools
+import threading
+import uuid
+from typing import Any, Dict, Iterable, List, Optional, Set
+from postgrest.exceptions import APIError
+from .schema import Column, TableSchema, load_schema
+
+
+class FakeTable:
+    """
+    In-memory table with hash indexes on its key and indexed columns.
+
+    Rows are kept in insertion order. Columns that are not in the schema (for example
+    ones added by a migration script) are stored as given, without type conversion.
+    """
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self.indexes: Dict[str, Dict[Any, Set[int]]] = {
+            column: {} for column in schema.indexed_columns()
+        }
+        self._row_ids = itertools.count(1)
+
+    @property
+    def name(self) -> str:
+        return self.schema.name
+
+    def column(self, name: str) -> Column:
+        """The schema column, or an untyped nullable column for names not in the schema."""
+        return self.schema.columns.get(name) or Column(name=name, type="any")
+
+    def normalize(self, column: str, value: Any) -> Any:
+        """Convert a filter value to the stored representation of a column."""
+        column = self.column(column)
+        if column.type == "any":
+            return value
+        try:
+            return column.to_storage(value)
+        except (TypeError, ValueError):
+            raise APIError({
+                "message": f'invalid input syntax for type {column.type}: "{value}"',
+                "code": "22P02",
+            })
+
+    def lookup(self, column: str, values: Iterable[Any]) -> Optional[Set[int]]:
+        """Row IDs with one of the values in an indexed column, or None if the column has no index."""
+        index = self.indexes.get(column)
+        if index is None:
+            return None
+        row_ids: Set[int] = set()
+        for value in values:
+            row_ids |= index.get(value, set())
+        return row_ids
+
+    def find(self, column: str, value: Any) -> List[Dict[str, Any]]:
+        """Rows whose column equals value, using the column's index when it has one."""
+        value = self.normalize(column, value)
+        row_ids = self.lookup(column, [value])
+        if row_ids is None:
+            return [row for row in self.rows.values() if row.get(column) == value]
+        return [self.rows[row_id] for row_id in sorted(row_ids)]
+
+    def insert(self, values: Dict[str, Any], explicit_columns: Optional[Set[str]] = None) -> Dict[str, Any]:
+        """
+        Insert a row, filling in column defaults, and return it.
+
+        Columns in explicit_columns that are missing from values are set to null
+        instead of their default, as PostgREST does for bulk inserts.
+        """
+        row = {}
+        for name, column in self.schema.columns.items():
+            if name in values:
+                row[name] = self.normalize(name, values[name])
+            elif explicit_columns and name in explicit_columns:
+                row[name] = None
+            else:
+                row[name] = column.default() if column.default else None
+        for name, value in values.items():
+            if name not in row:
+                row[name] = value
+
+        self._check_constraints(row)
+        row_id = next(self._row_ids)
+        self.rows[row_id] = row
+        self._index(row_id, row)
+        return row
+
+    def update(self, row_id: int, values: Dict[str, Any]) -> Dict[str, Any]:
+        """Update columns of a row and return it."""
+        row = self.rows[row_id]
+        updated = dict(row)
+        for name, value in values.items():
+            updated[name] = self.normalize(name, value)
+
+        self._check_constraints(updated, ignore_row_id=row_id)
+        self._unindex(row_id, row)
+        self.rows[row_id] = updated
+        self._index(row_id, updated)
+        return updated
+
+    def delete(self, row_id: int) -> Dict[str, Any]:
+        """Delete a row and return it."""
+        row = self.rows.pop(row_id)
+        self._unindex(row_id, row)
+        return row
+
+    def _index(self, row_id: int, row: Dict[str, Any]) -> None:
+        for column, index in self.indexes.items():
+            index.setdefault(row.get(column), set()).add(row_id)
+
+    def _unindex(self, row_id: int, row: Dict[str, Any]) -> None:
+        for column, index in self.indexes.items():
+            row_ids = index.get(row.get(column))
+            if row_ids is not None:
+                row_ids.discard(row_id)
+                if not row_ids:
+                    del index[row.get(column)]
+
+    def _check_constraints(self, row: Dict[str, Any], ignore_row_id: Optional[int] = None) -> None:
+        for name, column in self.schema.columns.items():
+            if not column.nullable and row.get(name) is None:
+                raise APIError({
+                    "message": f'null value in column "{name}" of relation "{self.name}" violates not-null constraint',
+                    "code": "23502",
+                })
+
+        for key in self.schema.unique + ([(self.schema.primary_key,)] if self.schema.primary_key else []):
+            values = tuple(row.get(column) for column in key)
+            if any(value is None for value in values):
+                continue
+            candidates = self.lookup(key[0], [values[0]])
+            if candidates is None:
+                candidates = self.rows.keys()
+            for row_id in candidates:
+                if row_id != ignore_row_id and tuple(self.rows[row_id].get(column) for column in key) == values:
+                    raise APIError({
+                        "message": f'duplicate key value violates unique constraint "{self.name}_{"_".join(key)}_key"',
+                        "code": "23505",
+                    })
+
+
+class FakeDatabase:
+    """
+    Set of in-memory tables with the schema from scripts/create_tables.py.
+
+    Tables that are not in the schema are created on first use, with a generated
+    ``id`` column, so every table the application uses works offline.
+    """
+
+    def __init__(self, schemas: Optional[Dict[str, TableSchema]] = None):
+        self.schemas = schemas if schemas is not None else load_schema()
+        self.tables: Dict[str, FakeTable] = {}
+        self.lock = threading.RLock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all rows."""
+        with self.lock:
+            self.tables = {name: FakeTable(schema) for name, schema in self.schemas.items()}
+
+    def table(self, name: str) -> FakeTable:
+        """Get a table by name, creating a schemaless one if it does not exist."""
+        with self.lock:
+            if name not in self.tables:
+                schema = TableSchema(
+                    name=name,
+                    columns={"id": Column(name="id", type="uuid", nullable=False, default=lambda: str(uuid.uuid4()))},
+                    primary_key="id",
+                )
+                self.tables[name] = FakeTable(schema)
+            return self.tables[name]
+
+    def delete_rows(self, table: FakeTable, row_ids: List[int]) -> List[Dict[str, Any]]:
+        """Delete rows, cascading to rows that reference them with ON DELETE CASCADE."""
+        deleted = [table.delete(row_id) for row_id in row_ids]
+        for child in list(self.tables.values()):
+            for foreign_key in child.schema.foreign_keys:
+                if foreign_key.references != table.name or not foreign_key.on_delete_cascade:
+                    continue
+                values = [row.get(foreign_key.referenced_column) for row in deleted]
+                child_row_ids = child.lookup(foreign_key.column, values)
+                if child_row_ids is None:
+                    child_row_ids = {
+                        row_id for row_id, row in child.rows.items()
+                        if row.get(foreign_key.column) in values
+                    }
+                if child_row_ids:
+                    self.delete_rows(child, sorted(child_row_ids))
+        return deleted
+
+
+_database: Optional[FakeDatabase] = None
+_database_lock = threading.Lock()
+
+
+def get_database() -> FakeDatabase:
+    """The in-memory database shared by every fake client in the process."""
+    global _database
+    with _database_lock:
+        if _database is None:
+            _database = FakeDatabase()
+        return _database
@@ -0,0 +1,66 @@
+"""Python versions of the database functions in scripts/create_functions.py, for the fake backend."""
+
+from bisect import bisect_right
+from typing import Any, Callable, Dict
+from .database import FakeDatabase
+
+
+def get_user_dashboard_totals(database: FakeDatabase, table_prefix: str, params: Dict[str, Any]) -> Dict[str, int]:
+    """Lent total of a user's not fully paid expenses, owed total of their unconfirmed splits, and net."""
+    user_id = params["p_user_id"]
+    expenses = database.table(f"{table_prefix}expenses")
+    splits = database.table(f"{table_prefix}splits")
+
+    lent = 0
+    for expense in expenses.find("created_by", user_id):
+        expense_splits = splits.find("expenseid", expense["id"])
+        if not expense_splits or any(split.get("paid_confirmed") is None for split in expense_splits):
+            lent += expense.get("total_amount") or 0
+    owed = sum(
+        split.get("amount_owed") or 0
+        for split in splits.find("userid", user_id) if split.get("paid_confirmed") is None
+    )
+    return {"lent": lent, "owed": owed, "net": lent - owed}
+
+
+def get_credit_score_stats(database: FakeDatabase, table_prefix: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """User counts, the average credit score and the number of scores between consecutive edges."""
+    edges = params.get("p_edges", [550, 650, 750])
+    scores = [
+        user["credit_score"] for user in database.table(f"{table_prefix}users").rows.values()
+        if user.get("credit_score") is not None
+    ]
+    histogram = [0] * (len(edges) + 1)
+    for score in scores:
+        # Same buckets as width_bucket(score, edges)
+        histogram[bisect_right(edges, score)] += 1
+    return {
+        "total_users": len(database.table(f"{table_prefix}users").rows),
+        "users_with_scores": len(scores),
+        "average_score": round(sum(scores) / len(scores), 2) if scores else None,
+        "histogram": histogram,
+    }
+
+
+def add_credit_score_aggregate_deltas(database: FakeDatabase, table_prefix: str, params: Dict[str, Any]) -> int:
+    """Add each delta's totals to the user's stored aggregate row. Users without a row are skipped."""
+    aggregates = database.table(f"{table_prefix}credit_score_aggregates")
+    updated = 0
+    for delta in params["p_deltas"]:
+        row_ids = aggregates.lookup("user_id", [aggregates.normalize("user_id", delta["user_id"])])
+        for row_id in sorted(row_ids or ()):
+            row = aggregates.rows[row_id]
+            aggregates.update(row_id, {
+                column: (row.get(column) or 0) + value
+                for column, value in delta.items() if column != "user_id"
+            })
+            updated += 1
+    return updated
+
+
+# Keyed by function name without the environment prefix
+FUNCTIONS: Dict[str, Callable[[FakeDatabase, str, Dict[str, Any]], Any]] = {
+    "get_user_dashboard_totals": get_user_dashboard_totals,
+    "get_credit_score_stats": get_credit_score_stats,
+    "add_credit_score_aggregate_deltas": add_credit_score_aggregate_deltas,
+}
@@ -0,0 +1,244 @@
+"""
+Table definitions for the fake backend, read from the SQL in scripts/create_tables.py.
+
+The SQL is captured by running SupabaseTableCreator with execute_sql replaced, so the
+fake always has the same tables, defaults, keys and indexes as the real database.
+"""
+
+import contextlib
+import importlib.util
+import io
+import os
+import re
+import uuid
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+CREATE_TABLES_SCRIPT = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "scripts", "create_tables.py"
+)
+
+_CREATE_TABLE_RE = re.compile(r"CREATE TABLE IF NOT EXISTS (\w+) \(", re.IGNORECASE)
+_CREATE_INDEX_RE = re.compile(r"CREATE INDEX IF NOT EXISTS \w+ ON (\w+)\((\w+)\)", re.IGNORECASE)
+_FOREIGN_KEY_RE = re.compile(
+    r"FOREIGN KEY \((\w+)\) REFERENCES (\w+)\((\w+)\)(.*)", re.IGNORECASE
+)
+_UNIQUE_RE = re.compile(r"UNIQUE\s*\(([^)]*)\)", re.IGNORECASE)
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _parse_timestamp(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value))
+    if parsed.tzinfo is None:
+        # timestamptz input without an offset is read in the server's time zone (UTC)
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc)
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _parse_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ("true", "t", "1")
+    return bool(value)
+
+
+@dataclass
+class Column:
+    name: str
+    type: str
+    nullable: bool = True
+    default: Optional[Callable[[], Any]] = None
+
+    def to_storage(self, value: Any) -> Any:
+        """Convert a value written to this column to what PostgREST would return for it."""
+        if value is None:
+            return None
+        if self.type == "integer":
+            return int(value)
+        if self.type == "numeric":
+            return float(value)
+        if self.type == "boolean":
+            return _parse_bool(value)
+        if self.type == "timestamptz":
+            return _parse_timestamp(value).isoformat()
+        if self.type == "date":
+            return _parse_date(value).isoformat()
+        return str(value)
+
+    def sort_key(self, value: Any) -> Any:
+        """A comparable version of a stored value, used by range filters and ordering."""
+        if value is None:
+            return None
+        if self.type == "timestamptz":
+            return _parse_timestamp(value)
+        if self.type == "date":
+            return _parse_date(value)
+        return value
+
+
+@dataclass
+class ForeignKey:
+    column: str
+    references: str
+    referenced_column: str
+    on_delete_cascade: bool = False
+
+
+@dataclass
+class TableSchema:
+    name: str
+    columns: Dict[str, Column] = field(default_factory=dict)
+    primary_key: Optional[str] = None
+    unique: List[Tuple[str, ...]] = field(default_factory=list)
+    foreign_keys: List[ForeignKey] = field(default_factory=list)
+    indexes: List[str] = field(default_factory=list)
+
+    def indexed_columns(self) -> List[str]:
+        """Columns with an index: the primary key, single-column unique keys and explicit indexes."""
+        columns = [self.primary_key] if self.primary_key else []
+        columns += [key[0] for key in self.unique if len(key) == 1]
+        columns += self.indexes
+        columns += [foreign_key.column for foreign_key in self.foreign_keys]
+        return list(dict.fromkeys(columns))
+
+
+def _column_type(definition: str) -> str:
+    definition = definition.upper()
+    if definition.startswith("TIMESTAMP"):
+        return "timestamptz"
+    if definition.startswith("DATE"):
+        return "date"
+    if definition.startswith(("INTEGER", "INT", "BIGINT", "SMALLINT")):
+        return "integer"
+    if definition.startswith(("DECIMAL", "NUMERIC", "REAL", "DOUBLE")):
+        return "numeric"
+    if definition.startswith("BOOLEAN"):
+        return "boolean"
+    if definition.startswith("UUID"):
+        return "uuid"
+    return "text"
+
+
+def _column_default(definition: str) -> Optional[Callable[[], Any]]:
+    match = re.search(r"DEFAULT\s+(\S+)", definition, re.IGNORECASE)
+    if not match:
+        return None
+    default = match.group(1).upper()
+    if default.startswith("GEN_RANDOM_UUID"):
+        return lambda: str(uuid.uuid4())
+    if default.startswith("NOW"):
+        return _now
+    if default in ("TRUE", "FALSE"):
+        return lambda: default == "TRUE"
+    return lambda: match.group(1).strip("'")
+
+
+def _split_top_level(body: str) -> List[str]:
+    """Split a CREATE TABLE body on commas that are not inside parentheses."""
+    parts, depth, current = [], 0, []
+    for char in body:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _table_body(sql: str, start: int) -> str:
+    """The text between the parenthesis at start and its matching closing parenthesis."""
+    depth = 0
+    for position in range(start, len(sql)):
+        if sql[position] == "(":
+            depth += 1
+        elif sql[position] == ")":
+            depth -= 1
+            if depth == 0:
+                return sql[start + 1:position]
+    raise ValueError("Unbalanced parentheses in CREATE TABLE statement")
+
+
+def parse_schema(sql: str) -> Dict[str, TableSchema]:
+    """Parse the CREATE TABLE and CREATE INDEX statements in a SQL script."""
+    tables: Dict[str, TableSchema] = {}
+
+    for match in _CREATE_TABLE_RE.finditer(sql):
+        # Unquoted identifiers are folded to lower case by Postgres
+        table = TableSchema(name=match.group(1).lower())
+        for part in _split_top_level(_table_body(sql, match.end() - 1)):
+            upper = part.upper()
+            if upper.startswith("FOREIGN KEY"):
+                foreign_key = _FOREIGN_KEY_RE.match(part)
+                table.foreign_keys.append(ForeignKey(
+                    column=foreign_key.group(1).lower(),
+                    references=foreign_key.group(2).lower(),
+                    referenced_column=foreign_key.group(3).lower(),
+                    on_delete_cascade="ON DELETE CASCADE" in foreign_key.group(4).upper(),
+                ))
+            elif upper.startswith("UNIQUE"):
+                columns = _UNIQUE_RE.match(part).group(1)
+                table.unique.append(tuple(column.strip().lower() for column in columns.split(",")))
+            else:
+                name, definition = part.split(None, 1)
+                name = name.lower()
+                table.columns[name] = Column(
+                    name=name,
+                    type=_column_type(definition),
+                    nullable="NOT NULL" not in definition.upper() and "PRIMARY KEY" not in definition.upper(),
+                    default=_column_default(definition),
+                )
+                if "PRIMARY KEY" in definition.upper():
+                    table.primary_key = name
+                elif re.search(r"\bUNIQUE\b", definition, re.IGNORECASE):
+                    table.unique.append((name,))
+        tables[table.name] = table
+
+    for match in _CREATE_INDEX_RE.finditer(sql):
+        table = tables.get(match.group(1).lower())
+        if table is not None:
+            table.indexes.append(match.group(2).lower())
+
+    return tables
+
+
+def create_tables_sql() -> str:
+    """Capture the SQL that scripts/create_tables.py runs for the current ENVIRONMENT."""
+    spec = importlib.util.spec_from_file_location("create_tables", CREATE_TABLES_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    statements: List[str] = []
+
+    class _SqlRecorder(module.SupabaseTableCreator):
+        def execute_sql(self, sql):
+            statements.append(sql)
+            return True
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        _SqlRecorder().create_all_tables()
+    return "\n".join(statements)
+
+
+def load_schema() -> Dict[str, TableSchema]:
+    """Table definitions from scripts/create_tables.py, keyed by prefixed table name."""
+    return parse_schema(create_tables_sql())
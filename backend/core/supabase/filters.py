@@ -0,0 +1,78 @@
+"""
+Filter conditions shared by the query engines that do not go through PostgREST.
+
+PostgREST ``or``/``and`` filters arrive as text such as
+``created_at.lt."2024-01-01",and(created_at.eq."2024-01-01",id.lt."abc")`` and are
+parsed into a tree of Condition objects.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Any, List
+
+
+@dataclass
+class Condition:
+    """A filter on a column, or an and/or group of conditions (column is empty, value is the list)."""
+    column: str
+    operator: str
+    value: Any
+    negate: bool = False
+
+
+def _split_conditions(text: str) -> List[str]:
+    """Split a logic tree on commas outside parentheses and double quotes."""
+    parts, depth, quoted, escaped, current = [], 0, False, False, []
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\" and quoted:
+            escaped = True
+        elif char == '"':
+            quoted = not quoted
+        elif not quoted and char == "(":
+            depth += 1
+        elif not quoted and char == ")":
+            depth -= 1
+        if char == "," and depth == 0 and not quoted:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append("".join(current))
+    return [part.strip() for part in parts if part.strip()]
+
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def parse_logic_tree(operator: str, conditions: str, negate: bool = False) -> Condition:
+    """
+    Parse the conditions of an ``or=(...)`` / ``and=(...)`` parameter, e.g.
+    ``created_at.lt."2024-01-01",and(created_at.eq."2024-01-01",id.lt."abc")``.
+    """
+    children = []
+    for part in _split_conditions(conditions):
+        child_negate = part.startswith("not.")
+        if child_negate:
+            part = part[len("not."):]
+        match = re.match(r"^(and|or)\((.*)\)$", part, re.DOTALL)
+        if match:
+            children.append(parse_logic_tree(match.group(1), match.group(2), child_negate))
+            continue
+
+        column, _, rest = part.partition(".")
+        if rest.startswith("not."):
+            child_negate, rest = not child_negate, rest[len("not."):]
+        child_operator, _, value = rest.partition(".")
+        if child_operator == "in":
+            value = [_unquote(item) for item in _split_conditions(value.strip()[1:-1])]
+        elif child_operator == "is":
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        else:
+            value = _unquote(value)
+        children.append(Condition(column, child_operator, value, child_negate))
+    return Condition("", operator, children, negate)
@@ -0,0 +1,152 @@
+import atexit
+import importlib.util
+import logging
+import os
+import threading
+from typing import Dict, Any, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class _CountingTransport(httpx.HTTPTransport):
+    """HTTP transport that counts requests in flight and requests that had to wait for a connection."""
+
+    def __init__(self, max_connections: int, **kwargs):
+        super().__init__(**kwargs)
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.requests = 0
+        self.waits = 0
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        with self._lock:
+            self.requests += 1
+            if self.in_flight >= self.max_connections:
+                self.waits += 1
+            self.in_flight += 1
+        try:
+            return super().handle_request(request)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class HttpConnectionPool:
+    """
+    Connection pool for requests to the Supabase API, shared by every client in a worker process.
+
+    Keeping connections alive avoids a TCP and TLS handshake per query. Limits and
+    timeouts are read from the environment:
+
+    - ``DB_HTTP_MAX_CONNECTIONS`` (default 20) and ``DB_HTTP_MAX_KEEPALIVE`` (default 10)
+    - ``DB_HTTP_KEEPALIVE_EXPIRY`` seconds an idle connection is kept (default 30)
+    - ``DB_HTTP_CONNECT_TIMEOUT`` (default 5), ``DB_HTTP_TIMEOUT`` for reads and writes
+      (default 10) and ``DB_HTTP_POOL_TIMEOUT`` to wait for a free connection (default 5)
+    - ``DB_HTTP2`` (default true), only used when the ``h2`` package is installed
+    """
+
+    def __init__(self):
+        self.limits = httpx.Limits(
+            max_connections=_env_int("DB_HTTP_MAX_CONNECTIONS", 20),
+            max_keepalive_connections=_env_int("DB_HTTP_MAX_KEEPALIVE", 10),
+            keepalive_expiry=_env_float("DB_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        )
+        request_timeout = _env_float("DB_HTTP_TIMEOUT", 10.0)
+        self.timeout = httpx.Timeout(
+            connect=_env_float("DB_HTTP_CONNECT_TIMEOUT", 5.0),
+            read=request_timeout,
+            write=request_timeout,
+            pool=_env_float("DB_HTTP_POOL_TIMEOUT", 5.0),
+        )
+        self.http2 = (
+            os.getenv("DB_HTTP2", "true").lower() == "true"
+            and importlib.util.find_spec("h2") is not None
+        )
+        self._client: Optional[httpx.Client] = None
+        self._transport: Optional[_CountingTransport] = None
+        self._lock = threading.Lock()
+
+    def client(self) -> httpx.Client:
+        """Get the shared HTTP client, creating it on first use."""
+        with self._lock:
+            if self._client is None or self._client.is_closed:
+                self._transport = _CountingTransport(
+                    max_connections=self.limits.max_connections,
+                    limits=self.limits,
+                    http2=self.http2,
+                )
+                self._client = httpx.Client(
+                    transport=self._transport,
+                    timeout=self.timeout,
+                    follow_redirects=True,
+                )
+                logger.info(
+                    f"HTTP connection pool created (max connections: {self.limits.max_connections}, "
+                    f"keep-alive: {self.limits.max_keepalive_connections}, http2: {self.http2})"
+                )
+            return self._client
+
+    def async_client(self) -> httpx.AsyncClient:
+        """
+        Create an async HTTP client with the same limits and timeouts.
+
+        Async clients are bound to an event loop, so each loop needs its own.
+        """
+        return httpx.AsyncClient(
+            limits=self.limits,
+            timeout=self.timeout,
+            http2=self.http2,
+            follow_redirects=True,
+        )
+
+    def close(self) -> None:
+        """Close all pooled connections. A new pool is created on the next request."""
+        with self._lock:
+            if self._client is not None and not self._client.is_closed:
+                self._client.close()
+                logger.info("HTTP connection pool closed.")
+            self._client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection and request counters for monitoring."""
+        stats = {
+            'max_connections': self.limits.max_connections,
+            'max_keepalive_connections': self.limits.max_keepalive_connections,
+            'http2': self.http2,
+            'connections': 0,
+            'in_use': 0,
+            'idle': 0,
+            'requests': 0,
+            'requests_in_flight': 0,
+            'waits': 0,
+        }
+        transport = self._transport
+        if transport is None:
+            return stats
+
+        connections = list(getattr(getattr(transport, '_pool', None), 'connections', []))
+        idle = sum(1 for connection in connections if connection.is_idle())
+        stats.update({
+            'connections': len(connections),
+            'in_use': len(connections) - idle,
+            'idle': idle,
+            'requests': transport.requests,
+            'requests_in_flight': transport.in_flight,
+            'waits': transport.waits,
+        })
+        return stats
+
+
+# Global instance, closed when the worker process exits
+http_pool = HttpConnectionPool()
+atexit.register(http_pool.close)
@@ -0,0 +1,95 @@
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+
+
+class QueryCollector:
+    """Records the database queries made while handling one request."""
+
+    def __init__(self):
+        self.queries: List[Dict[str, Any]] = []
+
+    def record(self, table_name: str, operation: str, filters: Optional[Dict], rows: int, duration_ms: float, failed: bool = False) -> None:
+        """Record one executed query."""
+        self.queries.append({
+            'table': table_name,
+            'operation': operation,
+            'filter_keys': filter_shape(filters),
+            'rows': rows,
+            'duration_ms': round(duration_ms, 3),
+            'failed': failed,
+        })
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def total_time_ms(self) -> float:
+        return round(sum(query['duration_ms'] for query in self.queries), 3)
+
+    def repeated_shapes(self, threshold: int) -> List[Dict[str, Any]]:
+        """Queries with the same table, operation and filter keys made more than threshold times."""
+        shapes = Counter(
+            (query['table'], query['operation'], query['filter_keys']) for query in self.queries
+        )
+        return [
+            {'table': table, 'operation': operation, 'filter_keys': list(filter_keys), 'count': count}
+            for (table, operation, filter_keys), count in shapes.most_common()
+            if count > threshold
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals per table, for logging."""
+        by_table: Dict[str, Dict[str, Any]] = {}
+        for query in self.queries:
+            table = by_table.setdefault(query['table'], {'queries': 0, 'rows': 0, 'time_ms': 0.0})
+            table['queries'] += 1
+            table['rows'] += query['rows']
+            table['time_ms'] = round(table['time_ms'] + query['duration_ms'], 3)
+        return {
+            'queries': self.count,
+            'time_ms': self.total_time_ms,
+            'by_table': by_table,
+        }
+
+
+# Collector for the current request. None outside of collect_queries, where recording is a no-op.
+_collector: ContextVar[Optional[QueryCollector]] = ContextVar("supabase_query_collector", default=None)
+
+
+@contextmanager
+def collect_queries() -> Iterator[QueryCollector]:
+    """Record every query made until the end of the block, typically one HTTP request."""
+    collector = QueryCollector()
+    token = _collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _collector.reset(token)
+
+
+def filter_shape(filters: Optional[Dict]) -> Tuple[str, ...]:
+    """The filter keys of a query, with list-valued (IN) filters marked, ignoring the values."""
+    return tuple(sorted(
+        f"{key}__in" if isinstance(value, (list, tuple, set)) else key
+        for key, value in (filters or {}).items()
+    ))
+
+
+def row_count(result: Any) -> int:
+    """The number of rows returned by _execute_query."""
+    if isinstance(result, list):
+        return len(result)
+    return 1 if result else 0
+
+
+def record_query(table_name: str, operation: str, filters: Optional[Dict], result: Any, started_at: float, failed: bool = False) -> None:
+    """Record a query in the current request's collector, if any. started_at is a time.perf_counter() value."""
+    collector = _collector.get()
+    if collector is None:
+        return
+    duration_ms = (time.perf_counter() - started_at) * 1000
+    collector.record(table_name, operation, filters, row_count(result), duration_ms, failed)
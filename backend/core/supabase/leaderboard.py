@@ -0,0 +1,173 @@
+"""In-process credit score leaderboard, so ranking queries do not scan the users table."""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+# Range of calculate_user_credit_score; scores outside it are counted at the nearest end
+MIN_SCORE = 300
+MAX_SCORE = 850
+
+
+class CreditScoreLeaderboard:
+    """
+    Users ranked by credit score, kept in memory by each worker process.
+
+    Counts per score are held in a Fenwick tree over the 300-850 range, so the rank
+    of a score and the number of users in a score range take O(log n), and top-N
+    walks the non-empty scores from the highest. The users are loaded from the
+    database when the leaderboard is older than ``ttl`` seconds (default
+    ``LEADERBOARD_TTL_SECONDS``, 60), and scores written in between by this process
+    are applied as they happen. Scores written by other worker processes show up on
+    the next load.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl if ttl is not None else float(os.getenv("LEADERBOARD_TTL_SECONDS", "60"))
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self.loads = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        # User rows (id, name, email, credit_score), with or without a score
+        self._users: Dict[str, Dict[str, Any]] = {}
+        # Score -> IDs of the users with it, in the order they were added
+        self._buckets: Dict[int, Dict[str, None]] = {}
+        self._tree = [0] * (MAX_SCORE - MIN_SCORE + 2)
+        self._ranked = 0
+        self._score_sum = 0
+
+    @property
+    def stale(self) -> bool:
+        """Whether the leaderboard should be loaded again before it is read."""
+        with self._lock:
+            return self._loaded_at is None or self._clock() - self._loaded_at >= self.ttl
+
+    def load(self, users: Iterable[Dict[str, Any]]) -> None:
+        """Replace the leaderboard with these user rows."""
+        with self._lock:
+            self._reset()
+            for user in users:
+                self._add(user)
+            self._loaded_at = self._clock()
+            self.loads += 1
+
+    def invalidate(self) -> None:
+        """Load the leaderboard again on the next read, e.g. after many scores changed at once."""
+        with self._lock:
+            self._loaded_at = None
+
+    def record(self, user: Dict[str, Any]) -> None:
+        """Apply a written user row, e.g. with a new credit score. Ignored until the first load."""
+        with self._lock:
+            if self._loaded_at is None or not user.get('id'):
+                return
+            self._remove(user['id'])
+            self._add(user)
+
+    def _index(self, score: int) -> int:
+        return min(max(score, MIN_SCORE), MAX_SCORE) - MIN_SCORE + 1
+
+    def _update_tree(self, score: int, delta: int) -> None:
+        index = self._index(score)
+        while index < len(self._tree):
+            self._tree[index] += delta
+            index += index & -index
+
+    def _count_up_to(self, index: int) -> int:
+        """Number of users whose score index is at most index."""
+        count = 0
+        while index > 0:
+            count += self._tree[index]
+            index -= index & -index
+        return count
+
+    def _add(self, user: Dict[str, Any]) -> None:
+        user = {key: user.get(key) for key in ('id', 'name', 'email', 'credit_score')}
+        self._users[user['id']] = user
+        score = user['credit_score']
+        if score is None:
+            return
+        self._buckets.setdefault(self._index(score), {})[user['id']] = None
+        self._update_tree(score, 1)
+        self._ranked += 1
+        self._score_sum += score
+
+    def _remove(self, user_id: str) -> None:
+        user = self._users.pop(user_id, None)
+        if not user or user['credit_score'] is None:
+            return
+        score = user['credit_score']
+        bucket = self._buckets[self._index(score)]
+        del bucket[user_id]
+        if not bucket:
+            del self._buckets[self._index(score)]
+        self._update_tree(score, -1)
+        self._ranked -= 1
+        self._score_sum -= score
+
+    def top(self, limit: int) -> List[Dict[str, Any]]:
+        """The highest scored users, best first, as user rows."""
+        with self._lock:
+            leaders = []
+            # At most 551 scores to walk, however many users there are
+            for index in range(len(self._tree) - 1, 0, -1):
+                if len(leaders) >= limit:
+                    break
+                for user_id in self._buckets.get(index, ()):
+                    if len(leaders) >= limit:
+                        break
+                    leaders.append(dict(self._users[user_id]))
+            return leaders
+
+    def rank(self, user_id: str) -> Optional[int]:
+        """1 plus the number of users scored higher, or None if the user has no score."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if not user or user['credit_score'] is None:
+                return None
+            return self._ranked - self._count_up_to(self._index(user['credit_score'])) + 1
+
+    def _count_below(self, score: int) -> int:
+        if score <= MIN_SCORE:
+            return 0
+        if score > MAX_SCORE:
+            return self._ranked
+        return self._count_up_to(score - MIN_SCORE)
+
+    def count_between(self, low: Optional[int] = None, high: Optional[int] = None) -> int:
+        """Number of scored users with low <= score < high; a missing bound is open."""
+        with self._lock:
+            below_high = self._ranked if high is None else self._count_below(high)
+            below_low = 0 if low is None else self._count_below(low)
+            return max(0, below_high - below_low)
+
+    def histogram(self, edges: Sequence[int]) -> List[int]:
+        """Counts of scored users between consecutive ascending edges, open at both ends."""
+        bounds = [None, *edges, None]
+        with self._lock:
+            return [self.count_between(low, high) for low, high in zip(bounds, bounds[1:])]
+
+    def user(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """The user's row as held by the leaderboard."""
+        with self._lock:
+            user = self._users.get(user_id)
+            return dict(user) if user else None
+
+    def stats(self) -> Dict[str, Any]:
+        """User and score totals."""
+        with self._lock:
+            return {
+                'total_users': len(self._users),
+                'users_with_scores': self._ranked,
+                'users_without_scores': len(self._users) - self._ranked,
+                'average_score': round(self._score_sum / self._ranked, 2) if self._ranked else None,
+                'loads': self.loads,
+            }
+
+
+# Shared by every CreditScoreOperations in the process
+credit_score_leaderboard = CreditScoreLeaderboard()
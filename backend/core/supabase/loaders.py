@@ -0,0 +1,120 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Iterable, Iterator, List, Tuple
+from .base_client import BaseSupabaseClient
+
+
+# Rows memoized for the current request, keyed by table name then (column, value).
+# None outside of a request scope, in which case loaders only batch and never memoize.
+_request_memo: ContextVar[Optional[Dict[str, Dict]]] = ContextVar("supabase_request_memo", default=None)
+
+
+@contextmanager
+def request_scope() -> Iterator[None]:
+    """Memoize loader lookups until the end of the block, typically one HTTP request."""
+    token = _request_memo.set({})
+    try:
+        yield
+    finally:
+        _request_memo.reset(token)
+
+
+class UserLoader:
+    """
+    Batches user lookups into IN queries (see BaseSupabaseClient.select_in) and memoizes the rows for the rest of the request.
+
+    A user row is remembered under each of its key columns, so a user loaded by
+    Firebase ID is also returned for free when later looked up by ID or email.
+    Lookups that find nothing are remembered as well.
+    """
+
+    KEY_COLUMNS = ("id", "email", "firebase_id")
+
+    def __init__(self, base_client: BaseSupabaseClient):
+        self.client = base_client
+        self.table_name = self.client.get_table_name("users")
+
+    def _memo(self) -> Optional[Dict]:
+        memo = _request_memo.get()
+        if memo is None:
+            return None
+        return memo.setdefault(self.table_name, {})
+
+    def load(self, value: str, column: str = "id") -> Optional[Dict]:
+        """Get a single user by one of its key columns."""
+        return self.load_many([value], column).get(value)
+
+    def load_many(self, values: Iterable[str], column: str = "id") -> Dict[str, Dict]:
+        """Get several users by one of their key columns, keyed by that column's value."""
+        found, missing = self._check_memo(values, column)
+        if not missing:
+            return found
+
+        rows = self.client.select_in(self.table_name, column, missing)
+        return self._remember(found, missing, rows, column)
+
+    def _check_memo(self, values: Iterable[str], column: str) -> Tuple[Dict[str, Dict], List[str]]:
+        """Split lookups into rows already memoized and values that still need a query."""
+        memo = self._memo()
+        found = {}
+        missing = []
+        for value in dict.fromkeys(value for value in values if value):
+            if memo is not None and (column, value) in memo:
+                if memo[(column, value)] is not None:
+                    found[value] = memo[(column, value)]
+            else:
+                missing.append(value)
+        return found, missing
+
+    def _remember(self, found: Dict[str, Dict], missing: List[str], rows: Optional[List[Dict]], column: str) -> Dict[str, Dict]:
+        """Memoize queried rows, and the values that matched nothing, then add them to found."""
+        if rows is None:
+            # Query failed, don't remember the values as missing
+            return found
+
+        for row in rows:
+            self.prime(row)
+            found[row.get(column)] = row
+
+        memo = self._memo()
+        if memo is not None:
+            for value in missing:
+                memo.setdefault((column, value), None)
+
+        return found
+
+    def prime(self, row: Optional[Dict]) -> None:
+        """Remember a user row fetched or written elsewhere for the rest of the request."""
+        memo = self._memo()
+        if memo is None or not row:
+            return
+        for column in self.KEY_COLUMNS:
+            if row.get(column) is not None:
+                memo[(column, row[column])] = row
+
+    def forget(self, value: str, column: str = "id") -> None:
+        """Drop a user from the request memo, e.g. after it has been updated or deleted."""
+        memo = self._memo()
+        if memo is None:
+            return
+        row = memo.pop((column, value), None)
+        if row:
+            for key_column in self.KEY_COLUMNS:
+                memo.pop((key_column, row.get(key_column)), None)
+
+
+class AsyncUserLoader(UserLoader):
+    """UserLoader for the async client, sharing the same request memo."""
+
+    async def load(self, value: str, column: str = "id") -> Optional[Dict]:
+        """Get a single user by one of its key columns."""
+        return (await self.load_many([value], column)).get(value)
+
+    async def load_many(self, values: Iterable[str], column: str = "id") -> Dict[str, Dict]:
+        """Get several users by one of their key columns, keyed by that column's value."""
+        found, missing = self._check_memo(values, column)
+        if not missing:
+            return found
+
+        rows = await self.client.select_in(self.table_name, column, missing)
+        return self._remember(found, missing, rows, column)
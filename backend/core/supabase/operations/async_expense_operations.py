@@ -0,0 +1,124 @@
+import asyncio
+from typing import Optional, Dict, Any, Iterable, List
+from ..async_base_client import AsyncBaseSupabaseClient
+from ..loaders import AsyncUserLoader
+from ..projections import projection
+from .expense_operations import ExpenseOperations
+
+
+class AsyncExpenseOperations:
+    """
+    Async versions of the hot expense read paths.
+
+    Results have the same shape as the matching ExpenseOperations methods, whose
+    enrichment helpers are reused; independent queries run concurrently.
+    """
+
+    def __init__(self, base_client: AsyncBaseSupabaseClient, user_loader: Optional[AsyncUserLoader] = None):
+        self.client = base_client
+        self.user_loader = user_loader or AsyncUserLoader(base_client)
+        self.expenses_table = self.client.get_table_name("expenses")
+        self.splits_table = self.client.get_table_name("splits")
+
+        debtor_embed = self.client.embed("users", "name", alias="debtor")
+        split_columns = projection("splits.payment")
+        self.expense_with_splits_select = (
+            f"*, {self.client.embed('splits', f'{split_columns}, {debtor_embed}', alias='splits')}"
+        )
+
+    async def get_user_dashboard_data(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Get dashboard data for a user, loading lent and owed amounts concurrently. None if a query fails."""
+        lent_expenses, owed_splits = await asyncio.gather(
+            self.get_user_lent_expenses(user_id),
+            self.get_user_owed_splits(user_id),
+        )
+        if lent_expenses is None or owed_splits is None:
+            return None
+        return ExpenseOperations._build_dashboard_data(lent_expenses, owed_splits)
+
+    async def get_user_lent_expenses(self, user_id: str) -> Optional[List[Dict]]:
+        """Get all expenses where the user is the creator and at least one split is not fully paid."""
+        expenses = await self.client._execute_query(
+            table_name=self.expenses_table,
+            operation="select",
+            filters={"created_by": user_id},
+        )
+
+        if expenses is None:
+            return None
+        if not expenses:
+            return []
+
+        splits_by_expense = await self.get_splits_by_expense_ids(
+            expense.get("id") for expense in expenses
+        )
+        unpaid_expenses = ExpenseOperations._unpaid_expenses(expenses, splits_by_expense)
+        users_by_id = await self.get_users_by_ids(
+            split.get('userid') for _, splits in unpaid_expenses for split in splits
+        )
+        return ExpenseOperations._attach_debtor_splits(unpaid_expenses, users_by_id)
+
+    async def get_user_owed_splits(self, user_id: str) -> Optional[List[Dict]]:
+        """Get all splits where the user owes money and payment has not been confirmed."""
+        # Splits that have been confirmed as paid are filtered out by the query
+        splits = await self.client._execute_query(
+            table_name=self.splits_table,
+            operation='select',
+            filters={'userid': user_id, 'paid_confirmed': None},
+            select_statement=projection('splits.payment'),
+        )
+        if splits is None:
+            return None
+
+        expenses_by_id = await self.get_expenses_by_ids(
+            (split.get("expenseid") for split in splits), projection("expenses.owed_context")
+        )
+        lenders_by_id = await self.get_users_by_ids(
+            expense.get("created_by") for expense in expenses_by_id.values()
+        )
+        return ExpenseOperations._enrich_owed_splits(splits, expenses_by_id, lenders_by_id)
+
+    async def get_group_expenses(self, group_id: str) -> Optional[List[Dict]]:
+        """Get all expenses for a specific group."""
+        if self.client.embedded_selects:
+            expenses = await self.client._execute_query(
+                table_name=self.expenses_table,
+                operation="select",
+                filters={"group_id": group_id},
+                select_statement=self.expense_with_splits_select,
+            ) or []
+            return [ExpenseOperations._enrich_embedded_expense(expense) for expense in expenses]
+
+        expenses = await self.client._execute_query(
+            table_name=self.expenses_table,
+            operation="select",
+            filters={"group_id": group_id},
+        )
+
+        if not expenses:
+            return []
+
+        splits_by_expense = await self.get_splits_by_expense_ids(
+            expense.get("id") for expense in expenses
+        )
+        users_by_id = await self.get_users_by_ids(
+            split.get('userid') for splits in splits_by_expense.values() for split in splits
+        )
+        return ExpenseOperations._attach_all_splits(expenses, splits_by_expense, users_by_id)
+
+    async def get_splits_by_expense_ids(self, expense_ids: Iterable[str]) -> Dict[str, List[Dict]]:
+        """Get the splits of several expenses, grouped by expense ID (see BaseSupabaseClient.select_in)."""
+        expense_ids = list(dict.fromkeys(expense_id for expense_id in expense_ids if expense_id))
+        splits = await self.client.select_in(
+            self.splits_table, 'expenseid', expense_ids, select_statement=projection('splits.payment'),
+        ) or []
+        return ExpenseOperations._group_splits_by_expense({expense_id: [] for expense_id in expense_ids}, splits)
+
+    async def get_expenses_by_ids(self, expense_ids: Iterable[str], select_statement: str = "*") -> Dict[str, Dict]:
+        """Get several expenses, keyed by expense ID (see BaseSupabaseClient.select_in)."""
+        expenses = await self.client.select_in(self.expenses_table, 'id', expense_ids, select_statement=select_statement) or []
+        return {expense.get('id'): expense for expense in expenses}
+
+    async def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get several users, keyed by user ID. Memoized for the current request."""
+        return await self.user_loader.load_many(user_ids)
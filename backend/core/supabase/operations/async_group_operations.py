@@ -0,0 +1,63 @@
+import asyncio
+from typing import Optional, Dict, List
+from ..async_base_client import AsyncBaseSupabaseClient
+from ..loaders import AsyncUserLoader
+from ..projections import projection
+from .group_operations import GroupOperations
+
+
+class AsyncGroupOperations:
+    """Async versions of the hot group read paths."""
+
+    def __init__(self, base_client: AsyncBaseSupabaseClient, user_loader: Optional[AsyncUserLoader] = None):
+        self.client = base_client
+        self.user_loader = user_loader or AsyncUserLoader(base_client)
+        self.groups_table = self.client.get_table_name("groups")
+        self.group_memberships_table = self.client.get_table_name("group_memberships")
+
+    async def get_user_groups_with_members(self, user_id: str) -> Optional[List[Dict]]:
+        """
+        Get all groups that a user is a member of, each with a 'members' list shaped
+        like GroupOperations.get_group_members.
+        """
+        memberships = await self.client._execute_query(
+            table_name=self.group_memberships_table,
+            operation='select',
+            filters={'user_id': user_id},
+            select_statement=projection('group_memberships.group'),
+        )
+        if memberships is None:
+            return None
+
+        group_ids = list(dict.fromkeys(
+            membership.get('group_id') for membership in memberships if membership.get('group_id')
+        ))
+        if not group_ids:
+            return []
+
+        # The groups and all of their memberships don't depend on each other
+        groups, group_memberships = await asyncio.gather(
+            self.client.select_in(self.groups_table, 'id', group_ids),
+            self.client.select_in(self.group_memberships_table, 'group_id', group_ids),
+        )
+        group_memberships = group_memberships or []
+        users_by_id = await self.user_loader.load_many(
+            membership.get('user_id') for membership in group_memberships
+        )
+
+        memberships_by_group = {group_id: [] for group_id in group_ids}
+        for membership in group_memberships:
+            memberships_by_group.setdefault(membership.get('group_id'), []).append(membership)
+
+        # Keep the order of the user's memberships
+        groups_by_id = {group.get('id'): group for group in groups or []}
+        groups_with_members = []
+        for group_id in group_ids:
+            group = groups_by_id.get(group_id)
+            if group:
+                group['members'] = GroupOperations._format_members(
+                    memberships_by_group.get(group_id, []), users_by_id
+                )
+                groups_with_members.append(group)
+
+        return groups_with_members
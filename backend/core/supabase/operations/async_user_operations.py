@@ -0,0 +1,49 @@
+from typing import Optional, Dict, Iterable
+from ..async_base_client import AsyncBaseSupabaseClient
+from ..cache import TTLCache
+from ..loaders import AsyncUserLoader
+from .user_operations import cache_user, split_cached_users, user_cache
+
+
+class AsyncUserOperations:
+    """Async user lookups, sharing the process-wide user cache with UserOperations."""
+
+    def __init__(
+        self,
+        base_client: AsyncBaseSupabaseClient,
+        user_loader: Optional[AsyncUserLoader] = None,
+        cache: Optional[TTLCache] = None,
+    ):
+        self.client = base_client
+        self.table_name = self.client.get_table_name("users")
+        self.loader = user_loader or AsyncUserLoader(base_client)
+        self.cache = cache if cache is not None else user_cache
+
+    async def get_by_firebase_id(self, firebase_id: str) -> Optional[Dict]:
+        """Get user by Firebase ID."""
+        return await self._get_by('firebase_id', firebase_id)
+
+    async def get_by_id(self, user_id: str) -> Optional[Dict]:
+        """Get user by ID."""
+        return await self._get_by('id', user_id)
+
+    async def get_by_ids(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get several users, keyed by user ID."""
+        users, missing = split_cached_users(self.cache, self.loader, 'id', user_ids)
+        for user_id, user in (await self.loader.load_many(missing)).items():
+            cache_user(self.cache, user)
+            users[user_id] = dict(user)
+        return users
+
+    async def _get_by(self, column: str, value: str) -> Optional[Dict]:
+        """Get a user by a key column, checking the process cache before the request loader."""
+        user = self.cache.get((column, value))
+        if user is not None:
+            self.loader.prime(user)
+            return dict(user)
+
+        user = await self.loader.load(value, column=column)
+        if user is None:
+            return None
+        cache_user(self.cache, user)
+        return dict(user)
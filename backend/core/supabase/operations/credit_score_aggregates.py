@@ -0,0 +1,139 @@
+"""
+Running totals of a user's split outcomes, from which the credit score is derived.
+
+Each split adds a fixed contribution (its outcome, amounts and payment times), so a
+split changing state only removes its old contribution and adds the new one. Every
+field is a plain sum, so the changes of several splits add up to one delta that the
+database can add to the stored row. The factor formulas are the ones in
+CreditScoreOperations, applied to the totals.
+"""
+
+import math
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional
+
+from .credit_score_records import ExpenseRecord, SplitRecord
+
+
+@dataclass
+class CreditAggregate:
+    """A user's split totals, stored one row per user in the credit_score_aggregates table."""
+
+    split_count: int = 0
+    on_time_count: int = 0
+    late_count: int = 0
+    unpaid_count: int = 0
+    paid_count: int = 0
+    request_count: int = 0
+    # Request to confirmation times, in hours
+    confirmation_count: int = 0
+    confirmation_hours_sum: float = 0.0
+    outstanding_debt: int = 0
+    historical_debt: int = 0
+    # Expense creation to confirmation times, in hours (count, sum and sum of squares)
+    payment_time_count: int = 0
+    payment_time_sum: float = 0.0
+    payment_time_sq_sum: float = 0.0
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "CreditAggregate":
+        return cls(**{field.name: row.get(field.name) or field.default for field in fields(cls)})
+
+    def to_row(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def add(self, split: Dict, expense: Dict) -> None:
+        """Add the contribution of a split of an expense."""
+        self._apply(split, expense, 1)
+
+    def remove(self, split: Dict, expense: Dict) -> None:
+        """Remove the contribution of a split previously added with the same expense dates."""
+        self._apply(split, expense, -1)
+
+    def _apply(self, split: Dict, expense: Dict, sign: int) -> None:
+        record = SplitRecord.from_row(split, ExpenseRecord.from_row(expense))
+
+        self.split_count += sign
+        self.historical_debt += sign * record.amount_owed
+        outcome = record.outcome
+        if outcome:
+            setattr(self, f"{outcome}_count", getattr(self, f"{outcome}_count") + sign)
+        if record.has_paid_request:
+            self.request_count += sign
+        if not record.has_paid_confirmed:
+            self.outstanding_debt += sign * record.amount_owed
+            return
+
+        self.paid_count += sign
+        confirmation_hours = record.confirmation_hours
+        if confirmation_hours is not None:
+            self.confirmation_count += sign
+            self.confirmation_hours_sum += sign * confirmation_hours
+        payment_hours = record.payment_hours
+        if payment_hours is not None:
+            self.payment_time_count += sign
+            self.payment_time_sum += sign * payment_hours
+            self.payment_time_sq_sum += sign * payment_hours * payment_hours
+
+    def payment_time_std_dev(self) -> float:
+        """Population standard deviation of the payment times, 0 without any."""
+        if self.payment_time_count <= 0:
+            return 0.0
+        mean = self.payment_time_sum / self.payment_time_count
+        # Rounding can leave a tiny negative variance when the times are all equal
+        return math.sqrt(max(0.0, self.payment_time_sq_sum / self.payment_time_count - mean * mean))
+
+    def is_empty(self) -> bool:
+        """Whether every total is zero, e.g. a delta whose changes cancel out."""
+        return self == CreditAggregate()
+
+    def payment_history_score(self) -> float:
+        total = self.split_count
+        score = (self.on_time_count / total * 100) + (self.late_count / total * 50)
+        return max(0, min(100, score))
+
+    def payment_behavior_score(self) -> float:
+        if not self.paid_count:
+            return 0.0
+        confirmation_rate = self.paid_count / self.split_count
+        avg_confirmation_time = (
+            self.confirmation_hours_sum / self.confirmation_count if self.confirmation_count else 0
+        )
+        confirmation_score = confirmation_rate * 60
+        speed_score = max(0, 40 - (avg_confirmation_time / 24))
+        return max(0, min(100, confirmation_score + speed_score))
+
+    def debt_utilization_score(self) -> float:
+        if self.historical_debt == 0:
+            return 100.0
+        utilization_ratio = self.outstanding_debt / self.historical_debt
+        if utilization_ratio <= 0.1:
+            return 100
+        elif utilization_ratio <= 0.3:
+            return 80
+        elif utilization_ratio <= 0.5:
+            return 60
+        elif utilization_ratio <= 0.7:
+            return 30
+        return 0
+
+    def payment_patterns_score(self) -> float:
+        if self.paid_count < 2 or self.payment_time_count < 2:
+            return 50.0
+        request_frequency = self.request_count / self.split_count
+        std_dev = self.payment_time_std_dev()
+        consistency_score = max(0, 60 - (std_dev / 24))
+        frequency_score = min(40, request_frequency * 100)
+        return max(0, min(100, consistency_score + frequency_score))
+
+    def score(self) -> Optional[int]:
+        """The 300-850 credit score, or None without payment history."""
+        if self.split_count <= 0:
+            return None
+        weighted_score = (
+            self.payment_history_score() * 0.40 +
+            self.payment_behavior_score() * 0.30 +
+            self.debt_utilization_score() * 0.20 +
+            self.payment_patterns_score() * 0.10
+        )
+        return 300 + int(weighted_score * 5.5)
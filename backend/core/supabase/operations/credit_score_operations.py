@@ -1,7 +1,37 @@
-from typing import Optional, Dict, Any, List
-from datetime import datetime, timedelta
+from typing import Optional, Dict, Any, Iterable, Iterator, List, Sequence, Tuple
+import os
+from datetime import datetime
 import math
-from ..base_client import BaseSupabaseClient
+import threading
+from ..base_client import BaseSupabaseClient, in_filter_chunks
+from ..cache import TTLCache
+from ..leaderboard import CreditScoreLeaderboard, credit_score_leaderboard
+from ..projections import projection
+from .credit_score_aggregates import CreditAggregate
+from .credit_score_records import ExpenseRecord, SplitRecord
+from .user_operations import UserOperations
+
+# Rows per page when reading whole tables, within PostgREST's default max-rows of 1000
+BATCH_PAGE_SIZE = 1000
+# User IDs per bulk update, keeping the IN filter well within URL length limits
+BATCH_UPDATE_SIZE = 200
+
+# Score range boundaries of the poor, fair, good and excellent ranges
+SCORE_RANGE_EDGES = (550, 650, 750)
+
+# Credit score statistics by score edges, shared by all requests in the process
+credit_score_stats_cache = TTLCache(
+    maxsize=64,
+    ttl=float(os.getenv("CREDIT_SCORE_STATS_TTL_SECONDS", "30")),
+)
+
+# Rebuilds of one user's aggregate are serialized within the process; split changes
+# are added to the stored rows by the database (see record_split_changes)
+_AGGREGATE_LOCKS = [threading.Lock() for _ in range(64)]
+
+
+def _aggregate_lock(user_id: str) -> threading.Lock:
+    return _AGGREGATE_LOCKS[hash(user_id) % len(_AGGREGATE_LOCKS)]
 
 
 class CreditScoreOperations:
@@ -12,6 +42,11 @@ class CreditScoreOperations:
         self.expenses_table = self.client.get_table_name("expenses")
         self.splits_table = self.client.get_table_name("splits")
         self.users_table = self.client.get_table_name("users")
+        self.aggregates_table = self.client.get_table_name("credit_score_aggregates")
+        self.users = UserOperations(base_client)
+        self.leaderboard = credit_score_leaderboard
+        self.stats_function = self.client.get_table_name("get_credit_score_stats")
+        self.aggregate_deltas_function = self.client.get_table_name("add_credit_score_aggregate_deltas")
 
     def calculate_user_credit_score(self, user_id: str) -> Optional[int]:
         """
@@ -32,34 +67,37 @@ class CreditScoreOperations:
         user_splits = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'userid': user_id}
+            filters={'userid': user_id},
+            select_statement=projection('splits.credit_history'),
         ) or []
         
         if not user_splits:
             return None  # No payment history
         
-        # Get expense details for each split
-        enriched_splits = []
-        for split in user_splits:
-            expense_id = split.get('expenseid')
-            if expense_id:
-                expense = self.client._execute_query(
-                    table_name=self.expenses_table,
-                    operation='select',
-                    filters={'id': expense_id}
-                )
-                if expense:
-                    split['expense'] = expense[0]
-                    enriched_splits.append(split)
+        # Get the expenses of all splits with IN queries
+        expense_ids = list(dict.fromkeys(split.get('expenseid') for split in user_splits if split.get('expenseid')))
+        expenses = self.client.select_in(
+            self.expenses_table, 'id', expense_ids, select_statement=projection('expenses.credit_history'),
+        )
+        expenses_by_id = {expense.get('id'): ExpenseRecord.from_row(expense) for expense in expenses or []}
+
+        records = [
+            SplitRecord.from_row(split, expenses_by_id[split.get('expenseid')])
+            for split in user_splits if split.get('expenseid') in expenses_by_id
+        ]
         
-        if not enriched_splits:
+        return self._score_splits(records)
+    
+    def _score_splits(self, splits: List[SplitRecord]) -> Optional[int]:
+        """The credit score of a user's splits. None without splits."""
+        if not splits:
             return None
         
         # Calculate individual factors
-        payment_history_score = self._calculate_payment_history_score(enriched_splits)
-        payment_behavior_score = self._calculate_payment_behavior_score(enriched_splits)
-        debt_utilization_score = self._calculate_debt_utilization_score(enriched_splits)
-        payment_patterns_score = self._calculate_payment_patterns_score(enriched_splits)
+        payment_history_score = self._calculate_payment_history_score(splits)
+        payment_behavior_score = self._calculate_payment_behavior_score(splits)
+        debt_utilization_score = self._calculate_debt_utilization_score(splits)
+        payment_patterns_score = self._calculate_payment_patterns_score(splits)
         
         # Weighted average (0-100 scale)
         weighted_score = (
@@ -75,7 +113,7 @@ class CreditScoreOperations:
         
         return credit_score
     
-    def _calculate_payment_history_score(self, splits: List[Dict]) -> float:
+    def _calculate_payment_history_score(self, splits: List[SplitRecord]) -> float:
         """Calculate payment history score (0-100)."""
         if not splits:
             return 0.0
@@ -86,55 +124,13 @@ class CreditScoreOperations:
         unpaid_debts = 0
         
         for split in splits:
-            expense = split.get('expense', {})
-            due_date_str = expense.get('due_date')
-            paid_confirmed = split.get('paid_confirmed')
-            
-            if paid_confirmed:
-                # Payment was made
-                if due_date_str:
-                    try:
-                        # Ensure timezone-aware datetime objects
-                        due_date_str_clean = due_date_str.replace('Z', '+00:00') if 'Z' in due_date_str else due_date_str
-                        paid_confirmed_clean = paid_confirmed.replace('Z', '+00:00') if 'Z' in paid_confirmed else paid_confirmed
-                        
-                        due_date = datetime.fromisoformat(due_date_str_clean)
-                        paid_date = datetime.fromisoformat(paid_confirmed_clean)
-                        
-                        # Allow 7 days grace period
-                        grace_period = due_date + timedelta(days=7)
-                        
-                        if paid_date <= grace_period:
-                            on_time_payments += 1
-                        else:
-                            late_payments += 1
-                    except (ValueError, TypeError):
-                        # Skip invalid datetime formats
-                        continue
-                else:
-                    # No due date, consider on-time if paid within 30 days of expense creation
-                    expense_created_str = expense.get('created_at', '')
-                    if expense_created_str:
-                        try:
-                            # Ensure timezone-aware datetime objects
-                            expense_created_clean = expense_created_str.replace('Z', '+00:00') if 'Z' in expense_created_str else expense_created_str
-                            paid_confirmed_clean = paid_confirmed.replace('Z', '+00:00') if 'Z' in paid_confirmed else paid_confirmed
-                            
-                            expense_created = datetime.fromisoformat(expense_created_clean)
-                            paid_date = datetime.fromisoformat(paid_confirmed_clean)
-                            
-                            if (paid_date - expense_created).days <= 30:
-                                on_time_payments += 1
-                            else:
-                                late_payments += 1
-                        except (ValueError, TypeError):
-                            # Skip invalid datetime formats
-                            continue
-                    else:
-                        # If no created_at, consider it on-time
-                        on_time_payments += 1
-            else:
-                # Unpaid debt
+            # Paid splits whose dates cannot be compared are skipped (outcome None)
+            outcome = split.outcome
+            if outcome == 'on_time':
+                on_time_payments += 1
+            elif outcome == 'late':
+                late_payments += 1
+            elif outcome == 'unpaid':
                 unpaid_debts += 1
         
         # Calculate score based on ratios
@@ -147,36 +143,22 @@ class CreditScoreOperations:
         
         return max(0, min(100, score))
     
-    def _calculate_payment_behavior_score(self, splits: List[Dict]) -> float:
+    def _calculate_payment_behavior_score(self, splits: List[SplitRecord]) -> float:
         """Calculate payment behavior score (0-100)."""
         if not splits:
             return 0.0
         
         total_splits = len(splits)
-        paid_splits = [s for s in splits if s.get('paid_confirmed')]
+        paid_splits = [s for s in splits if s.has_paid_confirmed]
         
         if not paid_splits:
             return 0.0
         
         # Calculate average time between paid_request and paid_confirmed
-        request_to_confirmation_times = []
-        for split in paid_splits:
-            paid_request = split.get('paid_request')
-            paid_confirmed = split.get('paid_confirmed')
-            
-            if paid_request and paid_confirmed:
-                try:
-                    # Ensure timezone-aware datetime objects
-                    paid_request_clean = paid_request.replace('Z', '+00:00') if 'Z' in paid_request else paid_request
-                    paid_confirmed_clean = paid_confirmed.replace('Z', '+00:00') if 'Z' in paid_confirmed else paid_confirmed
-                    
-                    request_time = datetime.fromisoformat(paid_request_clean)
-                    confirmed_time = datetime.fromisoformat(paid_confirmed_clean)
-                    time_diff = (confirmed_time - request_time).total_seconds() / 3600  # hours
-                    request_to_confirmation_times.append(time_diff)
-                except (ValueError, TypeError):
-                    # Skip invalid datetime formats
-                    continue
+        request_to_confirmation_times = [
+            split.confirmation_hours for split in paid_splits
+            if split.confirmation_hours is not None
+        ]
         
         # Calculate confirmation rate
         confirmation_rate = len(paid_splits) / total_splits
@@ -191,20 +173,20 @@ class CreditScoreOperations:
         
         return max(0, min(100, confirmation_score + speed_score))
     
-    def _calculate_debt_utilization_score(self, splits: List[Dict]) -> float:
+    def _calculate_debt_utilization_score(self, splits: List[SplitRecord]) -> float:
         """Calculate debt utilization score (0-100)."""
         if not splits:
             return 100.0  # No debt = perfect score
         
         # Calculate current outstanding debt
         current_debt = sum(
-            split.get('amount_owed', 0) 
+            split.amount_owed
             for split in splits 
-            if not split.get('paid_confirmed')
+            if not split.has_paid_confirmed
         )
         
         # Calculate total historical debt
-        total_historical_debt = sum(split.get('amount_owed', 0) for split in splits)
+        total_historical_debt = sum(split.amount_owed for split in splits)
         
         if total_historical_debt == 0:
             return 100.0
@@ -227,39 +209,24 @@ class CreditScoreOperations:
         
         return score
     
-    def _calculate_payment_patterns_score(self, splits: List[Dict]) -> float:
+    def _calculate_payment_patterns_score(self, splits: List[SplitRecord]) -> float:
         """Calculate payment patterns score (0-100)."""
         if not splits:
             return 0.0
         
         # Calculate frequency of payment requests
-        payment_requests = [s for s in splits if s.get('paid_request')]
+        payment_requests = [s for s in splits if s.has_paid_request]
         request_frequency = len(payment_requests) / len(splits) if splits else 0
         
         # Calculate consistency (standard deviation of payment times)
-        paid_splits = [s for s in splits if s.get('paid_confirmed')]
+        paid_splits = [s for s in splits if s.has_paid_confirmed]
         if len(paid_splits) < 2:
             return 50.0  # Neutral score for insufficient data
         
-        payment_times = []
-        for split in paid_splits:
-            expense = split.get('expense', {})
-            created_at = expense.get('created_at')
-            paid_confirmed = split.get('paid_confirmed')
-            
-            if created_at and paid_confirmed:
-                try:
-                    # Ensure timezone-aware datetime objects
-                    created_at_clean = created_at.replace('Z', '+00:00') if 'Z' in created_at else created_at
-                    paid_confirmed_clean = paid_confirmed.replace('Z', '+00:00') if 'Z' in paid_confirmed else paid_confirmed
-                    
-                    created_time = datetime.fromisoformat(created_at_clean)
-                    paid_time = datetime.fromisoformat(paid_confirmed_clean)
-                    payment_time = (paid_time - created_time).total_seconds() / 3600  # hours
-                    payment_times.append(payment_time)
-                except (ValueError, TypeError):
-                    # Skip invalid datetime formats
-                    continue
+        payment_times = [
+            split.payment_hours for split in paid_splits
+            if split.payment_hours is not None
+        ]
         
         if len(payment_times) < 2:
             return 50.0
@@ -275,9 +242,155 @@ class CreditScoreOperations:
         
         return max(0, min(100, consistency_score + frequency_score))
     
+    def get_credit_aggregate(self, user_id: str) -> Optional[CreditAggregate]:
+        """The stored split totals of a user, or None if they have not been built yet."""
+        rows = self.client._execute_query(
+            table_name=self.aggregates_table,
+            operation='select',
+            filters={'user_id': user_id},
+            select_statement=projection('credit_score_aggregates.totals'),
+        )
+        return CreditAggregate.from_row(rows[0]) if rows else None
+
+    def build_credit_aggregate(self, user_id: str) -> Optional[CreditAggregate]:
+        """Total a user's whole split history, without storing it. None if it cannot be read."""
+        splits = self.client._execute_query(
+            table_name=self.splits_table,
+            operation='select',
+            filters={'userid': user_id},
+            select_statement=projection('splits.credit_history'),
+        )
+        if splits is None:
+            return None
+
+        expense_ids = list(dict.fromkeys(split.get('expenseid') for split in splits if split.get('expenseid')))
+        expenses = self.client.select_in(
+            self.expenses_table, 'id', expense_ids, select_statement=projection('expenses.credit_history'),
+        )
+        if expenses is None:
+            return None
+
+        expenses_by_id = {expense.get('id'): expense for expense in expenses}
+        aggregate = CreditAggregate()
+        for split in splits:
+            # Splits of deleted expenses are not counted, as in calculate_user_credit_score
+            expense = expenses_by_id.get(split.get('expenseid'))
+            if expense:
+                aggregate.add(split, expense)
+        return aggregate
+
+    def rebuild_credit_aggregate(self, user_id: str) -> Optional[CreditAggregate]:
+        """Rebuild a user's stored split totals from their whole history."""
+        with _aggregate_lock(user_id):
+            aggregate = self.build_credit_aggregate(user_id)
+            if aggregate is not None:
+                self._save_credit_aggregate(user_id, aggregate)
+            return aggregate
+
+    def _save_credit_aggregate(self, user_id: str, aggregate: CreditAggregate) -> None:
+        data = {**aggregate.to_row(), 'updated_at': datetime.utcnow().isoformat()}
+        updated = self.client._execute_query(
+            table_name=self.aggregates_table,
+            operation='update',
+            data=data,
+            filters={'user_id': user_id},
+        )
+        if updated is None:
+            self.client._execute_query(
+                table_name=self.aggregates_table,
+                operation='insert',
+                data={'user_id': user_id, **data},
+            )
+
+    def record_split_changes(self, changes: Iterable[Tuple[Optional[Dict], Optional[Dict], Dict]]) -> None:
+        """
+        Update stored split totals for splits that were created, changed or deleted.
+
+        Each change is (old split, new split, expense), with None for a side that does not
+        exist; the expense needs due_date and created_at when paid_confirmed changes. Users
+        without stored totals are skipped, since building them later reads the new state.
+
+        The changes are summed into one delta per user and added to the stored rows by a
+        single database function call, so concurrent writers in other processes cannot
+        lose each other's updates. If the call fails the affected totals are dropped
+        instead, to be rebuilt from the history on next use.
+        """
+        deltas: Dict[str, CreditAggregate] = {}
+        for old_split, new_split, expense in changes:
+            user_id = (new_split or old_split or {}).get('userid')
+            if not user_id:
+                continue
+            delta = deltas.setdefault(user_id, CreditAggregate())
+            if old_split:
+                delta.remove(old_split, expense)
+            if new_split:
+                delta.add(new_split, expense)
+
+        rows = [{'user_id': user_id, **delta.to_row()} for user_id, delta in deltas.items() if not delta.is_empty()]
+        if rows and self.client.rpc(self.aggregate_deltas_function, {'p_deltas': rows}) is None:
+            self.invalidate_credit_aggregates(row['user_id'] for row in rows)
+
+    def invalidate_credit_aggregates(self, user_ids: Iterable[str]) -> None:
+        """Drop stored split totals, for changes that cannot be applied split by split."""
+        for chunk in in_filter_chunks(user_ids, BATCH_UPDATE_SIZE):
+            self.client._execute_query(
+                table_name=self.aggregates_table,
+                operation='delete',
+                filters={'user_id': chunk},
+            )
+
+    def check_credit_aggregates(self, user_ids: Optional[Iterable[str]] = None, repair: bool = False) -> Dict[str, Any]:
+        """
+        Compare stored split totals with a full recompute from the split history.
+
+        A user is reported when the score from the stored totals differs from
+        calculate_user_credit_score or the stored counts differ from a fresh build.
+        With repair, those users' totals are rebuilt.
+        """
+        if user_ids is None:
+            users = self.client._execute_query(
+                table_name=self.users_table,
+                operation='select',
+                select_statement=projection('exists'),
+            ) or []
+            user_ids = [user.get('id') for user in users]
+
+        report = {'checked': 0, 'missing': 0, 'mismatched': 0, 'repaired': 0, 'mismatches': []}
+        for user_id in user_ids:
+            report['checked'] += 1
+            stored = self.get_credit_aggregate(user_id)
+            if stored is None:
+                report['missing'] += 1
+                continue
+
+            expected_score = self.calculate_user_credit_score(user_id)
+            built = self.build_credit_aggregate(user_id)
+            counts_differ = built is not None and any(
+                getattr(stored, name) != getattr(built, name)
+                for name in ('split_count', 'on_time_count', 'late_count', 'unpaid_count', 'paid_count',
+                             'request_count', 'confirmation_count', 'outstanding_debt', 'historical_debt',
+                             'payment_time_count')
+            )
+            if stored.score() == expected_score and not counts_differ:
+                continue
+
+            report['mismatched'] += 1
+            report['mismatches'].append({
+                'user_id': user_id,
+                'expected_score': expected_score,
+                'aggregate_score': stored.score(),
+            })
+            if repair and self.rebuild_credit_aggregate(user_id) is not None:
+                report['repaired'] += 1
+        return report
+
     def update_user_credit_score(self, user_id: str) -> Optional[Dict]:
-        """Calculate and update user's credit score in the database."""
-        credit_score = self.calculate_user_credit_score(user_id)
+        """Derive the user's credit score from their split totals and store it in the database."""
+        aggregate = self.get_credit_aggregate(user_id) or self.rebuild_credit_aggregate(user_id)
+        credit_score = aggregate.score() if aggregate else None
+        
+        # Cached user rows carry the old score
+        self.users.invalidate(user_id)
         
         if credit_score is None:
             # User has no payment history, set credit_score to NULL
@@ -287,6 +400,8 @@ class CreditScoreOperations:
                 data={'credit_score': None},
                 filters={'id': user_id}
             )
+            if result:
+                self.leaderboard.record(result)
             return {'credit_score': None, 'message': 'No payment history'}
         
         # Update the user's credit score
@@ -298,6 +413,7 @@ class CreditScoreOperations:
         )
         
         if result:
+            self.leaderboard.record(result)
             return {
                 'credit_score': credit_score,
                 'message': 'Credit score updated successfully'
@@ -310,7 +426,8 @@ class CreditScoreOperations:
         user = self.client._execute_query(
             table_name=self.users_table,
             operation='select',
-            filters={'id': user_id}
+            filters={'id': user_id},
+            select_statement=projection('users.credit_score'),
         )
         
         if user:
@@ -320,32 +437,203 @@ class CreditScoreOperations:
             }
         return None
     
+    def _select_pages(self, table_name: str, select_statement: str) -> Iterator[Optional[List[Dict]]]:
+        """Pages of BATCH_PAGE_SIZE rows of a table by ascending id, read one at a time. Yields None and stops on failure."""
+        after = None
+        while True:
+            page = self.client._execute_query(
+                table_name=table_name,
+                operation='select',
+                select_statement=select_statement,
+                order_by={'id': 'asc'},
+                limit=BATCH_PAGE_SIZE,
+                after=after,
+            )
+            yield page
+            if page is None or len(page) < BATCH_PAGE_SIZE:
+                return
+            after = ('id', page[-1]['id'])
+
+    def _select_all(self, table_name: str, select_statement: str) -> Optional[List[Dict]]:
+        """Every row of a table, read in pages of BATCH_PAGE_SIZE by ascending id. None on failure."""
+        rows: List[Dict] = []
+        for page in self._select_pages(table_name, select_statement):
+            if page is None:
+                return None
+            rows.extend(page)
+        return rows
+
+    def calculate_all_credit_scores(self) -> Optional[Dict[str, Optional[int]]]:
+        """
+        Calculate the credit score of every user from a few paged reads of the users,
+        splits and expenses tables. Same results as calculate_user_credit_score per user.
+
+        Rows are turned into records a page at a time, so only the records and one
+        page of rows are held at once. None if a table cannot be read.
+        """
+        user_ids: List[str] = []
+        for page in self._select_pages(self.users_table, projection('exists')):
+            if page is None:
+                return None
+            user_ids.extend(user.get('id') for user in page if user.get('id'))
+
+        expenses_by_id: Dict[Any, ExpenseRecord] = {}
+        for page in self._select_pages(self.expenses_table, projection('expenses.credit_history')):
+            if page is None:
+                return None
+            expenses_by_id.update((expense.get('id'), ExpenseRecord.from_row(expense)) for expense in page)
+
+        splits_by_user: Dict[str, List[SplitRecord]] = {}
+        for page in self._select_pages(self.splits_table, projection('splits.credit_batch')):
+            if page is None:
+                return None
+            for split in page:
+                expense = expenses_by_id.get(split.get('expenseid'))
+                if expense:
+                    splits_by_user.setdefault(split.get('userid'), []).append(SplitRecord.from_row(split, expense))
+
+        return {user_id: self._score_splits(splits_by_user.get(user_id, [])) for user_id in user_ids}
+
     def update_all_credit_scores(self) -> Dict[str, Any]:
-        """Update credit scores for all users."""
-        users = self.client._execute_query(
-            table_name=self.users_table,
-            operation='select'
-        ) or []
+        """
+        Update credit scores for all users.
+
+        Scores are calculated together by calculate_all_credit_scores and written with
+        one update per distinct score (at most 552) rather than one per user.
+        """
+        scores = self.calculate_all_credit_scores()
         
         results = {
-            'total_users': len(users),
+            'total_users': len(scores or {}),
             'updated_users': 0,
             'failed_users': 0,
             'users_with_scores': 0,
             'users_without_history': 0
         }
-        
-        for user in users:
-            user_id = user.get('id')
-            if user_id:
-                result = self.update_user_credit_score(user_id)
-                if result:
-                    results['updated_users'] += 1
-                    if result['credit_score'] is not None:
-                        results['users_with_scores'] += 1
-                    else:
-                        results['users_without_history'] += 1
+        if scores is None:
+            return results
+        
+        users_by_score: Dict[Optional[int], List[str]] = {}
+        for user_id, credit_score in scores.items():
+            users_by_score.setdefault(credit_score, []).append(user_id)
+        
+        for credit_score, user_ids in users_by_score.items():
+            for start in range(0, len(user_ids), BATCH_UPDATE_SIZE):
+                chunk = user_ids[start:start + BATCH_UPDATE_SIZE]
+                result = self.client._execute_query(
+                    table_name=self.users_table,
+                    operation='update',
+                    data={'credit_score': credit_score},
+                    filters={'id': chunk}
+                )
+                if result is None:
+                    results['failed_users'] += len(chunk)
+                    continue
+                results['updated_users'] += len(chunk)
+                if credit_score is not None:
+                    results['users_with_scores'] += len(chunk)
                 else:
-                    results['failed_users'] += 1
+                    results['users_without_history'] += len(chunk)
         
-        return results 
\ No newline at end of file
+        # Cached user rows carry the old scores
+        for user_id in scores:
+            self.users.invalidate(user_id)
+        self.leaderboard.invalidate()
+        credit_score_stats_cache.clear()
+        
+        return results
+
+    def _loaded_leaderboard(self) -> Optional[CreditScoreLeaderboard]:
+        """The leaderboard, loaded from the users table first if it is stale. None if it cannot be loaded."""
+        if self.leaderboard.stale:
+            users = self._select_all(self.users_table, projection('users.leaderboard'))
+            if users is not None:
+                self.leaderboard.load(users)
+            elif self.leaderboard.loads == 0:
+                return None
+        return self.leaderboard
+
+    def get_leaderboard(self, limit: int = 10) -> Optional[List[Dict]]:
+        """The users with the highest credit scores, best first, with their rank."""
+        leaderboard = self._loaded_leaderboard()
+        if leaderboard is None:
+            return None
+        return [
+            {
+                'rank': rank,
+                'user_id': user.get('id'),
+                'name': user.get('name', 'Unknown'),
+                'email': user.get('email'),
+                'credit_score': user.get('credit_score')
+            }
+            for rank, user in enumerate(leaderboard.top(limit), 1)
+        ]
+
+    def get_user_rank(self, user_id: str) -> Optional[Dict]:
+        """A user's leaderboard rank, or None if they have no credit score."""
+        leaderboard = self._loaded_leaderboard()
+        user = leaderboard.user(user_id) if leaderboard else None
+        rank = leaderboard.rank(user_id) if user else None
+        if rank is None:
+            return None
+        return {
+            'user_id': user_id,
+            'credit_score': user.get('credit_score'),
+            'rank': rank,
+            'ranked_users': leaderboard.stats()['users_with_scores']
+        }
+
+    def get_credit_score_stats(self, edges: Sequence[int] = SCORE_RANGE_EDGES) -> Optional[Dict]:
+        """
+        User counts, the average credit score and the number of users between
+        consecutive ascending score edges, cached for CREDIT_SCORE_STATS_TTL_SECONDS.
+
+        Aggregated by the database in one call when the get_credit_score_stats
+        function exists, and from the leaderboard otherwise.
+        """
+        edges = tuple(edges)
+        stats = credit_score_stats_cache.get(edges)
+        if stats is not None:
+            return stats
+
+        totals = self.client.rpc(self.stats_function, {'p_edges': list(edges)})
+        if not isinstance(totals, dict):
+            totals = self._leaderboard_stats(edges)
+            if totals is None:
+                return None
+
+        bounds = [None, *edges, None]
+        histogram = [
+            {'min': low, 'max': high, 'count': count}
+            for low, high, count in zip(bounds, bounds[1:], totals['histogram'])
+        ]
+        stats = {
+            'total_users': totals['total_users'],
+            'users_with_scores': totals['users_with_scores'],
+            'users_without_scores': totals['total_users'] - totals['users_with_scores'],
+            'average_score': float(totals['average_score']) if totals['average_score'] is not None else None,
+            'histogram': histogram,
+        }
+        if edges == SCORE_RANGE_EDGES:
+            poor, fair, good, excellent = (bucket['count'] for bucket in histogram)
+            stats['score_ranges'] = {
+                'excellent': excellent,
+                'good': good,
+                'fair': fair,
+                'poor': poor
+            }
+        credit_score_stats_cache.set(edges, stats)
+        return stats
+
+    def _leaderboard_stats(self, edges: Tuple[int, ...]) -> Optional[Dict]:
+        """get_credit_score_stats totals from the leaderboard, for databases without the function."""
+        leaderboard = self._loaded_leaderboard()
+        if leaderboard is None:
+            return None
+        stats = leaderboard.stats()
+        return {
+            'total_users': stats['total_users'],
+            'users_with_scores': stats['users_with_scores'],
+            'average_score': stats['average_score'],
+            'histogram': leaderboard.histogram(edges),
+        }
@@ -0,0 +1,103 @@
+"""
+Split and expense rows converted once into typed records for the credit score factors.
+
+Each timestamp is parsed once, when its record is built, and the outcome and
+times the four factors read are derived from it there. Timestamps stay datetimes
+rather than epoch numbers: subtracting two datetimes costs less than converting
+each to an integer, results are identical to parsing in every factor, and a
+naive timestamp still cannot be compared with a timezone-aware one.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, NamedTuple, Optional
+
+_GRACE_PERIOD = timedelta(days=7)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp, or None if it cannot be parsed."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00') if 'Z' in value else value)
+    except (ValueError, TypeError):
+        return None
+
+
+def hours_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    """Hours from start to end, or None if either is missing or they cannot be compared."""
+    if start is None or end is None:
+        return None
+    try:
+        return (end - start).total_seconds() / 3600
+    except TypeError:
+        # One is naive and the other timezone-aware
+        return None
+
+
+class ExpenseRecord(NamedTuple):
+    """The dates of an expense read by the credit score factors."""
+    id: Optional[str]
+    # Whether the column was set, even if it could not be parsed
+    has_due_date: bool
+    due_date: Optional[datetime]
+    has_created_at: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "ExpenseRecord":
+        due_date, created_at = row.get('due_date'), row.get('created_at')
+        return cls._make((
+            row.get('id'),
+            bool(due_date),
+            parse_timestamp(due_date) if due_date else None,
+            bool(created_at),
+            parse_timestamp(created_at) if created_at else None,
+        ))
+
+
+class SplitRecord(NamedTuple):
+    """
+    A split's amount and payment state, with what the factors derive from its timestamps.
+
+    The outcome and times are worked out once, when the record is built, from the
+    parsed timestamps of the split and its expense.
+    """
+    amount_owed: int
+    has_paid_request: bool
+    has_paid_confirmed: bool
+    # 'on_time', 'late' or 'unpaid', or None for a paid split whose dates cannot be compared
+    outcome: Optional[str]
+    # Hours from the payment request to its confirmation
+    confirmation_hours: Optional[float]
+    # Hours from the expense's creation to the payment confirmation
+    payment_hours: Optional[float]
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any], expense: ExpenseRecord) -> "SplitRecord":
+        paid_request, paid_confirmed = row.get('paid_request'), row.get('paid_confirmed')
+        if not paid_confirmed:
+            return cls._make((row.get('amount_owed') or 0, bool(paid_request), False, 'unpaid', None, None))
+
+        confirmed_at = parse_timestamp(paid_confirmed)
+        return cls._make((
+            row.get('amount_owed') or 0,
+            bool(paid_request),
+            True,
+            payment_outcome(confirmed_at, expense),
+            hours_between(parse_timestamp(paid_request), confirmed_at) if paid_request else None,
+            hours_between(expense.created_at, confirmed_at),
+        ))
+
+
+def payment_outcome(confirmed_at: Optional[datetime], expense: ExpenseRecord) -> Optional[str]:
+    """Whether a payment confirmed at confirmed_at was on time, or None if the dates cannot be compared."""
+    try:
+        if expense.has_due_date:
+            # Allow 7 days grace period
+            return 'on_time' if confirmed_at <= expense.due_date + _GRACE_PERIOD else 'late'
+        if expense.has_created_at:
+            # No due date, on time if paid within 30 days of expense creation
+            return 'on_time' if (confirmed_at - expense.created_at).days <= 30 else 'late'
+    except TypeError:
+        # A date could not be parsed, or is naive and compared with a timezone-aware one
+        return None
+    return 'on_time'
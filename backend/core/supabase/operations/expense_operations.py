@@ -1,143 +1,286 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from ..base_client import BaseSupabaseClient
+from ..dashboard_cache import DashboardCache
+from ..loaders import UserLoader
+from ..pagination import fetch_page, keyset_order, with_keyset
+from ..postgres.expense_queries import ExpenseQueries
+from ..projections import projection
+from .credit_score_operations import CreditScoreOperations
 
 
 class ExpenseOperations:
     """Handles all expense-related database operations using the Supabase client."""
 
-    def __init__(self, base_client: BaseSupabaseClient):
+    def __init__(
+        self,
+        base_client: BaseSupabaseClient,
+        user_loader: Optional[UserLoader] = None,
+        credit_scores: Optional[CreditScoreOperations] = None,
+        dashboard_cache: Optional[DashboardCache] = None,
+    ):
         self.client = base_client
+        self.user_loader = user_loader or UserLoader(base_client)
+        # Told about split writes, to keep the per-user credit score totals up to date
+        self.credit_scores = credit_scores
+        # Keyed by the prefixed name, so environments sharing a cache do not mix
+        self.dashboard_cache = dashboard_cache or DashboardCache(self.client.get_table_name("dashboard"))
+        # Group version tokens, replaced by writes to the group's expenses
+        self.versions = self.dashboard_cache.versions
         self.expenses_table = self.client.get_table_name("expenses")
         self.splits_table = self.client.get_table_name("splits")
+        self.users_table = self.client.get_table_name("users")
+        self.groups_table = self.client.get_table_name("groups")
+        # Created by scripts/create_functions.py
+        self.dashboard_totals_function = self.client.get_table_name("get_user_dashboard_totals")
+
+        # Single-statement joins for the hot read paths when connected to PostgreSQL directly
+        self.sql = (
+            ExpenseQueries(self.client.engine, self.expenses_table, self.splits_table, self.users_table)
+            if self.client.backend == "postgres" else None
+        )
+
+        # Embedded selects used when the client has embedded selects enabled
+        debtor_embed = self.client.embed("users", "name", alias="debtor")
+        split_columns = projection("splits.payment")
+        self.expense_with_splits_select = (
+            f"*, {self.client.embed('splits', f'{split_columns}, {debtor_embed}', alias='splits')}"
+        )
+        self.pending_split_select = (
+            f"{projection('splits.pending')}, "
+            f"{debtor_embed}, "
+            f"{self.client.embed('expenses', 'id, title, created_by', alias='expense', inner=True)}"
+        )
 
     def get_user_lent_expenses(self, user_id: str) -> Optional[List[Dict]]:
         """Get all expenses where the user is the creator and at least one split is not fully paid."""
+        if self.sql:
+            return self.sql.lent_expenses(user_id)
+
         expenses = self.client._execute_query(
             table_name=self.expenses_table,
             operation="select",
             filters={"created_by": user_id},
         )
 
+        if expenses is None:
+            return None
         if not expenses:
             return []
-        
-        # Filter expenses to only include those with at least one unpaid split
-        filtered_expenses = []
-        
-        for expense in expenses:
-            expense_id = expense.get("id")
-            if expense_id:
-                splits = self.client._execute_query(
-                    table_name=self.splits_table,
-                    operation='select',
-                    filters={'expenseid': expense_id}
-                ) or []
-                
-                # Check if all splits are confirmed as paid
-                all_paid = True
-                if splits:
-                    for split in splits:
-                        if split.get('paid_confirmed') is None:
-                            all_paid = False
-                            break
-                else:
-                    # If no splits exist, consider it as not fully paid
-                    all_paid = False
-                
-                # Only include expenses that are not fully paid
-                if not all_paid:
-                    # Enrich splits with user information
-                    enriched_splits = []
-                    for split in splits:
-                        split_user_id = split.get('userid')
-                        if split_user_id:
-                            user = self.client._execute_query(
-                                table_name=self.client.get_table_name("users"),
-                                operation='select',
-                                filters={'id': split_user_id}
-                            )
-                            if user:
-                                # Determine payment status
-                                payment_status = None
-                                if split.get('paid_confirmed') is not None:
-                                    payment_status = 'paid'  # Green check
-                                elif split.get('paid_request') is not None:
-                                    payment_status = 'pending'  # Hourglass
-                                # If neither is set, payment_status remains None (no icon)
-                                
-                                enriched_split = {
-                                    'id': split.get('id'),
-                                    'amount_owed': split.get('amount_owed'),
-                                    'paid_request': split.get('paid_request'),
-                                    'paid_confirmed': split.get('paid_confirmed'),
-                                    'debtor': {
-                                        'name': user[0].get('name'),
-                                        'payment_status': payment_status
-                                    }
-                                }
-                                enriched_splits.append(enriched_split)
-                    
-                    expense['splits'] = enriched_splits
-                    filtered_expenses.append(expense)
-        
-        return filtered_expenses
+
+        return self._filter_unpaid_expenses_with_debtors(expenses)
     
     def get_user_owed_splits(self, user_id: str) -> Optional[List[Dict]]:
         """Get all splits where the user owes money and payment has not been confirmed."""
+        if self.sql:
+            return self.sql.owed_splits(user_id)
+
+        # Splits that have been confirmed as paid are filtered out by the query
         splits = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'userid': user_id}
-        ) or []
-        
-        # Filter out splits that have been confirmed as paid
-        splits = [split for split in splits if split.get('paid_confirmed') is None]
-        
-        # Enrich splits with expense and lender information
+            filters={'userid': user_id, 'paid_confirmed': None},
+            select_statement=projection('splits.payment'),
+        )
+        if splits is None:
+            return None
+
+        expenses_by_id = self.get_expenses_by_ids(
+            (split.get("expenseid") for split in splits), projection("expenses.owed_context")
+        )
+        lenders_by_id = self.get_users_by_ids(
+            expense.get("created_by") for expense in expenses_by_id.values()
+        )
+
+        return self._enrich_owed_splits(splits, expenses_by_id, lenders_by_id)
+
+    def get_user_lent_expenses_page(self, user_id: str, limit: int, cursor: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """One page of get_user_lent_expenses, newest first, and the cursor of the next page."""
+        return fetch_page(
+            lambda after, size: self.client._execute_query(
+                table_name=self.expenses_table,
+                operation="select",
+                filters={"created_by": user_id},
+                order_by=keyset_order(),
+                limit=size,
+                after=after,
+            ),
+            limit,
+            cursor,
+            keep=self._filter_unpaid_expenses_with_debtors,
+        )
+
+    def get_user_owed_splits_page(self, user_id: str, limit: int, cursor: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """One page of get_user_owed_splits, newest first, and the cursor of the next page."""
+        page = fetch_page(
+            lambda after, size: self.client._execute_query(
+                table_name=self.splits_table,
+                operation='select',
+                filters={'userid': user_id, 'paid_confirmed': None},
+                select_statement=with_keyset(projection('splits.payment')),
+                order_by=keyset_order(),
+                limit=size,
+                after=after,
+            ),
+            limit,
+            cursor,
+        )
+        if page is None:
+            return None
+
+        splits, next_cursor = page
+        expenses_by_id = self.get_expenses_by_ids(
+            (split.get("expenseid") for split in splits), projection("expenses.owed_context")
+        )
+        lenders_by_id = self.get_users_by_ids(
+            expense.get("created_by") for expense in expenses_by_id.values()
+        )
+        return self._enrich_owed_splits(splits, expenses_by_id, lenders_by_id), next_cursor
+
+    @staticmethod
+    def _enrich_owed_splits(splits: List[Dict], expenses_by_id: Dict[str, Dict], lenders_by_id: Dict[str, Dict]) -> List[Dict]:
+        """Enrich owed splits with expense and lender information, dropping splits without an expense."""
         enriched_splits = []
         for split in splits:
-            expense_id = split.get("expenseid")
+            expense_data = expenses_by_id.get(split.get("expenseid"))
+            if expense_data:
+                lender_user = lenders_by_id.get(expense_data.get("created_by"))
+                lender = {"name": lender_user.get("name")} if lender_user else None
+
+                enriched_split = {
+                    'id': split.get('id'),
+                    'expenseid': split.get('expenseid'),
+                    'userid': split.get('userid'),
+                    'amount_owed': split.get('amount_owed'),
+                    'paid_request': split.get('paid_request'),
+                    'paid_confirmed': split.get('paid_confirmed'),
+                    'expense': {
+                        'title': expense_data.get('title'),
+                        'due_date': expense_data.get('due_date'),
+                        'lender': lender
+                    }
+                }
+                enriched_splits.append(enriched_split)
+
+        return enriched_splits
+
+    def get_splits_by_expense_ids(self, expense_ids: Iterable[str], filters: Optional[Dict] = None, select_statement: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """
+        Get the splits of several expenses, grouped by expense ID (see BaseSupabaseClient.select_in).
+
+        Only the columns shown on expenses are selected unless select_statement is given.
+        """
+        expense_ids = list(dict.fromkeys(expense_id for expense_id in expense_ids if expense_id))
+        splits = self.client.select_in(
+            self.splits_table, 'expenseid', expense_ids, filters=filters,
+            select_statement=select_statement or projection('splits.payment'),
+        ) or []
+        return self._group_splits_by_expense({expense_id: [] for expense_id in expense_ids}, splits)
+
+    @staticmethod
+    def _group_splits_by_expense(splits_by_expense: Dict[str, List[Dict]], splits: List[Dict]) -> Dict[str, List[Dict]]:
+        """Add splits to the per-expense lists, keeping their query order."""
+        for split in splits:
+            splits_by_expense.setdefault(split.get('expenseid'), []).append(split)
+        return splits_by_expense
+
+    def get_expenses_by_ids(self, expense_ids: Iterable[str], select_statement: str = "*") -> Dict[str, Dict]:
+        """Get several expenses, keyed by expense ID (see BaseSupabaseClient.select_in)."""
+        expenses = self.client.select_in(self.expenses_table, 'id', expense_ids, select_statement=select_statement) or []
+        return {expense.get('id'): expense for expense in expenses}
+
+    def get_users_by_ids(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get several users, keyed by user ID. Memoized for the current request."""
+        return self.user_loader.load_many(user_ids)
+
+    def _filter_unpaid_expenses_with_debtors(self, expenses: List[Dict]) -> List[Dict]:
+        """Keep expenses with at least one unpaid split and attach their splits enriched with debtor info."""
+        splits_by_expense = self.get_splits_by_expense_ids(
+            expense.get("id") for expense in expenses
+        )
+        unpaid_expenses = self._unpaid_expenses(expenses, splits_by_expense)
+        users_by_id = self.get_users_by_ids(
+            split.get('userid') for _, splits in unpaid_expenses for split in splits
+        )
+        return self._attach_debtor_splits(unpaid_expenses, users_by_id)
+
+    @staticmethod
+    def _unpaid_expenses(expenses: List[Dict], splits_by_expense: Dict[str, List[Dict]]) -> List[Tuple[Dict, List[Dict]]]:
+        """Pair each expense that is not fully paid with its splits."""
+        unpaid_expenses = []
+        for expense in expenses:
+            expense_id = expense.get("id")
             if expense_id:
-                expense = self.client._execute_query(
-                    table_name=self.expenses_table,
-                    operation="select",
-                    filters={"id": expense_id},
+                splits = splits_by_expense.get(expense_id, [])
+                # If no splits exist, consider it as not fully paid
+                all_paid = bool(splits) and all(
+                    split.get('paid_confirmed') is not None for split in splits
                 )
+                if not all_paid:
+                    unpaid_expenses.append((expense, splits))
+        return unpaid_expenses
+
+    @classmethod
+    def _attach_debtor_splits(cls, unpaid_expenses: List[Tuple[Dict, List[Dict]]], users_by_id: Dict[str, Dict]) -> List[Dict]:
+        """Attach splits enriched with debtor info, skipping splits whose user no longer exists."""
+        for expense, splits in unpaid_expenses:
+            expense['splits'] = [
+                cls._enrich_split_with_debtor(split, users_by_id[split.get('userid')])
+                for split in splits
+                if split.get('userid') in users_by_id
+            ]
+
+        return [expense for expense, _ in unpaid_expenses]
+
+    @classmethod
+    def _enrich_embedded_expense(cls, expense: Dict) -> Dict:
+        """Convert an expense fetched with embedded splits and debtors into the enriched shape."""
+        enriched_splits = []
+        for split in expense.get('splits') or []:
+            debtor = split.pop('debtor', None)
+            if debtor:
+                enriched_splits.append(cls._enrich_split_with_debtor(split, debtor))
+            else:
+                # If user not found, add split without debtor info
+                enriched_splits.append(split)
 
-                if expense:
-                    expense_data = expense[0]
-                    lender_id = expense_data.get("created_by")
-
-                    # Get lender information
-                    lender = None
-                    if lender_id:
-                        lender_user = self.client._execute_query(
-                            table_name=self.client.get_table_name("users"),
-                            operation="select",
-                            filters={"id": lender_id},
-                        )
-                        if lender_user:
-                            lender = {"name": lender_user[0].get("name")}
-
-                    enriched_split = {
-                        'id': split.get('id'),
-                        'expenseid': split.get('expenseid'),
-                        'userid': split.get('userid'),
-                        'amount_owed': split.get('amount_owed'),
-                        'paid_request': split.get('paid_request'),
-                        'paid_confirmed': split.get('paid_confirmed'),
-                        'expense': {
-                            'title': expense_data.get('title'),
-                            'due_date': expense_data.get('due_date'),
-                            'lender': lender
-                        }
-                    }
-                    enriched_splits.append(enriched_split)
+        expense['splits'] = enriched_splits
+        return expense
 
-        return enriched_splits
+    @staticmethod
+    def _enrich_split_with_debtor(split: Dict, user: Dict) -> Dict:
+        """Build the split representation shown to clients, including debtor name and payment status."""
+        # Determine payment status
+        payment_status = None
+        if split.get('paid_confirmed') is not None:
+            payment_status = 'paid'  # Green check
+        elif split.get('paid_request') is not None:
+            payment_status = 'pending'  # Hourglass
+        # If neither is set, payment_status remains None (no icon)
+
+        return {
+            'id': split.get('id'),
+            'amount_owed': split.get('amount_owed'),
+            'paid_request': split.get('paid_request'),
+            'paid_confirmed': split.get('paid_confirmed'),
+            'debtor': {
+                'name': user.get('name'),
+                'payment_status': payment_status
+            }
+        }
 
     def get_expense_with_splits(self, expense_id: str) -> Optional[Dict]:
         """Get an expense with all its splits."""
+        if self.client.embedded_selects:
+            expense = self.client._execute_query(
+                table_name=self.expenses_table,
+                operation="select",
+                filters={"id": expense_id},
+                select_statement=self.expense_with_splits_select,
+            )
+            if not expense:
+                return None
+            return self._enrich_embedded_expense(expense[0])
+
         expense = self.client._execute_query(
             table_name=self.expenses_table,
             operation="select",
@@ -156,43 +299,17 @@ class ExpenseOperations:
             filters={"expenseid": expense_id},
         )
         
+        users_by_id = self.get_users_by_ids(split.get('userid') for split in splits or [])
+
         # Enrich splits with user information and payment status
         enriched_splits = []
-        if splits:
-            for split in splits:
-                split_user_id = split.get('userid')
-                if split_user_id:
-                    user = self.client._execute_query(
-                        table_name=self.client.get_table_name("users"),
-                        operation='select',
-                        filters={'id': split_user_id}
-                    )
-                    if user:
-                        # Determine payment status
-                        payment_status = None
-                        if split.get('paid_confirmed') is not None:
-                            payment_status = 'paid'  # Green check
-                        elif split.get('paid_request') is not None:
-                            payment_status = 'pending'  # Hourglass
-                        # If neither is set, payment_status remains None (no icon)
-                        
-                        enriched_split = {
-                            'id': split.get('id'),
-                            'amount_owed': split.get('amount_owed'),
-                            'paid_request': split.get('paid_request'),
-                            'paid_confirmed': split.get('paid_confirmed'),
-                            'debtor': {
-                                'name': user[0].get('name'),
-                                'payment_status': payment_status
-                            }
-                        }
-                        enriched_splits.append(enriched_split)
-                    else:
-                        # If user not found, add split without debtor info
-                        enriched_splits.append(split)
-                else:
-                    # If no user_id, add split as-is
-                    enriched_splits.append(split)
+        for split in splits or []:
+            user = users_by_id.get(split.get('userid'))
+            if user:
+                enriched_splits.append(self._enrich_split_with_debtor(split, user))
+            else:
+                # If user not found, add split without debtor info
+                enriched_splits.append(split)
         
         expense['splits'] = enriched_splits
         return expense
@@ -214,27 +331,215 @@ class ExpenseOperations:
             data["due_date"] = due_date
         if category:
             data["category"] = category
-        return self.client._execute_query(
+        expense = self.client._execute_query(
             table_name=self.expenses_table, operation="insert", data=data
         )
+        if expense:
+            self._invalidate_versions([], self._single_row(expense))
+        return expense
 
     def create_split(
         self, expense_id: str, user_id: str, amount_owed: int
     ) -> Optional[Dict]:
         """Create a new split for an expense."""
         data = {"expenseid": expense_id, "userid": user_id, "amount_owed": amount_owed}
-        return self.client._execute_query(
+        split = self.client._execute_query(
+            table_name=self.splits_table, operation="insert", data=data
+        )
+        if split:
+            self._record_split_changes([(None, split, {"id": expense_id})])
+            self._invalidate_versions([user_id], self._expense_owner(expense_id))
+        return split
+
+    def create_splits(self, expense: Dict, amounts: List[Tuple[str, int]]) -> Optional[List[Dict]]:
+        """
+        Create the splits of an expense in one insert, from (user ID, amount owed) pairs.
+        The expense is the created row; its dates grade the credits' payments.
+
+        A negative amount is a credit to the expense creator: it is stored as the
+        absolute amount and already confirmed as paid.
+        """
+        from datetime import datetime
+
+        if not amounts:
+            return []
+
+        confirmed_at = datetime.utcnow().isoformat()
+        data = [
+            {
+                "expenseid": expense.get("id"),
+                "userid": user_id,
+                "amount_owed": abs(amount_owed),
+                "paid_confirmed": confirmed_at if amount_owed < 0 else None,
+            }
+            for user_id, amount_owed in amounts
+        ]
+        splits = self.client._execute_query(
             table_name=self.splits_table, operation="insert", data=data
         )
+        self._record_split_changes([(None, split, expense) for split in splits or []])
+        if splits:
+            self._invalidate_versions([user_id for user_id, _ in amounts], expense)
+        return splits
+
+    def _record_split_changes(self, changes: List[Tuple[Optional[Dict], Optional[Dict], Dict]]) -> None:
+        """Apply split writes to the stored credit score totals (see CreditScoreOperations.record_split_changes)."""
+        if self.credit_scores and changes:
+            self.credit_scores.record_split_changes(changes)
+
+    def _invalidate_expense_users(self, expense_id: str, expense: Optional[Dict], credit_totals: bool = True) -> List[str]:
+        """
+        Drop the cached data of an expense's creator, group and everyone with a split
+        in it (see _invalidate_versions), and the stored credit score totals of the
+        latter if credit_totals. Returns the IDs of the users with a split.
+        """
+        credit_totals = credit_totals and self.credit_scores is not None
+        if not (credit_totals or self.versions.enabled):
+            return []
+        splits = self.client._execute_query(
+            table_name=self.splits_table,
+            operation="select",
+            filters={"expenseid": expense_id},
+            select_statement="userid",
+        ) or []
+        user_ids = [split.get("userid") for split in splits]
+        if credit_totals:
+            self.credit_scores.invalidate_credit_aggregates(user_ids)
+        self._invalidate_versions(user_ids, expense)
+        return user_ids
+
+    def _expense_owner(self, expense_id: str) -> Optional[Dict]:
+        """The creator and group of an expense, read only when there are versions to replace."""
+        if not self.versions.enabled:
+            return None
+        return self._single_row(self.client._execute_query(
+            table_name=self.expenses_table,
+            operation="select",
+            filters={"id": expense_id},
+            select_statement=projection("expenses.owner"),
+        ))
+
+    def _invalidate_versions(self, user_ids: Iterable[Optional[str]], expense: Optional[Dict] = None) -> None:
+        """
+        Replace the dashboard versions (dropping the cached dashboards) of these users
+        and of the expense's creator, and the version of the expense's group.
+        """
+        expense = expense or {}
+        self.dashboard_cache.invalidate([*user_ids, expense.get("created_by")])
+        self.versions.bump(self.groups_table, [expense.get("group_id")])
+
+    def get_user_dashboard_version(self, user_id: str) -> Optional[str]:
+        """A token that changes whenever the user's dashboard data does, or None without a cache."""
+        return self.dashboard_cache.version(user_id)
+
+    def get_user_dashboard_data(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get dashboard data for a user including lent and owed amounts, cached until it
+        is written. None if it cannot be read, which is not cached.
+        """
+        return self.dashboard_cache.get_or_build(user_id, lambda: self._load_dashboard_data(user_id))
+
+    def _load_dashboard_data(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Read a user's lent expenses and owed splits from the database. None if a query fails."""
+        if self.sql:
+            dashboard = self.sql.dashboard(user_id)
+            if dashboard is None:
+                return None
+            lent_expenses, owed_splits = dashboard
+            return self._build_dashboard_data(lent_expenses or [], owed_splits or [])
 
-    def get_user_dashboard_data(self, user_id: str) -> Dict[str, Any]:
-        """Get dashboard data for a user including lent and owed amounts."""
         # Get expenses where user lent money
-        lent_expenses = self.get_user_lent_expenses(user_id) or []
+        lent_expenses = self.get_user_lent_expenses(user_id)
 
         # Get splits where user owes money
-        owed_splits = self.get_user_owed_splits(user_id) or []
+        owed_splits = self.get_user_owed_splits(user_id)
+
+        if lent_expenses is None or owed_splits is None:
+            return None
+        return self._build_dashboard_data(lent_expenses, owed_splits)
+
+    def get_user_dashboard_page(self, user_id: str, limit: int, lent_cursor: Optional[str] = None, owed_cursor: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Dashboard data with one page of lent expenses and owed splits.
+
+        Totals still cover everything the user lent and owes; they are computed
+        from narrow projections instead of the enriched rows.
+        """
+        lent_page = self.get_user_lent_expenses_page(user_id, limit, lent_cursor)
+        owed_page = self.get_user_owed_splits_page(user_id, limit, owed_cursor)
+        totals = self.get_user_dashboard_totals(user_id)
+        if lent_page is None or owed_page is None or totals is None:
+            return None
+
+        return self._build_dashboard_page(lent_page, owed_page, totals)
+
+    @staticmethod
+    def _build_dashboard_page(lent_page: Tuple[List[Dict], Optional[str]], owed_page: Tuple[List[Dict], Optional[str]], totals: Dict[str, int]) -> Dict[str, Any]:
+        """Shape paged dashboard data like _build_dashboard_data, with the next cursors."""
+        (lent_expenses, lent_cursor), (owed_splits, owed_cursor) = lent_page, owed_page
+        return {
+            "lent": {"total_amount": totals["lent"], "expenses": lent_expenses, "next_cursor": lent_cursor},
+            "owed": {"total_amount": totals["owed"], "splits": owed_splits, "next_cursor": owed_cursor},
+            "net": {"total_amount": totals["lent"] - totals["owed"]},
+        }
+
+    def get_user_dashboard_summary(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Dashboard totals without the expense and split lists, shaped like get_user_dashboard_data."""
+        totals = self.get_user_dashboard_totals(user_id)
+        if totals is None:
+            return None
+
+        return {
+            "lent": {"total_amount": totals["lent"]},
+            "owed": {"total_amount": totals["owed"]},
+            "net": {"total_amount": totals["lent"] - totals["owed"]},
+        }
+
+    def get_user_dashboard_totals(self, user_id: str) -> Optional[Dict[str, int]]:
+        """Total lent in unpaid expenses and total owed in unconfirmed splits, for the dashboard."""
+        # Summed by the database in one call when the function exists
+        totals = self.client.rpc(self.dashboard_totals_function, {"p_user_id": user_id})
+        if isinstance(totals, dict):
+            return {"lent": totals["lent"], "owed": totals["owed"]}
+
+        return self._query_dashboard_totals(user_id)
 
+    def _query_dashboard_totals(self, user_id: str) -> Optional[Dict[str, int]]:
+        """get_user_dashboard_totals from narrow selects, for databases without the function."""
+        expenses = self.client._execute_query(
+            table_name=self.expenses_table,
+            operation="select",
+            filters={"created_by": user_id},
+            select_statement=projection("expenses.totals"),
+        )
+        owed_splits = self.client._execute_query(
+            table_name=self.splits_table,
+            operation="select",
+            filters={"userid": user_id, "paid_confirmed": None},
+            select_statement=projection("splits.owed_amount"),
+        )
+        if expenses is None or owed_splits is None:
+            return None
+
+        expense_ids = [expense.get("id") for expense in expenses if expense.get("id")]
+        lent_splits = self.client.select_in(
+            self.splits_table, "expenseid", expense_ids, select_statement=projection("splits.lent_status"),
+        )
+        if lent_splits is None:
+            return None
+
+        splits_by_expense = self._group_splits_by_expense({expense_id: [] for expense_id in expense_ids}, lent_splits)
+        return {
+            "lent": sum(
+                expense.get("total_amount", 0)
+                for expense, _ in self._unpaid_expenses(expenses, splits_by_expense)
+            ),
+            "owed": sum(split.get("amount_owed", 0) for split in owed_splits),
+        }
+
+    @staticmethod
+    def _build_dashboard_data(lent_expenses: List[Dict], owed_splits: List[Dict]) -> Dict[str, Any]:
+        """Total the lent and owed amounts for the dashboard response."""
         # Calculate total amounts
         total_lent = sum(expense.get("total_amount", 0) for expense in lent_expenses)
         total_owed = sum(split.get("amount_owed", 0) for split in owed_splits)
@@ -250,15 +555,24 @@ class ExpenseOperations:
 
     def update_expense(self, expense_id: str, data: Dict[str, Any]) -> Optional[Dict]:
         """Update an expense."""
-        return self.client._execute_query(
+        expense = self.client._execute_query(
             table_name=self.expenses_table,
             operation="update",
             data=data,
             filters={"id": expense_id},
         )
+        if expense:
+            # Payments are judged against these dates
+            self._invalidate_expense_users(
+                expense_id, self._single_row(expense), credit_totals="due_date" in data or "created_at" in data
+            )
+        return expense
 
     def delete_expense(self, expense_id: str) -> bool:
         """Delete an expense and all its splits."""
+        expense = self._expense_owner(expense_id)
+        user_ids = self._invalidate_expense_users(expense_id, expense)
+
         # First delete all splits for this expense
         self.client._execute_query(
             table_name=self.splits_table,
@@ -267,11 +581,14 @@ class ExpenseOperations:
         )
 
         # Then delete the expense
-        return self.client._execute_query(
+        deleted = self.client._execute_query(
             table_name=self.expenses_table,
             operation="delete",
             filters={"id": expense_id},
         )
+        # Again, in case a dashboard was loaded while the rows were being deleted
+        self._invalidate_versions(user_ids, expense)
+        return deleted
 
     def update_group_budget_after_expense(
         self, group_id: str, expense_amount: int
@@ -282,6 +599,7 @@ class ExpenseOperations:
             table_name=self.client.get_table_name("groups"),
             operation="select",
             filters={"id": group_id},
+            select_statement=projection("groups.budget"),
         )
 
         if not group:
@@ -297,15 +615,29 @@ class ExpenseOperations:
         )  # Convert cents to dollars
 
         # Update group budget
-        return self.client._execute_query(
+        updated = self.client._execute_query(
             table_name=self.client.get_table_name("groups"),
             operation="update",
             data={"total_budget": new_budget},
             filters={"id": group_id},
         )
+        self.versions.bump(self.groups_table, [group_id])
+        return updated
 
     def get_group_expenses(self, group_id: str) -> Optional[List[Dict]]:
         """Get all expenses for a specific group."""
+        if self.sql:
+            return self.sql.group_expenses(group_id)
+
+        if self.client.embedded_selects:
+            expenses = self.client._execute_query(
+                table_name=self.expenses_table,
+                operation="select",
+                filters={"group_id": group_id},
+                select_statement=self.expense_with_splits_select,
+            ) or []
+            return [self._enrich_embedded_expense(expense) for expense in expenses]
+
         expenses = self.client._execute_query(
             table_name=self.expenses_table,
             operation="select",
@@ -315,56 +647,61 @@ class ExpenseOperations:
         if not expenses:
             return []
 
-        # Get splits for each expense
+        splits_by_expense = self.get_splits_by_expense_ids(
+            expense.get("id") for expense in expenses
+        )
+        users_by_id = self.get_users_by_ids(
+            split.get('userid') for splits in splits_by_expense.values() for split in splits
+        )
+        return self._attach_all_splits(expenses, splits_by_expense, users_by_id)
+
+    def get_group_expenses_page(self, group_id: str, limit: int, cursor: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """One page of get_group_expenses, newest first, and the cursor of the next page."""
+        page = fetch_page(
+            lambda after, size: self.client._execute_query(
+                table_name=self.expenses_table,
+                operation="select",
+                filters={"group_id": group_id},
+                select_statement=self.expense_with_splits_select if self.client.embedded_selects else "*",
+                order_by=keyset_order(),
+                limit=size,
+                after=after,
+            ),
+            limit,
+            cursor,
+        )
+        if page is None:
+            return None
+
+        expenses, next_cursor = page
+        if self.client.embedded_selects:
+            return [self._enrich_embedded_expense(expense) for expense in expenses], next_cursor
+
+        splits_by_expense = self.get_splits_by_expense_ids(
+            expense.get("id") for expense in expenses
+        )
+        users_by_id = self.get_users_by_ids(
+            split.get('userid') for splits in splits_by_expense.values() for split in splits
+        )
+        return self._attach_all_splits(expenses, splits_by_expense, users_by_id), next_cursor
+
+    @classmethod
+    def _attach_all_splits(cls, expenses: List[Dict], splits_by_expense: Dict[str, List[Dict]], users_by_id: Dict[str, Dict]) -> List[Dict]:
+        """Attach every split to its expense, with debtor info when the user exists."""
         for expense in expenses:
             expense_id = expense.get("id")
             if expense_id:
-                splits = self.client._execute_query(
-                    table_name=self.splits_table,
-                    operation="select",
-                    filters={"expenseid": expense_id},
-                )
-                
-                # Enrich splits with user information and payment status
                 enriched_splits = []
-                if splits:
-                    for split in splits:
-                        split_user_id = split.get('userid')
-                        if split_user_id:
-                            user = self.client._execute_query(
-                                table_name=self.client.get_table_name("users"),
-                                operation='select',
-                                filters={'id': split_user_id}
-                            )
-                            if user:
-                                # Determine payment status
-                                payment_status = None
-                                if split.get('paid_confirmed') is not None:
-                                    payment_status = 'paid'  # Green check
-                                elif split.get('paid_request') is not None:
-                                    payment_status = 'pending'  # Hourglass
-                                # If neither is set, payment_status remains None (no icon)
-                                
-                                enriched_split = {
-                                    'id': split.get('id'),
-                                    'amount_owed': split.get('amount_owed'),
-                                    'paid_request': split.get('paid_request'),
-                                    'paid_confirmed': split.get('paid_confirmed'),
-                                    'debtor': {
-                                        'name': user[0].get('name'),
-                                        'payment_status': payment_status
-                                    }
-                                }
-                                enriched_splits.append(enriched_split)
-                            else:
-                                # If user not found, add split without debtor info
-                                enriched_splits.append(split)
-                        else:
-                            # If no user_id, add split as-is
-                            enriched_splits.append(split)
-                
+                for split in splits_by_expense.get(expense_id, []):
+                    user = users_by_id.get(split.get('userid'))
+                    if user:
+                        enriched_splits.append(cls._enrich_split_with_debtor(split, user))
+                    else:
+                        # If user not found, add split without debtor info
+                        enriched_splits.append(split)
+
                 expense['splits'] = enriched_splits
-        
+
         return expenses
 
     def get_user_group_expenses(
@@ -379,86 +716,31 @@ class ExpenseOperations:
         ) or []
         
         # Filter out fully paid expenses from created expenses
-        filtered_created_expenses = []
-        for expense in created_expenses:
-            expense_id = expense.get('id')
-            if expense_id:
-                splits = self.client._execute_query(
-                    table_name=self.splits_table,
-                    operation='select',
-                    filters={'expenseid': expense_id}
-                ) or []
-                
-                # Check if all splits are confirmed as paid
-                all_paid = True
-                if splits:
-                    for split in splits:
-                        if split.get('paid_confirmed') is None:
-                            all_paid = False
-                            break
-                else:
-                    # If no splits exist, consider it as not fully paid
-                    all_paid = False
-                
-                # Only include expenses that are not fully paid
-                if not all_paid:
-                    # Enrich splits with user information and payment status
-                    enriched_splits = []
-                    for split in splits:
-                        split_user_id = split.get('userid')
-                        if split_user_id:
-                            user = self.client._execute_query(
-                                table_name=self.client.get_table_name("users"),
-                                operation='select',
-                                filters={'id': split_user_id}
-                            )
-                            if user:
-                                # Determine payment status
-                                payment_status = None
-                                if split.get('paid_confirmed') is not None:
-                                    payment_status = 'paid'  # Green check
-                                elif split.get('paid_request') is not None:
-                                    payment_status = 'pending'  # Hourglass
-                                # If neither is set, payment_status remains None (no icon)
-                                
-                                enriched_split = {
-                                    'id': split.get('id'),
-                                    'amount_owed': split.get('amount_owed'),
-                                    'paid_request': split.get('paid_request'),
-                                    'paid_confirmed': split.get('paid_confirmed'),
-                                    'debtor': {
-                                        'name': user[0].get('name'),
-                                        'payment_status': payment_status
-                                    }
-                                }
-                                enriched_splits.append(enriched_split)
-                    
-                    expense['splits'] = enriched_splits
-                    filtered_created_expenses.append(expense)
+        filtered_created_expenses = self._filter_unpaid_expenses_with_debtors(created_expenses)
         
-        # Get expenses where the user owes money in this group
+        # Get unconfirmed splits where the user owes money
         owed_splits = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'userid': user_id}
+            filters={'userid': user_id, 'paid_confirmed': None}
         ) or []
         
-        # Filter out splits that have been confirmed as paid
-        owed_splits = [split for split in owed_splits if split.get('paid_confirmed') is None]
-        
         # Get the actual expenses for the owed splits in this group
+        owed_expense_ids = list(dict.fromkeys(
+            split.get("expenseid") for split in owed_splits if split.get("expenseid")
+        ))
+        group_expenses = self.client.select_in(
+            self.expenses_table, "id", owed_expense_ids, filters={"group_id": group_id},
+        )
+        group_expenses_by_id = {expense.get("id"): expense for expense in group_expenses or []}
+
         owed_expenses = []
         for split in owed_splits:
-            expense_id = split.get("expenseid")
-            if expense_id:
-                expense = self.client._execute_query(
-                    table_name=self.expenses_table,
-                    operation="select",
-                    filters={"id": expense_id, "group_id": group_id},
-                )
-                if expense:
-                    expense[0]["splits"] = [split]
-                    owed_expenses.append(expense[0])
+            expense = group_expenses_by_id.get(split.get("expenseid"))
+            if expense:
+                expense = dict(expense)
+                expense["splits"] = [split]
+                owed_expenses.append(expense)
         
         return {
             'created': filtered_created_expenses,
@@ -473,7 +755,8 @@ class ExpenseOperations:
         split = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'id': split_id, 'userid': user_id}
+            filters={'id': split_id, 'userid': user_id},
+            select_statement=projection('splits.payment'),
         )
         
         if not split:
@@ -490,14 +773,12 @@ class ExpenseOperations:
             filters={'id': split_id},
             data=update_data
         )
-        
-        # Handle both list and dict return types
-        if isinstance(result, list) and len(result) > 0:
-            return result[0]
-        elif isinstance(result, dict):
-            return result
-        else:
-            return None
+        result = self._single_row(result)
+        if result:
+            # paid_confirmed is unchanged, so the expense dates cancel out
+            self._record_split_changes([(split[0], result, {'id': split[0].get('expenseid')})])
+            self._invalidate_versions([user_id], self._expense_owner(split[0].get('expenseid')))
+        return result
 
     def confirm_payment(self, split_id: str, lender_id: str) -> Optional[Dict]:
         """Confirm payment for a split. Sets paid_confirmed timestamp."""
@@ -507,7 +788,8 @@ class ExpenseOperations:
         split = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'id': split_id}
+            filters={'id': split_id},
+            select_statement=projection('splits.payment'),
         )
         
         if not split:
@@ -520,7 +802,8 @@ class ExpenseOperations:
         expense = self.client._execute_query(
             table_name=self.expenses_table,
             operation='select',
-            filters={'id': expense_id, 'created_by': lender_id}
+            filters={'id': expense_id, 'created_by': lender_id},
+            select_statement=projection('expenses.payment_check'),
         )
         
         if not expense:
@@ -537,14 +820,11 @@ class ExpenseOperations:
             filters={'id': split_id},
             data=update_data
         )
-        
-        # Handle both list and dict return types
-        if isinstance(result, list) and len(result) > 0:
-            return result[0]
-        elif isinstance(result, dict):
-            return result
-        else:
-            return None
+        result = self._single_row(result)
+        if result:
+            self._record_split_changes([(split_data, result, expense[0])])
+            self._invalidate_versions([split_data.get('userid')], {**expense[0], 'created_by': lender_id})
+        return result
 
     def reject_payment(self, split_id: str, lender_id: str) -> Optional[Dict]:
         """Reject payment for a split. Removes paid_request timestamp."""
@@ -552,7 +832,8 @@ class ExpenseOperations:
         split = self.client._execute_query(
             table_name=self.splits_table,
             operation='select',
-            filters={'id': split_id}
+            filters={'id': split_id},
+            select_statement=projection('splits.payment'),
         )
         
         if not split:
@@ -565,7 +846,8 @@ class ExpenseOperations:
         expense = self.client._execute_query(
             table_name=self.expenses_table,
             operation='select',
-            filters={'id': expense_id, 'created_by': lender_id}
+            filters={'id': expense_id, 'created_by': lender_id},
+            select_statement=projection('expenses.payment_check'),
         )
         
         if not expense:
@@ -582,8 +864,15 @@ class ExpenseOperations:
             filters={'id': split_id},
             data=update_data
         )
-        
-        # Handle both list and dict return types
+        result = self._single_row(result)
+        if result:
+            self._record_split_changes([(split_data, result, expense[0])])
+            self._invalidate_versions([split_data.get('userid')], {**expense[0], 'created_by': lender_id})
+        return result
+
+    @staticmethod
+    def _single_row(result: Any) -> Optional[Dict]:
+        """The updated row, whether the client returned it alone or in a list."""
         if isinstance(result, list) and len(result) > 0:
             return result[0]
         elif isinstance(result, dict):
@@ -593,62 +882,74 @@ class ExpenseOperations:
 
     def get_pending_payment_requests(self, lender_id: str) -> Optional[List[Dict]]:
         """Get all splits with pending payment requests for a lender."""
-        # Get all expenses created by the lender
-        expenses = self.client._execute_query(
-            table_name=self.expenses_table,
-            operation='select',
-            filters={'created_by': lender_id}
-        ) or []
-        
-        expense_ids = [expense.get('id') for expense in expenses]
-        
-        if not expense_ids:
-            return []
-        
-        # Get splits with paid_request but no paid_confirmed
-        pending_splits = []
-        for expense_id in expense_ids:
+        if self.sql:
+            return self.sql.pending_payment_requests(lender_id)
+
+        # Splits with paid_request but no paid_confirmed
+        pending_filters = {'paid_request__not': None, 'paid_confirmed': None}
+
+        if self.client.embedded_selects:
+            # Splits of the lender's expenses, with debtor and expense in the same response
             splits = self.client._execute_query(
                 table_name=self.splits_table,
                 operation='select',
-                filters={
-                    'expenseid': expense_id,
-                    'paid_request__not': None,
-                    'paid_confirmed__is': None
-                }
+                filters={'expense.created_by': lender_id, **pending_filters},
+                select_statement=self.pending_split_select,
             ) or []
-            
-            for split in splits:
-                # Get debtor information
-                debtor_id = split.get('userid')
-                debtor = self.client._execute_query(
-                    table_name=self.client.get_table_name("users"),
-                    operation='select',
-                    filters={'id': debtor_id}
-                )
-                
-                # Get expense information
-                expense = self.client._execute_query(
-                    table_name=self.expenses_table,
-                    operation='select',
-                    filters={'id': expense_id}
-                )
-                
-                if debtor and expense:
-                    enriched_split = {
-                        'id': split.get('id'),
-                        'amount_owed': split.get('amount_owed'),
-                        'paid_request': split.get('paid_request'),
-                        'debtor': {
-                            'name': debtor[0].get('name'),
-                            'id': debtor_id
-                        },
-                        'expense': {
-                            'title': expense[0].get('title'),
-                            'id': expense_id
-                        }
+            debtors_by_id = {
+                split.get('userid'): split.get('debtor')
+                for split in splits
+                if split.get('debtor')
+            }
+            expenses_by_id = {
+                split.get('expenseid'): split.get('expense')
+                for split in splits
+                if split.get('expense')
+            }
+        else:
+            # Get all expenses created by the lender
+            expenses = self.client._execute_query(
+                table_name=self.expenses_table,
+                operation='select',
+                filters={'created_by': lender_id},
+                select_statement=projection('expenses.title'),
+            ) or []
+            expenses_by_id = {expense.get('id'): expense for expense in expenses}
+
+            if not expenses_by_id:
+                return []
+
+            splits_by_expense = self.get_splits_by_expense_ids(
+                expenses_by_id.keys(), filters=pending_filters, select_statement=projection('splits.pending')
+            )
+            splits = [split for splits in splits_by_expense.values() for split in splits]
+            debtors_by_id = None
+
+        if debtors_by_id is None:
+            debtors_by_id = self.get_users_by_ids(split.get('userid') for split in splits)
+
+        pending_splits = []
+        for split in splits:
+            debtor_id = split.get('userid')
+            expense_id = split.get('expenseid')
+            debtor = debtors_by_id.get(debtor_id)
+            expense = expenses_by_id.get(expense_id)
+
+            if debtor and expense:
+                enriched_split = {
+                    'id': split.get('id'),
+                    'amount_owed': split.get('amount_owed'),
+                    'paid_request': split.get('paid_request'),
+                    'debtor': {
+                        'name': debtor.get('name'),
+                        'id': debtor_id
+                    },
+                    'expense': {
+                        'title': expense.get('title'),
+                        'id': expense_id
                     }
-                    pending_splits.append(enriched_split)
+                }
+                pending_splits.append(enriched_split)
         
         return pending_splits
 
@@ -668,17 +969,12 @@ class ExpenseOperations:
             filters={'userid': user_id}
         ) or []
         
-        owed_expenses = []
-        for split in owed_splits:
-            expense_id = split.get("expenseid")
-            if expense_id:
-                expense = self.client._execute_query(
-                    table_name=self.expenses_table,
-                    operation="select",
-                    filters={"id": expense_id},
-                )
-                if expense:
-                    owed_expenses.append(expense[0])
+        expenses_by_id = self.get_expenses_by_ids(split.get("expenseid") for split in owed_splits)
+        owed_expenses = [
+            expenses_by_id[split.get("expenseid")]
+            for split in owed_splits
+            if split.get("expenseid") in expenses_by_id
+        ]
         
         # Combine and remove duplicates
         all_expenses = created_expenses + owed_expenses
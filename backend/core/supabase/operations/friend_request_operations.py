@@ -1,13 +1,21 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from ..base_client import BaseSupabaseClient
+from ..pagination import fetch_page, keyset_order, merge_newest_first
+from ..versions import VersionTokens, version_tokens
 
 
 class FriendRequestOperations:
     """Handles all friend request-related database operations using the Supabase client."""
     
-    def __init__(self, base_client: BaseSupabaseClient):
+    def __init__(self, base_client: BaseSupabaseClient, versions: Optional[VersionTokens] = None):
         self.client = base_client
         self.table_name = self.client.get_table_name("friend_requests")
+        # Version tokens of the requests involving a user, keyed by the user's email
+        self.versions = versions or version_tokens
+
+    def get_version(self, user_email: str) -> Optional[str]:
+        """A token that changes whenever a friend request from or to the user is written, or None without a cache."""
+        return self.versions.get(self.table_name, user_email)
     
     def get_by_user(self, user_id: str, status: Optional[str] = None) -> Optional[List[Dict]]:
         """Get all friend requests involving a user."""
@@ -67,11 +75,14 @@ class FriendRequestOperations:
             "to_user": to_user,
             "request_completed": False
         }
-        return self.client._execute_query(
+        request = self.client._execute_query(
             table_name=self.table_name,
             operation='insert',
             data=data
         )
+        if request:
+            self.versions.bump(self.table_name, [from_user, to_user])
+        return request
     
     def accept(self, from_user: str, to_user: str) -> bool:
         """Accept a friend request."""
@@ -81,15 +92,18 @@ class FriendRequestOperations:
             data={'request_completed': True},
             filters={'from_user': from_user, 'to_user': to_user}
         )
+        self.versions.bump(self.table_name, [from_user, to_user])
         return result is not None
     
     def reject(self, from_user: str, to_user: str) -> bool:
         """Reject a friend request by deleting it."""
-        return self.client._execute_query(
+        deleted = self.client._execute_query(
             table_name=self.table_name,
             operation='delete',
             filters={'from_user': from_user, 'to_user': to_user}
         )
+        self.versions.bump(self.table_name, [from_user, to_user])
+        return deleted
     
     def get_friends(self, user_email: str) -> Optional[List[Dict]]:
         """Get all friends for a user (where requests are completed)."""
@@ -112,6 +126,27 @@ class FriendRequestOperations:
             print(f"Error getting friends: {e}")
             return None
     
+    def get_friends_page(self, user_email: str, limit: int, cursor: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        """One page of get_friends, newest friendship first, and the cursor of the next page."""
+        def fetch(after, size):
+            pages = [
+                self.client._execute_query(
+                    table_name=self.table_name,
+                    operation='select',
+                    filters={column: user_email, 'request_completed': True},
+                    order_by=keyset_order(),
+                    limit=size,
+                    after=after,
+                )
+                for column in ('from_user', 'to_user')
+            ]
+            if any(page is None for page in pages):
+                return None
+            # Each side is fetched up to size rows, so the merged head is complete
+            return merge_newest_first(*pages)[:size]
+
+        return fetch_page(fetch, limit, cursor)
+    
     def get_friendship_date(self, user1_email: str, user2_email: str) -> Optional[Dict]:
         """Get the friendship date between two users."""
         if not self.client.client:
@@ -1,12 +1,19 @@
+import hashlib
 from typing import Optional, Dict, Any, List
 from ..base_client import BaseSupabaseClient
+from ..loaders import UserLoader
+from ..projections import projection
+from ..versions import VersionTokens, version_tokens
 
 
 class GroupOperations:
     """Handles all group-related database operations using the Supabase client."""
     
-    def __init__(self, base_client: BaseSupabaseClient):
+    def __init__(self, base_client: BaseSupabaseClient, user_loader: Optional[UserLoader] = None, versions: Optional[VersionTokens] = None):
         self.client = base_client
+        self.user_loader = user_loader or UserLoader(base_client)
+        # Group version tokens, scoped by the groups table; expense writes replace them too
+        self.versions = versions or version_tokens
         self.groups_table = self.client.get_table_name("groups")
         self.group_memberships_table = self.client.get_table_name("group_memberships")
     
@@ -57,7 +64,8 @@ class GroupOperations:
         memberships = self.client._execute_query(
             table_name=self.group_memberships_table,
             operation='select',
-            filters={'user_id': user_id}
+            filters={'user_id': user_id},
+            select_statement=projection('group_memberships.group'),
         )
         
         if not memberships:
@@ -74,6 +82,33 @@ class GroupOperations:
         
         return groups
     
+    def get_group_version(self, group_id: str) -> Optional[str]:
+        """A token that changes whenever the group, its members or its expenses are written, or None without a cache."""
+        return self.versions.get(self.groups_table, group_id)
+
+    def get_user_groups_version(self, user_id: str) -> Optional[str]:
+        """
+        A token that changes whenever the user joins or leaves a group, or one of
+        their groups changes (see get_group_version). Costs one narrow select.
+        """
+        if not self.versions.enabled:
+            return None
+        memberships = self.client._execute_query(
+            table_name=self.group_memberships_table,
+            operation='select',
+            filters={'user_id': user_id},
+            select_statement=projection('group_memberships.group'),
+        )
+        if memberships is None:
+            return None
+        group_ids = sorted({membership.get('group_id') for membership in memberships if membership.get('group_id')})
+        tokens = self.versions.get_many(self.groups_table, group_ids)
+        if tokens is None:
+            return None
+        return hashlib.sha1(
+            ",".join(f"{group_id}:{tokens[group_id]}" for group_id in group_ids).encode()
+        ).hexdigest()
+
     def get_group_members(self, group_id: str) -> Optional[List[Dict]]:
         """Get all members of a group with user information."""
         memberships = self.client._execute_query(
@@ -85,24 +120,25 @@ class GroupOperations:
         if not memberships:
             return []
         
-        # Get user information for each membership
+        # Get user information for all memberships in one lookup
+        users_by_id = self.user_loader.load_many(
+            membership.get('user_id') for membership in memberships
+        )
+        return self._format_members(memberships, users_by_id)
+
+    @staticmethod
+    def _format_members(memberships: List[Dict], users_by_id: Dict[str, Dict]) -> List[Dict]:
+        """Combine memberships with their users' information."""
         members_with_users = []
         for membership in memberships:
             user_id = membership.get('user_id')
             if user_id:
-                user = self.client._execute_query(
-                    table_name=self.client.get_table_name("users"),
-                    operation='select',
-                    filters={'id': user_id}
-                )
-                user_data = user[0] if user else None
-                
                 member_data = {
                     'id': membership.get('id'),
                     'user_id': membership.get('user_id'),
                     'group_id': membership.get('group_id'),
                     'joined_at': membership.get('joined_at'),
-                    'user': user_data
+                    'user': users_by_id.get(user_id)
                 }
                 members_with_users.append(member_data)
         
@@ -120,7 +156,8 @@ class GroupOperations:
         existing_membership = self.client._execute_query(
             table_name=self.group_memberships_table,
             operation='select',
-            filters={'group_id': group_id, 'user_id': user_id}
+            filters={'group_id': group_id, 'user_id': user_id},
+            select_statement=projection('exists'),
         )
         
         if existing_membership:
@@ -128,28 +165,35 @@ class GroupOperations:
             return existing_membership[0]
         
         # Add the new membership
-        return self.client._execute_query(
+        membership = self.client._execute_query(
             table_name=self.group_memberships_table,
             operation='insert',
             data=data
         )
+        if membership:
+            self.versions.bump(self.groups_table, [group_id])
+        return membership
     
     def remove_member_from_group(self, group_id: str, user_id: str) -> bool:
         """Remove a user from a group."""
-        return self.client._execute_query(
+        removed = self.client._execute_query(
             table_name=self.group_memberships_table,
             operation='delete',
             filters={'group_id': group_id, 'user_id': user_id}
         )
+        self.versions.bump(self.groups_table, [group_id])
+        return removed
     
     def update_group(self, group_id: str, data: Dict[str, Any]) -> Optional[Dict]:
         """Update group information."""
-        return self.client._execute_query(
+        group = self.client._execute_query(
             table_name=self.groups_table,
             operation='update',
             data=data,
             filters={'id': group_id}
         )
+        self.versions.bump(self.groups_table, [group_id])
+        return group
     
     def delete_group(self, group_id: str) -> bool:
         """Delete a group and all its memberships."""
@@ -161,18 +205,21 @@ class GroupOperations:
         )
         
         # Then delete the group
-        return self.client._execute_query(
+        deleted = self.client._execute_query(
             table_name=self.groups_table,
             operation='delete',
             filters={'id': group_id}
         )
+        self.versions.bump(self.groups_table, [group_id])
+        return deleted
     
     def is_user_member_of_group(self, group_id: str, user_id: str) -> bool:
         """Check if a user is a member of a group."""
         membership = self.client._execute_query(
             table_name=self.group_memberships_table,
             operation='select',
-            filters={'group_id': group_id, 'user_id': user_id}
+            filters={'group_id': group_id, 'user_id': user_id},
+            select_statement=projection('exists'),
         )
         return bool(membership)
     
@@ -1,13 +1,20 @@
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 from ..base_client import BaseSupabaseClient
+from ..pagination import fetch_page, keyset_order
+from ..versions import VersionTokens, version_tokens
+
+# Notifications are paged on their ID, the only column they are known to have
+NOTIFICATION_KEYSET = ("notification_id",)
 
 
 class NotificationOperations:
     """Handles all notifications-related database operations using the Supabase client."""
     
-    def __init__(self, base_client: BaseSupabaseClient):
+    def __init__(self, base_client: BaseSupabaseClient, versions: Optional[VersionTokens] = None):
         self.client = base_client
         self.notification_table = self.client.get_table_name("notification")
+        # Per-user version tokens of the unprocessed notifications
+        self.versions = versions or version_tokens
     
     def insert_notification(self, user_id: str, notification_message: str, processed: bool) -> Optional[Dict]:
         """Insert a new notification."""
@@ -22,6 +29,8 @@ class NotificationOperations:
             operation='insert',
             data=data
         )
+        if notification:
+            self.versions.bump(self.notification_table, [user_id])
         
         return notification
     
@@ -36,6 +45,23 @@ class NotificationOperations:
 
         return notifications
     
+    def get_unprocessed_notifications_page(self, user_id: str, limit: int, cursor: Optional[str] = None) -> Optional[Tuple[List[Dict], Optional[str]]]:
+        '''One page of unprocessed notifications, by descending ID, and the cursor of the next page'''
+
+        return fetch_page(
+            lambda after, size: self.client._execute_query(
+                table_name=self.notification_table,
+                operation='select',
+                filters={'user_id': user_id, 'processed': False},
+                order_by=keyset_order(NOTIFICATION_KEYSET),
+                limit=size,
+                after=after,
+            ),
+            limit,
+            cursor,
+            columns=NOTIFICATION_KEYSET,
+        )
+    
     def update_notification_processed(self, notification_id: str) -> Optional[Dict]:
         '''Update a notification to processed'''
         
@@ -45,5 +71,11 @@ class NotificationOperations:
             filters={'notification_id': notification_id},
             data={'processed': True}
         )   
+        rows = notification if isinstance(notification, list) else [notification] if notification else []
+        self.versions.bump(self.notification_table, [row.get('user_id') for row in rows])
+
+        return notification
 
-        return notification
\ No newline at end of file
+    def get_notifications_version(self, user_id: str) -> Optional[str]:
+        '''A token that changes whenever the user's notifications are written, or None without a cache'''
+        return self.versions.get(self.notification_table, user_id)
@@ -1,40 +1,116 @@
-from typing import Optional, Dict, Any, List
+import os
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 from ..base_client import BaseSupabaseClient
+from ..cache import TTLCache
+from ..loaders import UserLoader
+from ..projections import projection
+from ..versions import VersionTokens, version_tokens
+
+
+# Process-wide cache of user rows, keyed by (column, value) for id, email and firebase_id.
+# Only found users are cached, so a newly registered user is visible immediately.
+user_cache = TTLCache(
+    maxsize=int(os.getenv("USER_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60")),
+)
+
+
+def cache_user(cache: TTLCache, user: Optional[Dict]) -> None:
+    """Store a user row in a cache under each of its key columns."""
+    if not user:
+        return
+    row = dict(user)
+    for column in UserLoader.KEY_COLUMNS:
+        if row.get(column) is not None:
+            cache.set((column, row[column]), row)
+
+
+def split_cached_users(cache: TTLCache, loader: UserLoader, column: str, values: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+    """Users found in the cache by a key column, primed into the request loader, and the values still to load."""
+    users = {}
+    missing = []
+    for value in dict.fromkeys(value for value in values if value):
+        user = cache.get((column, value))
+        if user is not None:
+            loader.prime(user)
+            users[value] = dict(user)
+        else:
+            missing.append(value)
+    return users, missing
 
 
 class UserOperations:
     """Handles all user-related database operations using the Supabase client."""
     
-    def __init__(self, base_client: BaseSupabaseClient):
+    def __init__(
+        self,
+        base_client: BaseSupabaseClient,
+        user_loader: Optional[UserLoader] = None,
+        cache: Optional[TTLCache] = None,
+        versions: Optional[VersionTokens] = None,
+    ):
         self.client = base_client
         self.table_name = self.client.get_table_name("users")
+        self.loader = user_loader or UserLoader(base_client)
+        self.cache = cache if cache is not None else user_cache
+        self.versions = versions or version_tokens
     
     def get_by_email(self, email: str) -> Optional[Dict]:
         """Get user by email."""
-        result = self.client._execute_query(
-            table_name=self.table_name,
-            operation='select',
-            filters={'email': email}
-        )
-        return result[0] if result else None
+        return self._get_by('email', email)
     
     def get_by_firebase_id(self, firebase_id: str) -> Optional[Dict]:
         """Get user by Firebase ID."""
-        result = self.client._execute_query(
-            table_name=self.table_name,
-            operation='select',
-            filters={'firebase_id': firebase_id}
-        )
-        return result[0] if result else None
+        return self._get_by('firebase_id', firebase_id)
     
     def get_by_id(self, user_id: str) -> Optional[Dict]:
         """Get user by ID."""
-        result = self.client._execute_query(
-            table_name=self.table_name,
-            operation='select',
-            filters={'id': user_id}
-        )
-        return result[0] if result else None
+        return self._get_by('id', user_id)
+    
+    def get_by_ids(self, user_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Get several users, keyed by user ID."""
+        return self._get_many('id', user_ids)
+
+    def get_by_emails(self, emails: Iterable[str]) -> Dict[str, Dict]:
+        """Get several users, keyed by email. Unknown emails are left out."""
+        return self._get_many('email', emails)
+
+    def _get_many(self, column: str, values: Iterable[str]) -> Dict[str, Dict]:
+        """Get users by a key column, loading the ones missing from the process cache with the request loader."""
+        users, missing = split_cached_users(self.cache, self.loader, column, values)
+        for value, user in self.loader.load_many(missing, column=column).items():
+            self._cache_user(user)
+            users[value] = dict(user)
+        return users
+
+    def _get_by(self, column: str, value: str) -> Optional[Dict]:
+        """Get a user by a key column, checking the process cache before the request loader."""
+        user = self.cache.get((column, value))
+        if user is not None:
+            self.loader.prime(user)
+            return dict(user)
+
+        user = self.loader.load(value, column=column)
+        if user is None:
+            return None
+        self._cache_user(user)
+        return dict(user)
+
+    def _cache_user(self, user: Optional[Dict]) -> None:
+        """Store a user row in the process cache under each of its key columns."""
+        cache_user(self.cache, user)
+
+    def invalidate(self, value: str, column: str = 'id') -> None:
+        """Drop a user from the process cache and the request memo under all of its keys."""
+        row = self.cache.pop((column, value))
+        if row:
+            for key_column in UserLoader.KEY_COLUMNS:
+                self.cache.pop((key_column, row.get(key_column)))
+        self.loader.forget(value, column=column)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the process-wide user cache."""
+        return self.cache.stats()
     
     def create(self, email: str, firebase_id: str) -> Optional[Dict]:
         """Create a new user and return the created record."""
@@ -42,32 +118,92 @@ class UserOperations:
             "email": email,
             "firebase_id": firebase_id
         }
-        return self.client._execute_query(
+        user = self.client._execute_query(
             table_name=self.table_name,
             operation='insert',
             data=data
         )
+        self.loader.forget(firebase_id, column='firebase_id')
+        self.loader.forget(email, column='email')
+        self.loader.prime(user)
+        self._cache_user(user)
+        return user
     
     def update_name(self, firebase_id: str, name: str) -> Optional[Dict]:
         """Update user's name and return the updated record."""
-        return self.client._execute_query(
+        user = self.client._execute_query(
             table_name=self.table_name,
             operation='update',
             data={'name': name},
             filters={'firebase_id': firebase_id}
         )
+        self.invalidate(firebase_id, column='firebase_id')
+        self.loader.prime(user)
+        self._cache_user(user)
+        self._invalidate_name_readers(user)
+        return user
     
     def update(self, user_id: str, data: Dict[str, Any]) -> Optional[Dict]:
         """Update user data and return the updated record."""
-        return self.client._execute_query(
+        user = self.client._execute_query(
             table_name=self.table_name,
             operation='update',
             data=data,
             filters={'id': user_id}
         )
+        self.invalidate(user_id)
+        self.loader.prime(user)
+        self._cache_user(user)
+        if 'name' in data:
+            self._invalidate_name_readers(user)
+        return user
+
+    def _invalidate_name_readers(self, user: Optional[Dict]) -> None:
+        """
+        Replace the version tokens of the lists that show a user's name: their own
+        dashboard, the dashboards of everyone they share an expense with, and their groups.
+        """
+        user_id = user.get('id') if user else None
+        if not user_id or not self.versions.enabled:
+            return
+        splits_table = self.client.get_table_name("splits")
+        expenses_table = self.client.get_table_name("expenses")
+
+        # Lenders of the user's splits see the user as a debtor
+        owed = self.client._execute_query(
+            table_name=splits_table, operation='select', filters={'userid': user_id}, select_statement="expenseid"
+        ) or []
+        owed_expense_ids = list({split.get('expenseid') for split in owed if split.get('expenseid')})
+        lenders = self.client.select_in(
+            expenses_table, 'id', owed_expense_ids, select_statement=projection('expenses.owner'),
+        ) or []
+
+        # Debtors of the user's expenses see the user as their lender
+        lent = self.client._execute_query(
+            table_name=expenses_table, operation='select', filters={'created_by': user_id},
+            select_statement=projection('expenses.owner'),
+        ) or []
+        lent_expense_ids = [expense.get('id') for expense in lent if expense.get('id')]
+        debtors = self.client.select_in(splits_table, 'expenseid', lent_expense_ids, select_statement="userid") or []
+
+        memberships = self.client._execute_query(
+            table_name=self.client.get_table_name("group_memberships"), operation='select',
+            filters={'user_id': user_id}, select_statement=projection('group_memberships.group'),
+        ) or []
+
+        self.versions.bump(self.client.get_table_name("dashboard"), [
+            user_id,
+            *(expense.get('created_by') for expense in lenders),
+            *(split.get('userid') for split in debtors),
+        ])
+        self.versions.bump(self.client.get_table_name("groups"), [
+            *(membership.get('group_id') for membership in memberships),
+            *(expense.get('group_id') for expense in lenders + lent),
+        ])
     
     def delete(self, user_id: str) -> bool:
         """Delete a user. Returns True if a row was deleted."""
+        self.invalidate(user_id)
         return self.client._execute_query(
             table_name=self.table_name,
             operation='delete',
@@ -80,4 +216,4 @@ class UserOperations:
             table_name=self.table_name,
             operation='select',
             limit=limit
-        ) 
\ No newline at end of file
+        )
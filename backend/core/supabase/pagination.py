@@ -0,0 +1,158 @@
+"""
+Keyset pagination for list queries.
+
+Pages are ordered newest first on ``(created_at, id)`` and continue from an opaque
+cursor holding the key of the last row returned, so deep pages cost the same as
+the first one and rows inserted meanwhile do not shift the page boundaries.
+"""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+KEYSET_COLUMNS = ("created_at", "id")
+
+
+def keyset_order(columns: Sequence[str] = KEYSET_COLUMNS) -> Dict[str, str]:
+    """Newest-first ordering on the keyset columns, for _execute_query's order_by."""
+    return {column: "desc" for column in columns}
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the keyset values of a row as an opaque URL-safe cursor."""
+    payload = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int = len(KEYSET_COLUMNS)) -> Tuple[Any, ...]:
+    """Decode a cursor from encode_cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeError, ValueError, AttributeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size or any(value is None for value in values):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+def with_keyset(select_statement: str, columns: Sequence[str] = KEYSET_COLUMNS) -> str:
+    """Add the keyset columns to a select statement that does not already include them."""
+    selected = {part.strip() for part in select_statement.split(",")}
+    if "*" in selected:
+        return select_statement
+    missing = [column for column in columns if column not in selected]
+    return ", ".join([select_statement] + missing) if missing else select_statement
+
+
+def row_cursor(row: Mapping[str, Any], columns: Sequence[str] = KEYSET_COLUMNS) -> str:
+    """The cursor that continues after a row."""
+    return encode_cursor([row.get(column) for column in columns])
+
+
+def parse_page_params(params: Mapping[str, Any], limit_key: str = "limit", cursor_key: str = "cursor",
+                      columns: Sequence[str] = KEYSET_COLUMNS) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Read the page size and cursor of a request.
+
+    Returns ``(None, None)`` when neither is given, so endpoints keep returning the
+    whole list to clients that do not paginate. Raises ValueError for a limit that
+    is not a positive integer or a malformed cursor; limits above MAX_PAGE_SIZE are
+    capped.
+    """
+    limit, cursor = params.get(limit_key), params.get(cursor_key) or None
+    if limit in (None, "") and cursor is None:
+        return None, None
+
+    if limit in (None, ""):
+        limit = DEFAULT_PAGE_SIZE
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError(f"{limit_key} must be a positive integer")
+    if limit < 1:
+        raise ValueError(f"{limit_key} must be a positive integer")
+
+    if cursor is not None:
+        decode_cursor(str(cursor), len(columns))
+    return min(limit, MAX_PAGE_SIZE), cursor
+
+
+def fetch_page(fetch: Callable[[Optional[Tuple], int], Optional[List[Dict]]], limit: int,
+               cursor: Optional[str] = None, keep: Optional[Callable[[List[Dict]], List[Dict]]] = None,
+               columns: Sequence[str] = KEYSET_COLUMNS) -> Optional[Tuple[List[Dict], Optional[str]]]:
+    """
+    Collect one page of rows and the cursor of the next page.
+
+    ``fetch(after, size)`` runs the ordered query for up to ``size`` rows after the
+    keyset ``after``. ``keep`` drops rows that can only be filtered client side and
+    must return a subset of the rows it gets, in order; batches are fetched until
+    the page is full or the rows run out. Returns None if a query fails.
+    """
+    after = (tuple(columns), decode_cursor(cursor, len(columns))) if cursor else None
+    page: List[Dict] = []
+    while True:
+        rows = fetch(after, limit + 1)
+        if rows is None:
+            return None
+        batch = rows[:limit]
+        for row in (keep(batch) if keep else batch):
+            page.append(row)
+            if len(page) == limit:
+                has_more = row is not batch[-1] or len(rows) > limit
+                return page, row_cursor(row, columns) if has_more else None
+        if len(rows) <= limit:
+            return page, None
+        after = (tuple(columns), tuple(batch[-1].get(column) for column in columns))
+
+
+class PageReadError(RuntimeError):
+    """A page after the first could not be read while its list was being consumed."""
+
+
+def iterate_pages(fetch: Callable[[int, Optional[str]], Optional[Tuple[List[Dict], Optional[str]]]],
+                  page_size: int) -> Optional[Iterator[Dict]]:
+    """
+    Every row of a paged list, in page order, reading the next page only once the
+    rows of the previous one have been consumed.
+
+    ``fetch(limit, cursor)`` returns one page and the cursor of the next, as the
+    ``*_page`` operations do. The first page is read before returning, and None is
+    returned if that fails; a later page that fails raises PageReadError, since
+    part of the list has been used by then.
+    """
+    first = fetch(page_size, None)
+    if first is None:
+        return None
+
+    def rows(page: List[Dict], cursor: Optional[str]) -> Iterator[Dict]:
+        while True:
+            yield from page
+            if cursor is None:
+                return
+            next_page = fetch(page_size, cursor)
+            if next_page is None:
+                raise PageReadError("Failed to read the next page")
+            page, cursor = next_page
+
+    return rows(*first)
+
+
+def _sort_value(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return value
+    return value
+
+
+def merge_newest_first(*row_lists: List[Dict], columns: Sequence[str] = KEYSET_COLUMNS) -> List[Dict]:
+    """Merge lists of rows from separate queries into one list ordered newest first."""
+    rows = [row for row_list in row_lists for row in row_list or []]
+    return sorted(rows, key=lambda row: tuple(_sort_value(row.get(column)) for column in columns), reverse=True)
@@ -0,0 +1,7 @@
+"""Direct PostgreSQL backend over a psycopg2 connection pool, selected with DB_BACKEND=postgres."""
+
+from .client import PostgresClient, AsyncPostgresClient
+from .engine import PostgresEngine, get_engine
+from .expense_queries import ExpenseQueries
+
+__all__ = ["PostgresClient", "AsyncPostgresClient", "PostgresEngine", "get_engine", "ExpenseQueries"]
@@ -0,0 +1,314 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from postgrest.base_request_builder import APIResponse
+from psycopg2.extras import Json
+from ..filters import Condition, parse_logic_tree
+from .engine import PostgresEngine
+
+_COMPARISONS = {"eq": "=", "neq": "<>", "gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+
+
+def quote_ident(name: str) -> str:
+    """Quote a table or column name for SQL."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def select_columns(select_statement: str) -> str:
+    """
+    Translate a PostgREST select statement to a SQL column list.
+
+    Supports ``*``, plain columns and ``alias:column``. Embedded resources are not
+    supported; the hot read paths that would use them have SQL joins instead.
+    """
+    columns = []
+    for part in (select_statement or "*").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "(" in part:
+            raise ValueError("The postgres engine does not support embedded selects")
+        if part == "*":
+            columns.append("*")
+            continue
+        alias, _, column = part.rpartition(":")
+        columns.append(f"{quote_ident(column)} AS {quote_ident(alias)}" if alias else quote_ident(column))
+    return ", ".join(columns) or "*"
+
+
+def condition_sql(condition: Condition, params: List[Any]) -> str:
+    """Translate a filter condition to SQL, appending its values to params."""
+    operator, value = condition.operator, condition.value
+
+    if operator in ("and", "or"):
+        parts = [condition_sql(child, params) for child in value]
+        empty = "TRUE" if operator == "and" else "FALSE"
+        sql = f"({f' {operator.upper()} '.join(parts)})" if parts else empty
+    else:
+        if "." in condition.column:
+            raise ValueError("The postgres engine does not filter on embedded resources")
+        column = quote_ident(condition.column)
+        if operator in _COMPARISONS:
+            sql = f"{column} {_COMPARISONS[operator]} %s"
+            params.append(value)
+        elif operator in ("like", "ilike"):
+            sql = f"{column} {operator.upper()} %s"
+            params.append(str(value).replace("*", "%"))
+        elif operator == "is":
+            sql = f"{column} IS {({None: 'NULL', True: 'TRUE', False: 'FALSE'})[value]}"
+        elif operator == "in":
+            values = list(value)
+            if values:
+                sql = f"{column} IN %s"
+                params.append(tuple(values))
+            else:
+                sql = "FALSE"
+        else:
+            raise ValueError(f"Unsupported filter operator: {operator}")
+
+    return f"NOT ({sql})" if condition.negate else sql
+
+
+def _adapt(value: Any) -> Any:
+    """Send dicts and lists as JSON, as PostgREST would for json columns."""
+    return Json(value) if isinstance(value, (dict, list)) else value
+
+
+class PostgresRequestBuilder:
+    """
+    Filters, ordering and paging compiled to one SQL statement, mirroring the postgrest-py builders.
+
+    Statements return their rows with json_agg, so values come back in the same
+    JSON representation PostgREST uses (timestamps as ISO strings and so on).
+    """
+
+    def __init__(self, client: "PostgresClient", table_name: str, operation: str,
+                 select_statement: str = "*", data: Any = None):
+        self.client = client
+        self.table_name = table_name
+        self.operation = operation
+        self.select_statement = select_statement
+        self.data = data
+        self.filters: List[Condition] = []
+        self.ordering: List[Tuple[str, bool, Optional[bool]]] = []
+        self.limit_count: Optional[int] = None
+        self.offset_count = 0
+        self.negate_next = False
+
+    @property
+    def not_(self) -> "PostgresRequestBuilder":
+        """Negate the filter applied next."""
+        self.negate_next = True
+        return self
+
+    def filter(self, column: str, operator: str, value: Any) -> "PostgresRequestBuilder":
+        self.filters.append(Condition(column, operator, value, self.negate_next))
+        self.negate_next = False
+        return self
+
+    def eq(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        return self.filter(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "PostgresRequestBuilder":
+        return self.filter(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "PostgresRequestBuilder":
+        return self.filter(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "PostgresRequestBuilder":
+        if isinstance(value, str):
+            value = {"null": None, "true": True, "false": False}[value.lower()]
+        return self.filter(column, "is", value)
+
+    def in_(self, column: str, values: Iterable[Any]) -> "PostgresRequestBuilder":
+        return self.filter(column, "in", list(values))
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "PostgresRequestBuilder":
+        if reference_table:
+            raise ValueError("The postgres engine does not filter embedded resources")
+        self.filters.append(parse_logic_tree("or", filters, self.negate_next))
+        self.negate_next = False
+        return self
+
+    def order(self, column: str, *, desc: bool = False, nullsfirst: Optional[bool] = None,
+              foreign_table: Optional[str] = None) -> "PostgresRequestBuilder":
+        if foreign_table:
+            raise ValueError("The postgres engine does not order embedded resources")
+        self.ordering.append((column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "PostgresRequestBuilder":
+        if foreign_table:
+            raise ValueError("The postgres engine does not limit embedded resources")
+        self.limit_count = size
+        return self
+
+    def offset(self, size: int) -> "PostgresRequestBuilder":
+        self.offset_count = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "PostgresRequestBuilder":
+        if foreign_table:
+            raise ValueError("The postgres engine does not page embedded resources")
+        self.offset_count = start
+        self.limit_count = end - start + 1
+        return self
+
+    def to_sql(self) -> Tuple[str, List[Any]]:
+        """The SQL statement and parameters of the request."""
+        params: List[Any] = []
+        table = quote_ident(self.table_name)
+
+        if self.operation == "select":
+            statement = f"SELECT {select_columns(self.select_statement)} FROM {table}{self._where(params)}"
+            if self.ordering:
+                statement += " ORDER BY " + ", ".join(
+                    f"{quote_ident(column)} {'DESC' if desc else 'ASC'}"
+                    + ("" if nullsfirst is None else " NULLS FIRST" if nullsfirst else " NULLS LAST")
+                    for column, desc, nullsfirst in self.ordering
+                )
+            if self.limit_count is not None:
+                statement += " LIMIT %s"
+                params.append(self.limit_count)
+            if self.offset_count:
+                statement += " OFFSET %s"
+                params.append(self.offset_count)
+            return f"SELECT coalesce(json_agg(t), '[]'::json) FROM ({statement}) t", params
+
+        if self.operation == "insert":
+            statement = self._insert(table, params)
+        elif self.operation == "update":
+            assignments = []
+            for column, value in self.data.items():
+                assignments.append(f"{quote_ident(column)} = %s")
+                params.append(_adapt(value))
+            statement = f"UPDATE {table} SET {', '.join(assignments)}{self._where(params)} RETURNING *"
+        elif self.operation == "delete":
+            statement = f"DELETE FROM {table}{self._where(params)} RETURNING *"
+        else:
+            raise ValueError(f"Unsupported operation: {self.operation}")
+        return f"WITH t AS ({statement}) SELECT coalesce(json_agg(t), '[]'::json) FROM t", params
+
+    def _where(self, params: List[Any]) -> str:
+        if not self.filters:
+            return ""
+        return " WHERE " + " AND ".join(condition_sql(condition, params) for condition in self.filters)
+
+    def _insert(self, table: str, params: List[Any]) -> str:
+        rows = self.data if isinstance(self.data, list) else [self.data]
+        # Like PostgREST bulk inserts, columns missing from some rows are set to null
+        columns = list(dict.fromkeys(column for row in rows for column in row))
+        if not columns:
+            return f"INSERT INTO {table} DEFAULT VALUES RETURNING *"
+
+        values = []
+        for row in rows:
+            values.append(f"({', '.join(['%s'] * len(columns))})")
+            params.extend(_adapt(row.get(column)) for column in columns)
+        column_list = ", ".join(quote_ident(column) for column in columns)
+        return f"INSERT INTO {table} ({column_list}) VALUES {', '.join(values)} RETURNING *"
+
+    def execute(self) -> APIResponse:
+        """Run the statement on a pooled connection."""
+        statement, params = self.to_sql()
+        return APIResponse(data=self.client.engine.fetch_value(statement, params) or [], count=None)
+
+
+class PostgresRpcBuilder:
+    """Call of a database function that returns a single value, such as the JSON functions in scripts/create_functions.py."""
+
+    def __init__(self, client: "PostgresClient", function_name: str, params: Dict[str, Any]):
+        self.client = client
+        self.function_name = function_name
+        self.params = params
+
+    def to_sql(self) -> Tuple[str, Dict[str, Any]]:
+        """The SQL statement and parameters of the call, with arguments passed by name."""
+        arguments = ", ".join(f"{quote_ident(name)} => %({name})s" for name in self.params)
+        return f"SELECT to_json({quote_ident(self.function_name)}({arguments}))", {
+            name: _adapt(value) for name, value in self.params.items()
+        }
+
+    def execute(self) -> APIResponse:
+        statement, params = self.to_sql()
+        return APIResponse.model_construct(data=self.client.engine.fetch_value(statement, params), count=None)
+
+
+class PostgresQueryBuilder:
+    """Entry point returned by ``table()``, mirroring postgrest-py's request builder."""
+
+    builder_class = PostgresRequestBuilder
+
+    def __init__(self, client: "PostgresClient", table_name: str):
+        self.client = client
+        self.table_name = table_name
+
+    def select(self, *columns: str, count: Optional[str] = None) -> PostgresRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "select", ",".join(columns) or "*")
+
+    def insert(self, json: Any, *, count: Optional[str] = None, returning: str = "representation",
+               upsert: bool = False, default_to_null: bool = True) -> PostgresRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "insert", data=json)
+
+    def update(self, json: Dict[str, Any], *, count: Optional[str] = None,
+               returning: str = "representation") -> PostgresRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "update", data=json)
+
+    def delete(self, *, count: Optional[str] = None, returning: str = "representation") -> PostgresRequestBuilder:
+        return self.builder_class(self.client, self.table_name, "delete")
+
+
+class PostgresClient:
+    """Drop-in replacement for the Supabase client that runs queries over direct PostgreSQL connections."""
+
+    query_builder_class = PostgresQueryBuilder
+    rpc_builder_class = PostgresRpcBuilder
+
+    def __init__(self, engine: PostgresEngine):
+        self.engine = engine
+
+    def table(self, table_name: str) -> PostgresQueryBuilder:
+        return self.query_builder_class(self, table_name)
+
+    def from_(self, table_name: str) -> PostgresQueryBuilder:
+        return self.table(table_name)
+
+    def rpc(self, function_name: str, params: Optional[Dict[str, Any]] = None) -> PostgresRpcBuilder:
+        return self.rpc_builder_class(self, function_name, params or {})
+
+
+class AsyncPostgresRequestBuilder(PostgresRequestBuilder):
+    """Request builder whose execute is awaitable; the blocking query runs in a worker thread."""
+
+    async def execute(self) -> APIResponse:
+        return await asyncio.to_thread(PostgresRequestBuilder.execute, self)
+
+
+class AsyncPostgresQueryBuilder(PostgresQueryBuilder):
+    builder_class = AsyncPostgresRequestBuilder
+
+
+class AsyncPostgresRpcBuilder(PostgresRpcBuilder):
+    async def execute(self) -> APIResponse:
+        return await asyncio.to_thread(PostgresRpcBuilder.execute, self)
+
+
+class AsyncPostgresClient(PostgresClient):
+    """Async variant of PostgresClient, sharing the same connection pool."""
+
+    query_builder_class = AsyncPostgresQueryBuilder
+    rpc_builder_class = AsyncPostgresRpcBuilder
@@ -0,0 +1,125 @@
+import atexit
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Sequence, Union
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresEngine:
+    """
+    Direct PostgreSQL connections from a thread-safe psycopg2 pool, shared by every client in a worker.
+
+    Connection settings are the ``DB_NAME``/``DB_USER``/``DB_PASSWORD``/``DB_HOST``/``DB_PORT``
+    variables used by the scripts, plus:
+
+    - ``DB_SSLMODE`` (default require)
+    - ``DB_POOL_MIN_CONNECTIONS`` (default 1) and ``DB_POOL_MAX_CONNECTIONS`` (default 10)
+    - ``DB_POOL_TIMEOUT`` seconds to wait for a free connection (default 5)
+    - ``DB_STATEMENT_TIMEOUT_MS`` for every statement (default 10000)
+
+    The pool is opened on first use.
+    """
+
+    def __init__(self):
+        self.connect_params = {
+            "dbname": os.getenv("DB_NAME"),
+            "user": os.getenv("DB_USER"),
+            "password": os.getenv("DB_PASSWORD"),
+            "host": os.getenv("DB_HOST"),
+            "port": os.getenv("DB_PORT"),
+            "sslmode": os.getenv("DB_SSLMODE", "require"),
+            "options": f"-c statement_timeout={int(os.getenv('DB_STATEMENT_TIMEOUT_MS', '10000'))}",
+        }
+        self.min_connections = int(os.getenv("DB_POOL_MIN_CONNECTIONS", "1"))
+        self.max_connections = int(os.getenv("DB_POOL_MAX_CONNECTIONS", "10"))
+        self.pool_timeout = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+        self._pool: Optional[ThreadedConnectionPool] = None
+        # ThreadedConnectionPool raises instead of waiting when it is exhausted
+        self._slots = threading.BoundedSemaphore(self.max_connections)
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+        self.in_use = 0
+
+    def _get_pool(self) -> ThreadedConnectionPool:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadedConnectionPool(self.min_connections, self.max_connections, **self.connect_params)
+                logger.info(f"PostgreSQL pool opened ({self.min_connections}-{self.max_connections} connections)")
+            return self._pool
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """Borrow a connection for one transaction, committed on success and rolled back on error."""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.waits += 1
+            if not self._slots.acquire(timeout=self.pool_timeout):
+                raise PoolError(f"No free PostgreSQL connection after {self.pool_timeout}s")
+
+        pool = None
+        conn = None
+        try:
+            pool = self._get_pool()
+            conn = pool.getconn()
+            with self._lock:
+                self.checkouts += 1
+                self.in_use += 1
+            try:
+                yield conn
+                conn.commit()
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+        finally:
+            if conn is not None:
+                with self._lock:
+                    self.in_use -= 1
+                # Connections broken by the server are dropped instead of reused
+                pool.putconn(conn, close=bool(conn.closed))
+            self._slots.release()
+
+    def fetch_value(self, query: str, params: Optional[Union[Sequence[Any], Dict[str, Any]]] = None) -> Any:
+        """Run a statement and return the first column of its first row (JSON is decoded)."""
+        with self.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, params)
+            row = cursor.fetchone() if cursor.description else None
+            return row[0] if row else None
+
+    def close(self) -> None:
+        """Close every pooled connection. The pool is reopened if the engine is used again."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and usage counters."""
+        with self._lock:
+            return {
+                "open": self._pool is not None,
+                "min_connections": self.min_connections,
+                "max_connections": self.max_connections,
+                "in_use": self.in_use,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+            }
+
+
+_engine: Optional[PostgresEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> PostgresEngine:
+    """The PostgreSQL engine shared by every client in the process, closed when the process exits."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = PostgresEngine()
+            atexit.register(_engine.close)
+        return _engine
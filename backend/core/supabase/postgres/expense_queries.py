@@ -0,0 +1,158 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from ..instrumentation import record_query
+from .client import quote_ident
+from .engine import PostgresEngine
+
+logger = logging.getLogger(__name__)
+
+# A split as shown on an expense, for a split row s and its debtor u
+_DEBTOR_SPLIT = """
+    jsonb_build_object(
+        'id', s.id,
+        'amount_owed', s.amount_owed,
+        'paid_request', s.paid_request,
+        'paid_confirmed', s.paid_confirmed,
+        'debtor', jsonb_build_object(
+            'name', u.name,
+            'payment_status', CASE
+                WHEN s.paid_confirmed IS NOT NULL THEN 'paid'
+                WHEN s.paid_request IS NOT NULL THEN 'pending'
+            END
+        )
+    )
+"""
+
+# A split without a matching user, with the columns of the splits.payment projection
+_RAW_SPLIT = """
+    jsonb_build_object(
+        'id', s.id,
+        'expenseid', s.expenseid,
+        'userid', s.userid,
+        'amount_owed', s.amount_owed,
+        'paid_request', s.paid_request,
+        'paid_confirmed', s.paid_confirmed
+    )
+"""
+
+
+class ExpenseQueries:
+    """
+    The hot expense read paths as single SQL statements, for the postgres engine.
+
+    Each method returns the same shape as the matching ExpenseOperations method, built
+    with JSON functions in the database instead of one request per table.
+    """
+
+    def __init__(self, engine: PostgresEngine, expenses_table: str, splits_table: str, users_table: str):
+        self.engine = engine
+        self.expenses_table = expenses_table
+        tables = {
+            "expenses": quote_ident(expenses_table),
+            "splits": quote_ident(splits_table),
+            "users": quote_ident(users_table),
+        }
+
+        self.lent_expenses_sql = """
+            SELECT coalesce(jsonb_agg(to_jsonb(e) || jsonb_build_object('splits', coalesce(s.splits, '[]'::jsonb))), '[]'::jsonb)
+            FROM {expenses} e
+            LEFT JOIN LATERAL (
+                SELECT
+                    jsonb_agg({debtor_split}) FILTER (WHERE u.id IS NOT NULL) AS splits,
+                    bool_and(s.paid_confirmed IS NOT NULL) AS all_paid
+                FROM {splits} s
+                LEFT JOIN {users} u ON u.id = s.userid
+                WHERE s.expenseid = e.id
+            ) s ON TRUE
+            WHERE e.created_by = %(user_id)s
+              -- Expenses without splits count as not fully paid
+              AND NOT coalesce(s.all_paid, FALSE)
+        """.format(debtor_split=_DEBTOR_SPLIT, **tables)
+
+        self.owed_splits_sql = """
+            SELECT coalesce(jsonb_agg(jsonb_build_object(
+                'id', s.id,
+                'expenseid', s.expenseid,
+                'userid', s.userid,
+                'amount_owed', s.amount_owed,
+                'paid_request', s.paid_request,
+                'paid_confirmed', s.paid_confirmed,
+                'expense', jsonb_build_object(
+                    'title', e.title,
+                    'due_date', e.due_date,
+                    'lender', CASE WHEN l.id IS NULL THEN NULL ELSE jsonb_build_object('name', l.name) END
+                )
+            )), '[]'::jsonb)
+            FROM {splits} s
+            JOIN {expenses} e ON e.id = s.expenseid
+            LEFT JOIN {users} l ON l.id = e.created_by
+            WHERE s.userid = %(user_id)s AND s.paid_confirmed IS NULL
+        """.format(**tables)
+
+        self.dashboard_sql = f"""
+            SELECT jsonb_build_object('lent', ({self.lent_expenses_sql}), 'owed', ({self.owed_splits_sql}))
+        """
+
+        self.group_expenses_sql = """
+            SELECT coalesce(jsonb_agg(to_jsonb(e) || jsonb_build_object('splits', coalesce(s.splits, '[]'::jsonb))), '[]'::jsonb)
+            FROM {expenses} e
+            LEFT JOIN LATERAL (
+                SELECT jsonb_agg(CASE WHEN u.id IS NULL THEN {raw_split} ELSE {debtor_split} END) AS splits
+                FROM {splits} s
+                LEFT JOIN {users} u ON u.id = s.userid
+                WHERE s.expenseid = e.id
+            ) s ON TRUE
+            WHERE e.group_id = %(group_id)s
+        """.format(raw_split=_RAW_SPLIT, debtor_split=_DEBTOR_SPLIT, **tables)
+
+        self.pending_payment_requests_sql = """
+            SELECT coalesce(jsonb_agg(jsonb_build_object(
+                'id', s.id,
+                'amount_owed', s.amount_owed,
+                'paid_request', s.paid_request,
+                'debtor', jsonb_build_object('name', u.name, 'id', s.userid),
+                'expense', jsonb_build_object('title', e.title, 'id', e.id)
+            )), '[]'::jsonb)
+            FROM {splits} s
+            JOIN {expenses} e ON e.id = s.expenseid
+            JOIN {users} u ON u.id = s.userid
+            WHERE e.created_by = %(lender_id)s
+              AND s.paid_request IS NOT NULL
+              AND s.paid_confirmed IS NULL
+        """.format(**tables)
+
+    def _fetch(self, name: str, statement: str, params: Dict[str, Any]) -> Any:
+        """Run a statement, recording it like a query made through _execute_query. Returns None on failure."""
+        started_at = time.perf_counter()
+        try:
+            result = self.engine.fetch_value(statement, params)
+            record_query(self.expenses_table, f"sql:{name}", params, result, started_at)
+            return result
+        except Exception as e:
+            record_query(self.expenses_table, f"sql:{name}", params, None, started_at, failed=True)
+            logger.error(f"Database query failed: {e}")
+            return None
+
+    def lent_expenses(self, user_id: str) -> Optional[List[Dict]]:
+        """Same as ExpenseOperations.get_user_lent_expenses."""
+        return self._fetch("lent_expenses", self.lent_expenses_sql, {"user_id": user_id})
+
+    def owed_splits(self, user_id: str) -> Optional[List[Dict]]:
+        """Same as ExpenseOperations.get_user_owed_splits."""
+        return self._fetch("owed_splits", self.owed_splits_sql, {"user_id": user_id})
+
+    def dashboard(self, user_id: str) -> Optional[Tuple[List[Dict], List[Dict]]]:
+        """Lent expenses and owed splits of a user in one statement."""
+        result = self._fetch("dashboard", self.dashboard_sql, {"user_id": user_id})
+        if result is None:
+            return None
+        return result["lent"], result["owed"]
+
+    def group_expenses(self, group_id: str) -> Optional[List[Dict]]:
+        """Same as ExpenseOperations.get_group_expenses."""
+        return self._fetch("group_expenses", self.group_expenses_sql, {"group_id": group_id})
+
+    def pending_payment_requests(self, lender_id: str) -> Optional[List[Dict]]:
+        """Same as ExpenseOperations.get_pending_payment_requests."""
+        return self._fetch("pending_payment_requests", self.pending_payment_requests_sql, {"lender_id": lender_id})
@@ -0,0 +1,53 @@
+"""
+Named column lists for select statements.
+
+Operations select only the columns they read instead of ``*``. Reads of the same
+fields share a projection, so the list is kept in one place when a response
+starts to need another column.
+"""
+
+from typing import Dict
+
+PROJECTIONS: Dict[str, str] = {
+    # Existence checks
+    "exists": "id",
+    # Splits as shown on expenses, with the debtor's payment status; also read
+    # before a payment request, confirmation or rejection to update credit totals
+    "splits.payment": "id, expenseid, userid, amount_owed, paid_request, paid_confirmed",
+    # Pending payment requests shown to a lender
+    "splits.pending": "id, expenseid, userid, amount_owed, paid_request",
+    # Splits read by the credit score calculation
+    "splits.credit_history": "id, expenseid, amount_owed, paid_request, paid_confirmed",
+    # Splits of all users, read by the batch credit score calculation
+    "splits.credit_batch": "id, expenseid, userid, amount_owed, paid_request, paid_confirmed",
+    # Lender context of an owed split
+    "expenses.owed_context": "id, title, due_date, created_by",
+    # Expense context of a pending payment request
+    "expenses.title": "id, title",
+    # Expense dates read by the credit score calculation
+    "expenses.credit_history": "id, due_date, created_at",
+    # Who sees an expense, read to replace their version tokens after a split write
+    "expenses.owner": "id, created_by, group_id",
+    # Read before a payment confirmation or rejection: the dates grade the payment,
+    # and the group's version token is replaced
+    "expenses.payment_check": "id, due_date, created_at, group_id",
+    # Totals shown on the dashboard
+    "expenses.totals": "id, total_amount",
+    "splits.lent_status": "expenseid, paid_confirmed",
+    "splits.owed_amount": "amount_owed",
+    "groups.budget": "id, total_budget",
+    "group_memberships.group": "group_id",
+    "users.credit_score": "id, credit_score",
+    "users.leaderboard": "id, name, email, credit_score",
+    # Running totals the credit score is derived from
+    "credit_score_aggregates.totals": (
+        "user_id, split_count, on_time_count, late_count, unpaid_count, paid_count, request_count, "
+        "confirmation_count, confirmation_hours_sum, outstanding_debt, historical_debt, "
+        "payment_time_count, payment_time_sum, payment_time_sq_sum"
+    ),
+}
+
+
+def projection(name: str) -> str:
+    """The select statement registered under a name. Raises KeyError for unknown names."""
+    return PROJECTIONS[name]
@@ -0,0 +1,95 @@
+"""Change tokens per resource in the Django cache, replaced whenever the resource is written."""
+
+import logging
+import os
+import uuid
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class VersionTokens:
+    """
+    A random token per resource (e.g. a user's dashboard or a group), kept in a
+    Django cache (``CACHES[alias]``) so all workers sharing the cache see it.
+
+    Operations replace the token of every resource a write touches, so two reads
+    that got the same token saw the same data. A missing token is created on the
+    first read, and tokens expire after ``timeout`` seconds (default
+    ``VERSION_TOKEN_TTL_SECONDS``, 300; 0 disables them), which bounds how long
+    writes made outside this backend go unnoticed. Reads return None when the
+    cache is disabled or cannot be reached, and callers then skip whatever the
+    token was for. The cache must be shared by all workers (see CACHE_SHARED).
+    """
+
+    def __init__(self, alias: str = "default", timeout: Optional[int] = None):
+        self.alias = alias
+        self.timeout = timeout if timeout is not None else int(os.getenv("VERSION_TOKEN_TTL_SECONDS", "300"))
+        self._warned_unshared = False
+
+    @property
+    def cache(self):
+        """
+        The Django cache, or None when Django is not configured, the tokens are
+        disabled, or the cache is private to this process (CACHE_SHARED is false),
+        since other workers would not see the tokens this one replaces.
+        """
+        from django.conf import settings
+
+        if self.timeout <= 0 or not settings.configured:
+            return None
+        if not getattr(settings, "CACHE_SHARED", True):
+            if not self._warned_unshared:
+                self._warned_unshared = True
+                logger.warning("The default cache is not shared between workers; dashboard caching and ETags are off")
+            return None
+        from django.core.cache import caches
+
+        return caches[self.alias]
+
+    @property
+    def enabled(self) -> bool:
+        return self.cache is not None
+
+    @staticmethod
+    def _key(scope: str, resource_id: str) -> str:
+        return f"{scope}:{resource_id}:version"
+
+    def get(self, scope: str, resource_id: str) -> Optional[str]:
+        """The current token of a resource, created if it has none."""
+        return (self.get_many(scope, [resource_id]) or {}).get(resource_id)
+
+    def get_many(self, scope: str, resource_ids: Iterable[str]) -> Optional[Dict[str, str]]:
+        """The current tokens of several resources, by resource ID, in one cache round trip when all exist."""
+        cache = self.cache
+        keys = {self._key(scope, resource_id): resource_id for resource_id in resource_ids if resource_id}
+        if cache is None:
+            return None
+        try:
+            found = cache.get_many(list(keys))
+            for key in keys.keys() - found.keys():
+                # add() keeps a token another worker stored in the meantime
+                cache.add(key, uuid.uuid4().hex, self.timeout)
+                found[key] = cache.get(key)
+        except Exception as e:
+            logger.warning("Reading version tokens of %s failed: %s", scope, e)
+            return None
+        if any(token is None for token in found.values()):
+            return None
+        return {keys[key]: token for key, token in found.items()}
+
+    def bump(self, scope: str, resource_ids: Iterable[Optional[str]]) -> None:
+        """Replace the tokens of these resources after writing them."""
+        cache = self.cache
+        resource_ids = {resource_id for resource_id in resource_ids if resource_id}
+        if cache is None or not resource_ids:
+            return
+        try:
+            cache.set_many({self._key(scope, resource_id): uuid.uuid4().hex for resource_id in resource_ids}, self.timeout)
+        except Exception as e:
+            # Tokens read before the failure still expire after the timeout
+            logger.warning("Replacing version tokens of %s %s failed: %s", scope, sorted(resource_ids), e)
+
+
+# Shared by all operation modules in the process
+version_tokens = VersionTokens()
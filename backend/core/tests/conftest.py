@@ -0,0 +1,28 @@
+import pytest
+from django.core.cache import caches
+from core.supabase.base_client import BaseSupabaseClient, missing_functions
+from core.supabase.fake import FakeDatabase
+from core.supabase.operations.credit_score_operations import credit_score_stats_cache
+from core.supabase.operations.user_operations import user_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_django_cache():
+    """Start every test without dashboard data cached by an earlier one."""
+    caches["default"].clear()
+    yield
+
+
+@pytest.fixture
+def fake_client(monkeypatch):
+    """A client on an empty in-memory database, with the process-wide caches cleared."""
+    monkeypatch.setenv("DB_BACKEND", "fake")
+    client = BaseSupabaseClient()
+    client.client.database = FakeDatabase()
+    user_cache.clear()
+    credit_score_stats_cache.clear()
+    missing_functions.clear()
+    yield client
+    user_cache.clear()
+    credit_score_stats_cache.clear()
+    missing_functions.clear()
@@ -0,0 +1,50 @@
+import asyncio
+from functools import partial
+from unittest.mock import MagicMock
+from core.tests.test_expense_operations import TABLES, _matches
+from core.supabase.base_client import BaseSupabaseClient
+from core.supabase.async_base_client import AsyncBaseSupabaseClient
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.async_expense_operations import AsyncExpenseOperations
+
+
+def _async_base_client():
+    client = MagicMock()
+    client.get_table_name.side_effect = lambda name: name
+    client.embedded_selects = False
+    calls = []
+
+    async def execute_query(table_name, operation, data=None, filters=None, limit=None, select_statement="*"):
+        calls.append(table_name)
+        return [dict(row) for row in TABLES[table_name] if _matches(row, filters)]
+
+    def sync_execute_query(table_name, operation, data=None, filters=None, limit=None, select_statement="*"):
+        return [dict(row) for row in TABLES[table_name] if _matches(row, filters)]
+
+    client._execute_query = execute_query
+    client.select_in = partial(AsyncBaseSupabaseClient.select_in, client)
+    client.calls = calls
+    sync_client = MagicMock()
+    sync_client.get_table_name.side_effect = lambda name: name
+    sync_client.embedded_selects = False
+    sync_client._execute_query.side_effect = sync_execute_query
+    sync_client.select_in.side_effect = partial(BaseSupabaseClient.select_in, sync_client)
+    return client, sync_client
+
+
+def test_async_dashboard_matches_sync_result():
+    client, sync_client = _async_base_client()
+
+    dashboard = asyncio.run(AsyncExpenseOperations(client).get_user_dashboard_data('u1'))
+
+    assert dashboard == ExpenseOperations(sync_client).get_user_dashboard_data('u1')
+    assert dashboard['lent']['total_amount'] == 3000
+
+
+def test_async_group_expenses_use_constant_number_of_queries():
+    client, sync_client = _async_base_client()
+
+    expenses = asyncio.run(AsyncExpenseOperations(client).get_group_expenses('g1'))
+
+    assert expenses == ExpenseOperations(sync_client).get_group_expenses('g1')
+    assert client.calls == ['expenses', 'splits', 'users']
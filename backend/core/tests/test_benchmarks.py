@@ -0,0 +1,20 @@
+from benchmarks.runner import percentile, summarize
+from benchmarks.seed import build_rows
+
+
+def test_build_rows_is_deterministic_and_consistent():
+    rows = build_rows(200, seed=1)
+
+    assert len(rows["splits"]) == 200
+    assert build_rows(200, seed=1)["splits"][0]["id"] == rows["splits"][0]["id"]
+    expense_ids = {expense["id"] for expense in rows["expenses"]}
+    user_ids = {user["id"] for user in rows["users"]}
+    assert all(split["expenseid"] in expense_ids and split["userid"] in user_ids for split in rows["splits"])
+
+
+def test_percentiles_interpolate_between_ranks():
+    values = [1.0, 2.0, 3.0, 4.0]
+
+    assert percentile(values, 0.5) == 2.5
+    assert summarize(values)["max"] == 4.0
+    assert summarize([])["p99"] is None
@@ -0,0 +1,70 @@
+import gzip
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from rest_framework.renderers import JSONRenderer
+from core.middleware import CompressionMiddleware, accepted_encodings
+from core.renderers import FastJSONRenderer
+
+
+def test_fast_renderer_matches_json_renderer():
+    data = {
+        "expenses": [{
+            "id": uuid.UUID(int=1),
+            "title": "Café\u2028dinner",
+            "amount": Decimal("12.50"),
+            "created_at": datetime(2024, 1, 1, 12, 30, tzinfo=timezone.utc),
+            "due_date": datetime(2024, 1, 15).date(),
+            "splits": [],
+            "paid": None,
+        }],
+        1: "non-string key",
+    }
+
+    assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+    assert FastJSONRenderer().render(data, "application/json; indent=2") == JSONRenderer().render(data, "application/json; indent=2")
+    assert FastJSONRenderer().render(None) == b""
+    # Too large for orjson, so encoded by the standard library
+    assert FastJSONRenderer().render({"huge": 2 ** 70}) == JSONRenderer().render({"huge": 2 ** 70})
+
+
+def test_accepted_encodings_reads_quality_values():
+    assert accepted_encodings("gzip, deflate;q=0.5, br;q=0") == {"gzip": 1.0, "deflate": 0.5, "br": 0.0}
+
+
+def _middleware(response):
+    return CompressionMiddleware(lambda request: response)
+
+
+def test_large_responses_are_gzipped_when_accepted():
+    body = b'{"expenses": [' + b'{"title": "Lunch"},' * 200 + b'{}]}'
+    response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = '"abc"'
+
+    compressed = _middleware(response)(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip, deflate"))
+
+    assert compressed["Content-Encoding"] == "gzip"
+    assert compressed["Vary"] == "Accept-Encoding"
+    assert compressed["ETag"] == 'W/"abc"'
+    assert gzip.decompress(compressed.content) == body
+
+
+def test_small_or_unaccepted_responses_are_sent_as_is():
+    body = b'{"expenses": [' + b'{"title": "Lunch"},' * 200 + b'{}]}'
+
+    small = _middleware(HttpResponse(b'{"ok": true}'))(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip"))
+    refused = _middleware(HttpResponse(body))(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip;q=0"))
+
+    assert not small.has_header("Content-Encoding")
+    assert not refused.has_header("Content-Encoding")
+    assert refused.content == body
+
+
+def test_streaming_responses_are_gzipped_as_they_are_sent():
+    chunks = [b'{"title": "Lunch"},' * 50 for _ in range(5)]
+    response = _middleware(StreamingHttpResponse(iter(chunks)))(RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip"))
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(b"".join(response.streaming_content)) == b"".join(chunks)
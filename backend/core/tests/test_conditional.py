@@ -0,0 +1,76 @@
+from unittest.mock import patch
+import pytest
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from core.supabase.operations.friend_request_operations import FriendRequestOperations
+from core.views.dashboard import DashboardView
+from core.views.friend_request import FriendRequestView
+
+
+@pytest.fixture
+def api_request_factory():
+    return APIRequestFactory()
+
+
+@patch('core.views.dashboard.supabase')
+def test_unchanged_dashboard_is_answered_with_304(mock_supabase, api_request_factory):
+    view = DashboardView.as_view({'get': 'get_user_expenses'})
+    mock_supabase.expenses.get_user_dashboard_version.return_value = 'v1'
+    mock_supabase.expenses.get_user_dashboard_data.return_value = {'net': {'total_amount': 0}}
+
+    first = view(api_request_factory.get('/api/dashboard/user-expenses/', {'user_id': 'u1'}))
+    etag = first['ETag']
+    repeat = view(api_request_factory.get('/api/dashboard/user-expenses/', {'user_id': 'u1'}, HTTP_IF_NONE_MATCH=etag))
+
+    assert first.status_code == status.HTTP_200_OK
+    assert repeat.status_code == status.HTTP_304_NOT_MODIFIED
+    assert repeat['ETag'] == etag
+    mock_supabase.expenses.get_user_dashboard_data.assert_called_once_with('u1')
+
+    mock_supabase.expenses.get_user_dashboard_version.return_value = 'v2'
+    changed = view(api_request_factory.get('/api/dashboard/user-expenses/', {'user_id': 'u1'}, HTTP_IF_NONE_MATCH=etag))
+    other_user = view(api_request_factory.get('/api/dashboard/user-expenses/', {'user_id': 'u2'}, HTTP_IF_NONE_MATCH=etag))
+
+    assert changed.status_code == status.HTTP_200_OK
+    assert changed['ETag'] != etag
+    assert other_user.status_code == status.HTTP_200_OK
+
+
+@patch('core.views.dashboard.supabase')
+def test_no_etag_without_a_version(mock_supabase, api_request_factory):
+    view = DashboardView.as_view({'get': 'get_user_expenses'})
+    mock_supabase.expenses.get_user_dashboard_version.return_value = None
+    mock_supabase.expenses.get_user_dashboard_data.return_value = {'net': {'total_amount': 0}}
+
+    response = view(api_request_factory.get('/api/dashboard/user-expenses/', {'user_id': 'u1'}, HTTP_IF_NONE_MATCH='*'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header('ETag')
+
+
+@override_settings(CACHE_SHARED=False)
+@patch('core.views.friend_request.supabase')
+def test_no_etag_from_a_cache_private_to_the_worker(mock_supabase, api_request_factory, fake_client):
+    # Another worker could have replaced the token, so a 304 could confirm a stale list
+    view = FriendRequestView.as_view({'get': 'get_friends'})
+    mock_supabase.friend_requests = FriendRequestOperations(fake_client)
+
+    response = view(api_request_factory.get('/api/friend/get-friends/', {'username': 'a@example.com'}, HTTP_IF_NONE_MATCH='*'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not response.has_header('ETag')
+
+
+def test_friend_request_writes_replace_both_users_versions(fake_client):
+    friend_requests = FriendRequestOperations(fake_client)
+    before = {email: friend_requests.get_version(email) for email in ('a@example.com', 'b@example.com', 'c@example.com')}
+
+    friend_requests.create('a@example.com', 'b@example.com')
+    after_create = {email: friend_requests.get_version(email) for email in before}
+    friend_requests.accept('a@example.com', 'b@example.com')
+
+    assert after_create['a@example.com'] != before['a@example.com']
+    assert after_create['b@example.com'] != before['b@example.com']
+    assert after_create['c@example.com'] == before['c@example.com']
+    assert friend_requests.get_version('b@example.com') != after_create['b@example.com']
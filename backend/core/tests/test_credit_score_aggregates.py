@@ -0,0 +1,132 @@
+import math
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+import pytest
+from core.supabase.operations.credit_score_aggregates import CreditAggregate
+from core.supabase.operations.credit_score_operations import CreditScoreOperations
+from core.supabase.operations.credit_score_records import ExpenseRecord, SplitRecord
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.user_operations import UserOperations
+
+
+@pytest.fixture
+def operations(fake_client):
+    credit_scores = CreditScoreOperations(fake_client)
+    expenses = ExpenseOperations(fake_client, credit_scores=credit_scores)
+    users = UserOperations(fake_client)
+    alice = users.create("alice@example.com", "fb-alice")
+    bob = users.create("bob@example.com", "fb-bob")
+    return credit_scores, expenses, alice, bob
+
+
+def test_totals_follow_split_transitions(operations):
+    credit_scores, expenses, alice, bob = operations
+    dinner = expenses.create_expense("Dinner", 3000, alice["id"], due_date="2024-01-10T00:00:00")
+    first = expenses.create_split(dinner["id"], bob["id"], 1500)
+    # Built from the history on first use, then kept up to date by each write
+    credit_scores.rebuild_credit_aggregate(bob["id"])
+
+    lunch = expenses.create_expense("Lunch", 1200, alice["id"])
+    expenses.create_splits(lunch, [(bob["id"], 600), (bob["id"], -200)])
+    expenses.request_payment_confirmation(first["id"], bob["id"])
+    expenses.confirm_payment(first["id"], alice["id"])
+    second = expenses.create_split(lunch["id"], bob["id"], 100)
+    expenses.request_payment_confirmation(second["id"], bob["id"])
+    expenses.reject_payment(second["id"], alice["id"])
+
+    aggregate = credit_scores.get_credit_aggregate(bob["id"])
+    assert (aggregate.split_count, aggregate.paid_count, aggregate.on_time_count) == (4, 2, 1)
+    assert aggregate.score() == credit_scores.calculate_user_credit_score(bob["id"])
+    assert credit_scores.check_credit_aggregates([bob["id"]])["mismatched"] == 0
+
+    expenses.update_expense(lunch["id"], {"due_date": "2099-01-01T00:00:00"})
+    assert credit_scores.get_credit_aggregate(bob["id"]) is None
+    assert credit_scores.update_user_credit_score(bob["id"])["credit_score"] == (
+        credit_scores.calculate_user_credit_score(bob["id"])
+    )
+
+
+def test_payment_time_variance_supports_removal():
+    created_at = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    expense = {"id": "e1", "created_at": created_at.isoformat()}
+    splits = [
+        {"amount_owed": 10, "paid_confirmed": (created_at + timedelta(hours=hours)).isoformat()}
+        for hours in [5.0, 48.0, 12.5, 300.0, 7.25]
+    ]
+    aggregate = CreditAggregate()
+    for split in splits:
+        aggregate.add(split, expense)
+    aggregate.remove(splits[1], expense)
+
+    remaining = [5.0, 12.5, 300.0, 7.25]
+    mean = sum(remaining) / len(remaining)
+    assert aggregate.payment_time_count == 4
+    assert math.isclose(aggregate.payment_time_sum, sum(remaining))
+    assert math.isclose(aggregate.payment_time_std_dev(), math.sqrt(sum((value - mean) ** 2 for value in remaining) / 4))
+
+
+def test_split_changes_are_added_in_one_call(operations, fake_client):
+    credit_scores, expenses, alice, bob = operations
+    dinner = expenses.create_expense("Dinner", 3000, alice["id"])
+    expenses.create_split(dinner["id"], bob["id"], 1500)
+    credit_scores.rebuild_credit_aggregate(bob["id"])
+    credit_scores.rebuild_credit_aggregate(alice["id"])
+    lunch = expenses.create_expense("Lunch", 1200, alice["id"])
+
+    with patch.object(fake_client, "rpc", wraps=fake_client.rpc) as rpc, \
+            patch.object(fake_client, "_execute_query", wraps=fake_client._execute_query) as execute_query:
+        credit_scores.record_split_changes([
+            (None, {"userid": bob["id"], "amount_owed": 600}, lunch),
+            (None, {"userid": alice["id"], "amount_owed": 600}, lunch),
+            (None, {"userid": bob["id"], "amount_owed": 200}, lunch),
+        ])
+
+    assert rpc.call_count == 1
+    assert execute_query.call_count == 0
+    assert credit_scores.get_credit_aggregate(bob["id"]).historical_debt == 2300
+    assert credit_scores.get_credit_aggregate(alice["id"]).split_count == 1
+
+
+def test_split_changes_drop_totals_when_the_function_fails(operations, fake_client):
+    credit_scores, expenses, alice, bob = operations
+    dinner = expenses.create_expense("Dinner", 3000, alice["id"])
+    expenses.create_split(dinner["id"], bob["id"], 1500)
+    credit_scores.rebuild_credit_aggregate(bob["id"])
+
+    with patch.object(fake_client, "rpc", return_value=None):
+        expenses.create_split(dinner["id"], bob["id"], 500)
+
+    assert credit_scores.get_credit_aggregate(bob["id"]) is None
+    assert credit_scores.update_user_credit_score(bob["id"])["credit_score"] == (
+        credit_scores.calculate_user_credit_score(bob["id"])
+    )
+
+
+def test_checker_repairs_drifted_totals(operations):
+    credit_scores, expenses, alice, bob = operations
+    dinner = expenses.create_expense("Dinner", 3000, alice["id"])
+    expenses.create_split(dinner["id"], bob["id"], 1500)
+    aggregate = credit_scores.rebuild_credit_aggregate(bob["id"])
+    aggregate.outstanding_debt = 0
+    credit_scores._save_credit_aggregate(bob["id"], aggregate)
+
+    report = credit_scores.check_credit_aggregates(repair=True)
+
+    assert (report["checked"], report["missing"], report["mismatched"], report["repaired"]) == (2, 1, 1, 1)
+    assert report["mismatches"][0]["user_id"] == bob["id"]
+    assert credit_scores.check_credit_aggregates([bob["id"]])["mismatched"] == 0
+
+
+def test_split_records_parse_each_timestamp_once_with_factor_semantics():
+    due = ExpenseRecord.from_row({"id": "e1", "due_date": "2024-03-01T00:00:00Z", "created_at": "2024-02-20T00:00:00Z"})
+    date_only = ExpenseRecord.from_row({"id": "e2", "due_date": "2024-03-01", "created_at": "2024-02-20T00:00:00Z"})
+
+    # Exactly at the end of the 7 day grace period
+    on_time = SplitRecord.from_row(
+        {"amount_owed": 10, "paid_request": "2024-03-07T12:00:00Z", "paid_confirmed": "2024-03-08T00:00:00+00:00"}, due
+    )
+    assert (on_time.outcome, on_time.confirmation_hours, on_time.payment_hours) == ("on_time", 12.0, 408.0)
+    # A naive due date cannot be compared with a timezone-aware confirmation
+    assert SplitRecord.from_row({"paid_confirmed": "2024-03-08T00:00:00Z"}, date_only).outcome is None
+    assert SplitRecord.from_row({"paid_confirmed": "not a date"}, due).payment_hours is None
+    assert SplitRecord.from_row({"amount_owed": 5, "paid_request": "x"}, due)[:4] == (5, True, False, "unpaid")
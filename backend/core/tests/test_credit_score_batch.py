@@ -0,0 +1,40 @@
+import random
+from core.supabase.instrumentation import collect_queries
+from core.supabase.operations import credit_score_operations
+from core.supabase.operations.credit_score_operations import CreditScoreOperations
+from core.supabase.operations.user_operations import UserOperations
+
+
+def test_batch_scores_match_per_user_scores(fake_client, monkeypatch):
+    monkeypatch.setattr(credit_score_operations, "BATCH_PAGE_SIZE", 4)
+    rng = random.Random(7)
+    users = [UserOperations(fake_client).create(f"user{i}@example.com", f"fb-{i}") for i in range(8)]
+    expenses_table, splits_table = fake_client.get_table_name("expenses"), fake_client.get_table_name("splits")
+    for i in range(12):
+        day = rng.randint(1, 20)
+        expense = fake_client._execute_query(expenses_table, "insert", data={
+            "title": f"Expense {i}", "total_amount": 1000, "created_by": users[0]["id"],
+            "created_at": f"2024-03-{day:02d}T12:00:00+00:00",
+            "due_date": f"2024-04-{day:02d}T00:00:00+00:00" if i % 3 else None,
+        })
+        for user in rng.sample(users[1:6], 3):
+            paid = rng.random() < 0.6
+            fake_client._execute_query(splits_table, "insert", data={
+                "expenseid": expense["id"], "userid": user["id"], "amount_owed": rng.randint(1, 900),
+                "paid_request": f"2024-05-{day:02d}T08:00:00+00:00" if rng.random() < 0.7 else None,
+                "paid_confirmed": f"2024-{rng.choice(['03', '05'])}-{rng.randint(21, 28)}T10:00:00+00:00" if paid else None,
+            })
+    operations = CreditScoreOperations(fake_client)
+    with collect_queries() as per_user:
+        expected = {user["id"]: operations.calculate_user_credit_score(user["id"]) for user in users}
+
+    with collect_queries() as collector:
+        results = operations.update_all_credit_scores()
+
+    stored = fake_client._execute_query(fake_client.get_table_name("users"), "select", select_statement="id, credit_score")
+    assert {user["id"]: user["credit_score"] for user in stored} == expected
+    assert results["updated_users"] == 8 and results["users_without_history"] == 3
+    # One splits query per user, and one expenses query for each of the 5 users with splits
+    assert per_user.count == 8 + 5
+    # 8 users, 36 splits and 12 expenses read 4 at a time, then one update per distinct score
+    assert collector.count == 3 + 10 + 4 + len(set(expected.values()))
@@ -0,0 +1,94 @@
+from unittest.mock import patch
+import pytest
+from django.test import override_settings
+from core.supabase.cache import TTLCache
+from core.supabase.dashboard_cache import DashboardCache
+from core.supabase.instrumentation import collect_queries
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.user_operations import UserOperations
+from core.supabase.versions import VersionTokens
+
+
+@pytest.fixture
+def expense_setup(fake_client):
+    users = UserOperations(fake_client, cache=TTLCache())
+    alice = users.create("alice@example.com", "fb-alice")
+    bob = users.create("bob@example.com", "fb-bob")
+    expenses = ExpenseOperations(fake_client, dashboard_cache=DashboardCache("test_dashboard", timeout=60))
+    lunch = expenses.create_expense("Lunch", 2000, alice["id"])
+    split = expenses.create_split(lunch["id"], bob["id"], 1000)
+    return expenses, alice, bob, lunch, split
+
+
+def test_repeat_dashboard_load_is_a_cache_hit(expense_setup):
+    expenses, alice, _bob, _lunch, _split = expense_setup
+
+    first = expenses.get_user_dashboard_data(alice["id"])
+    with collect_queries() as collector:
+        second = expenses.get_user_dashboard_data(alice["id"])
+
+    assert second == first
+    assert first["lent"]["total_amount"] == 2000
+    assert collector.count == 0
+    assert expenses.dashboard_cache.stats()["hits"] == 1
+
+
+def test_writes_invalidate_every_affected_dashboard(expense_setup):
+    expenses, alice, bob, lunch, split = expense_setup
+    for user in (alice, bob):
+        expenses.get_user_dashboard_data(user["id"])
+
+    expenses.request_payment_confirmation(split["id"], bob["id"])
+    assert expenses.get_user_dashboard_data(bob["id"])["owed"]["splits"][0]["paid_request"]
+
+    expenses.confirm_payment(split["id"], alice["id"])
+    assert expenses.get_user_dashboard_data(alice["id"])["lent"]["total_amount"] == 0
+    assert expenses.get_user_dashboard_data(bob["id"])["owed"]["total_amount"] == 0
+
+    expenses.update_expense(lunch["id"], {"title": "Team lunch"})
+    expenses.delete_expense(lunch["id"])
+    assert expenses.get_user_dashboard_data(bob["id"])["owed"]["splits"] == []
+    assert expenses.dashboard_cache.stats()["hits"] == 0
+
+
+def test_disabled_cache_always_builds():
+    cache = DashboardCache("test_dashboard", timeout=0)
+    builds = []
+
+    for _ in range(2):
+        cache.get_or_build("u1", lambda: builds.append(1) or {"net": {"total_amount": 0}})
+
+    assert len(builds) == 2
+    assert cache.stats()["backend"] is None
+
+
+def test_renaming_a_user_invalidates_the_dashboards_showing_the_name(fake_client):
+    users = UserOperations(fake_client)
+    alice, bob, carol = (users.create(f"{name}@example.com", f"fb-{name}") for name in ("alice", "bob", "carol"))
+    expenses = ExpenseOperations(fake_client)
+    lunch = expenses.create_expense("Lunch", 2000, alice["id"])
+    expenses.create_split(lunch["id"], bob["id"], 1000)
+    expenses.get_user_dashboard_data(alice["id"])
+    before = {user["id"]: expenses.get_user_dashboard_version(user["id"]) for user in (alice, bob, carol)}
+
+    users.update_name("fb-bob", "Robert")
+
+    after = {user_id: expenses.get_user_dashboard_version(user_id) for user_id in before}
+    assert after[alice["id"]] != before[alice["id"]] and after[bob["id"]] != before[bob["id"]]
+    assert after[carol["id"]] == before[carol["id"]]
+    lent = expenses.get_user_dashboard_data(alice["id"])["lent"]["expenses"]
+    assert lent[0]["splits"][0]["debtor"]["name"] == "Robert"
+
+
+@override_settings(CACHE_SHARED=False)
+def test_cache_private_to_the_worker_is_not_used():
+    assert VersionTokens().get("test_dashboard", "u1") is None
+    assert DashboardCache("test_dashboard", timeout=60).stats()["backend"] is None
+
+
+def test_failed_read_is_not_cached(expense_setup):
+    expenses, alice, _bob, _lunch, _split = expense_setup
+    with patch.object(expenses, "get_user_owed_splits", return_value=None):
+        assert expenses.get_user_dashboard_data(alice["id"]) is None
+
+    assert expenses.get_user_dashboard_data(alice["id"])["lent"]["total_amount"] == 2000
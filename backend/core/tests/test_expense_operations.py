@@ -0,0 +1,186 @@
+import pytest
+from functools import partial
+from unittest.mock import MagicMock, patch
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from core.supabase.base_client import BaseSupabaseClient, parse_filter_key
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.projections import projection
+from core.views.expenses import ExpensesView
+
+
+TABLES = {
+    'expenses': [
+        {'id': 'e1', 'title': 'Dinner', 'total_amount': 3000, 'created_by': 'u1', 'group_id': 'g1'},
+        {'id': 'e2', 'title': 'Taxi', 'total_amount': 1000, 'created_by': 'u1', 'group_id': 'g1'},
+    ],
+    'splits': [
+        {'id': 's1', 'expenseid': 'e1', 'userid': 'u2', 'amount_owed': 1500, 'paid_request': None, 'paid_confirmed': None},
+        {'id': 's2', 'expenseid': 'e1', 'userid': 'u3', 'amount_owed': 1500, 'paid_request': '2024-01-01T00:00:00+00:00', 'paid_confirmed': None},
+        {'id': 's3', 'expenseid': 'e2', 'userid': 'u2', 'amount_owed': 1000, 'paid_request': None, 'paid_confirmed': '2024-01-02T00:00:00+00:00'},
+    ],
+    'users': [
+        {'id': 'u1', 'name': 'Alice'},
+        {'id': 'u2', 'name': 'Bob'},
+        {'id': 'u3', 'name': 'Carol'},
+    ],
+}
+
+
+def _matches(row, filters):
+    for key, value in (filters or {}).items():
+        column, operator = parse_filter_key(key, value)
+        if operator == 'in':
+            if row.get(column) not in value:
+                return False
+        elif operator == 'not':
+            if row.get(column) == value:
+                return False
+        elif row.get(column) != value:
+            return False
+    return True
+
+
+@pytest.fixture
+def base_client():
+    client = MagicMock()
+    client.get_table_name.side_effect = lambda name: name
+    client.embedded_selects = False
+
+    def execute_query(table_name, operation, data=None, filters=None, limit=None, select_statement="*"):
+        return [dict(row) for row in TABLES[table_name] if _matches(row, filters)]
+
+    client._execute_query.side_effect = execute_query
+    client.select_in.side_effect = partial(BaseSupabaseClient.select_in, client)
+    return client
+
+
+def test_apply_filters_uses_in_for_list_values():
+    query = MagicMock()
+    query.in_.return_value = query
+    query.eq.return_value = query
+
+    BaseSupabaseClient._apply_filters(query, {'id': ['a', 'b'], 'group_id': 'g1'})
+
+    query.in_.assert_called_once_with('id', ['a', 'b'])
+    query.eq.assert_called_once_with('group_id', 'g1')
+
+
+def test_apply_filters_maps_operator_suffixes():
+    query = MagicMock()
+    for method in ('is_', 'in_', 'neq', 'gte', 'lt'):
+        getattr(query, method).return_value = query
+    query.not_ = query
+
+    BaseSupabaseClient._apply_filters(query, {
+        'paid_request__not': None,
+        'paid_confirmed': None,
+        'credit_score__gte': 650,
+        'created_at__lt': '2024-01-01',
+        'status__not': 'pending',
+        'userid__in': ['u1'],
+    })
+
+    assert query.is_.call_args_list[0].args == ('paid_request', None)
+    assert query.is_.call_args_list[1].args == ('paid_confirmed', None)
+    query.gte.assert_called_once_with('credit_score', 650)
+    query.lt.assert_called_once_with('created_at', '2024-01-01')
+    query.neq.assert_called_once_with('status', 'pending')
+    query.in_.assert_called_once_with('userid', ['u1'])
+    assert parse_filter_key('expense.created_by', 'u1') == ('expense.created_by', 'eq')
+
+
+def test_group_expenses_use_constant_number_of_queries(base_client):
+    expenses = ExpenseOperations(base_client).get_group_expenses('g1')
+
+    # One query each for expenses, splits and users, regardless of split count
+    assert base_client._execute_query.call_count == 3
+    assert [split['debtor']['name'] for split in expenses[0]['splits']] == ['Bob', 'Carol']
+    assert expenses[0]['splits'][1]['debtor']['payment_status'] == 'pending'
+    assert expenses[1]['splits'][0]['debtor']['payment_status'] == 'paid'
+
+
+def test_lent_expenses_skip_fully_paid_expenses(base_client):
+    expenses = ExpenseOperations(base_client).get_user_lent_expenses('u1')
+
+    assert [expense['id'] for expense in expenses] == ['e1']
+    assert base_client._execute_query.call_count == 3
+
+
+def test_owed_splits_include_lender_name(base_client):
+    splits = ExpenseOperations(base_client).get_user_owed_splits('u2')
+
+    assert [split['id'] for split in splits] == ['s1']
+    assert splits[0]['expense']['lender'] == {'name': 'Alice'}
+    assert base_client._execute_query.call_count == 3
+
+
+def test_owed_splits_select_only_the_columns_they_show(base_client):
+    ExpenseOperations(base_client).get_user_owed_splits('u2')
+
+    selects = [call.kwargs.get('select_statement') for call in base_client._execute_query.call_args_list]
+    assert selects[:2] == [projection('splits.payment'), projection('expenses.owed_context')]
+
+
+def test_group_expenses_with_embedded_selects_keep_enriched_shape(base_client):
+    base_client.embedded_selects = True
+    base_client._execute_query.side_effect = None
+    base_client._execute_query.return_value = [
+        {
+            'id': 'e1',
+            'title': 'Dinner',
+            'splits': [
+                {'id': 's1', 'amount_owed': 1500, 'paid_request': None, 'paid_confirmed': None, 'debtor': {'name': 'Bob'}},
+                {'id': 's2', 'amount_owed': 1500, 'paid_request': None, 'paid_confirmed': None, 'debtor': None},
+            ],
+        }
+    ]
+    operations = ExpenseOperations(base_client)
+
+    expenses = operations.get_group_expenses('g1')
+
+    base_client._execute_query.assert_called_once()
+    assert base_client._execute_query.call_args.kwargs['select_statement'] == operations.expense_with_splits_select
+    assert expenses[0]['splits'][0] == {
+        'id': 's1',
+        'amount_owed': 1500,
+        'paid_request': None,
+        'paid_confirmed': None,
+        'debtor': {'name': 'Bob', 'payment_status': None},
+    }
+    assert 'debtor' not in expenses[0]['splits'][1]
+
+
+def test_pending_payment_requests_only_include_requested_unconfirmed_splits(base_client):
+    pending = ExpenseOperations(base_client).get_pending_payment_requests('u1')
+
+    assert pending == [
+        {
+            'id': 's2',
+            'amount_owed': 1500,
+            'paid_request': '2024-01-01T00:00:00+00:00',
+            'debtor': {'name': 'Carol', 'id': 'u3'},
+            'expense': {'title': 'Dinner', 'id': 'e1'},
+        }
+    ]
+
+
+@pytest.mark.parametrize('splits, expected', [
+    (None, status.HTTP_201_CREATED),
+    ({'userEmail': 'bob@example.com'}, status.HTTP_400_BAD_REQUEST),
+    (['bob@example.com'], status.HTTP_400_BAD_REQUEST),
+])
+@patch('core.views.expenses.schedule_credit_score_updates')
+@patch('core.views.expenses.supabase')
+def test_create_expense_validates_splits(mock_supabase, _schedule, splits, expected):
+    mock_supabase.users.get_by_firebase_id.return_value = {'id': 'u1'}
+    mock_supabase.users.get_by_emails.return_value = {}
+    mock_supabase.expenses.create_expense.return_value = {'id': 'e1', 'title': 'Dinner'}
+    mock_supabase.expenses.create_splits.return_value = []
+    view = ExpensesView.as_view({'post': 'create_expense'})
+
+    response = view(APIRequestFactory().post('/api/expenses/create/', {
+        'title': 'Dinner', 'totalAmount': 3000, 'firebaseId': 'fb1', 'splits': splits,
+    }, format='json'))
+
+    assert response.status_code == expected
@@ -0,0 +1,126 @@
+from unittest.mock import patch
+import pytest
+from postgrest.exceptions import APIError
+from core.supabase.cache import TTLCache
+from core.supabase.instrumentation import collect_queries
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.user_operations import UserOperations
+
+
+@pytest.fixture
+def seeded(fake_client):
+    users = UserOperations(fake_client, cache=TTLCache())
+    alice = users.create("alice@example.com", "fb-alice")
+    bob = users.create("bob@example.com", "fb-bob")
+    expenses = ExpenseOperations(fake_client)
+    dinner = expenses.create_expense("Dinner", 3000, alice["id"])
+    expenses.create_split(dinner["id"], bob["id"], 1500)
+    return fake_client, alice, bob, dinner
+
+
+def test_schema_defaults_and_constraints(fake_client):
+    table = fake_client.get_table_name("users")
+    user = fake_client._execute_query(table, "insert", data={"email": "a@example.com", "firebase_id": "fb-a"})
+
+    assert user["id"] and user["date_joined"]
+    assert user["credit_score"] is None
+    # Unique email
+    assert fake_client._execute_query(table, "insert", data={"email": "a@example.com", "firebase_id": "fb-b"}) is None
+    with pytest.raises(APIError):
+        fake_client.client.table(table).insert({"email": "b@example.com"}).execute()
+
+
+def test_filters_use_indexes_and_order(seeded):
+    fake_client, alice, bob, dinner = seeded
+    table = fake_client.client.database.table(fake_client.get_table_name("splits"))
+
+    assert table.lookup("userid", [bob["id"]])
+    rows = (
+        fake_client.client.table(fake_client.get_table_name("users"))
+        .select("email").in_("id", [alice["id"], bob["id"]]).order("email", desc=True).limit(1).execute().data
+    )
+    assert rows == [{"email": "bob@example.com"}]
+
+
+def test_embedded_and_batched_reads_agree(seeded):
+    fake_client, alice, bob, dinner = seeded
+    batched = ExpenseOperations(fake_client).get_expense_with_splits(dinner["id"])
+
+    fake_client.embedded_selects = True
+    embedded = ExpenseOperations(fake_client).get_expense_with_splits(dinner["id"])
+
+    assert embedded == batched
+    assert embedded["splits"][0]["debtor"]["name"] is None
+
+
+def test_delete_cascades_to_referencing_rows(seeded):
+    fake_client, alice, bob, dinner = seeded
+
+    assert fake_client._execute_query(fake_client.get_table_name("expenses"), "delete", filters={"id": dinner["id"]})
+    assert fake_client._execute_query(fake_client.get_table_name("splits"), "select") == []
+
+
+def test_operator_suffix_filters(seeded):
+    fake_client, alice, bob, dinner = seeded
+    splits_table = fake_client.get_table_name("splits")
+    split = fake_client._execute_query(splits_table, "select", filters={"userid": bob["id"]})[0]
+
+    assert fake_client._execute_query(splits_table, "select", filters={"paid_request__not": None}) == []
+    assert fake_client._execute_query(splits_table, "select", filters={"paid_confirmed": None}) == [split]
+    assert fake_client._execute_query(splits_table, "select", filters={"amount_owed__gt": 1500}) == []
+    assert fake_client._execute_query(splits_table, "select", filters={"amount_owed__gte": 1500}) == [split]
+
+
+def test_dashboard_totals_function_matches_queries(seeded):
+    fake_client, alice, bob, dinner = seeded
+    expenses = ExpenseOperations(fake_client)
+    expenses.create_expense("Paid", 800, alice["id"])
+
+    assert expenses.get_user_dashboard_totals(alice["id"]) == expenses._query_dashboard_totals(alice["id"])
+    assert expenses.get_user_dashboard_summary(bob["id"]) == {
+        "lent": {"total_amount": 0}, "owed": {"total_amount": 1500}, "net": {"total_amount": -1500},
+    }
+
+
+def test_missing_function_is_called_once(fake_client, caplog):
+    missing = fake_client.get_table_name("missing_function")
+
+    with patch.object(fake_client.client, "rpc", wraps=fake_client.client.rpc) as rpc:
+        assert fake_client.rpc(missing) is None
+        assert fake_client.rpc(missing) is None
+
+    assert rpc.call_count == 1
+    assert [record.levelname for record in caplog.records if missing in record.getMessage()] == ["WARNING"]
+
+
+def test_bulk_split_creation(seeded):
+    fake_client, alice, bob, dinner = seeded
+    users = UserOperations(fake_client, cache=TTLCache())
+    carol = users.create("carol@example.com", "fb-carol")
+    expenses = ExpenseOperations(fake_client)
+    lunch = expenses.create_expense("Lunch", 900, alice["id"])
+
+    with collect_queries() as collector:
+        found = UserOperations(fake_client, cache=TTLCache()).get_by_emails(
+            ["bob@example.com", "carol@example.com", "nobody@example.com"]
+        )
+        splits = expenses.create_splits(lunch, [(found["bob@example.com"]["id"], 300), (carol["id"], -300)])
+
+    assert collector.count == 2
+    assert set(found) == {"bob@example.com", "carol@example.com"}
+    assert [(split["userid"], split["amount_owed"]) for split in splits] == [(bob["id"], 300), (carol["id"], 300)]
+    assert splits[0]["paid_confirmed"] is None and splits[1]["paid_confirmed"]
+
+
+def test_in_lookups_are_chunked(seeded):
+    fake_client, alice, bob, dinner = seeded
+    expenses = ExpenseOperations(fake_client)
+    expense_ids = [dinner["id"]] + [expenses.create_expense(f"Expense {n}", 100, alice["id"])["id"] for n in range(449)]
+
+    with collect_queries() as collector:
+        found = expenses.get_expenses_by_ids(expense_ids + expense_ids[:10])
+
+    assert len(found) == 450
+    assert collector.count == 3
+    with patch.object(fake_client, "_execute_query", side_effect=[[], None]):
+        assert fake_client.select_in(fake_client.get_table_name("expenses"), "id", expense_ids) is None
@@ -0,0 +1,63 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+from core.supabase import async_base_client
+from core.supabase.async_base_client import AsyncBaseSupabaseClient
+from core.supabase.base_client import BaseSupabaseClient
+from core.supabase.http_pool import HttpConnectionPool, http_pool
+
+
+def test_pool_limits_and_timeouts_come_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_HTTP_MAX_CONNECTIONS", "7")
+    monkeypatch.setenv("DB_HTTP_MAX_KEEPALIVE", "3")
+    monkeypatch.setenv("DB_HTTP_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_HTTP2", "false")
+
+    pool = HttpConnectionPool()
+
+    assert pool.limits.max_connections == 7
+    assert pool.limits.max_keepalive_connections == 3
+    assert pool.timeout.read == 2.5
+    assert pool.http2 is False
+
+
+def test_client_is_shared_until_closed():
+    pool = HttpConnectionPool()
+
+    client = pool.client()
+    assert pool.client() is client
+    assert pool.stats()['connections'] == 0
+
+    pool.close()
+    assert client.is_closed
+    assert pool.client() is not client
+    pool.close()
+
+
+def test_closing_one_client_keeps_the_shared_pool_open(monkeypatch):
+    monkeypatch.setenv("DB_URL", "https://example.supabase.co")
+    monkeypatch.setenv("DB_KEY", "key")
+    monkeypatch.setenv("DB_BACKEND", "supabase")
+    first, second = BaseSupabaseClient(), BaseSupabaseClient()
+    shared = http_pool.client()
+
+    first.close_connection()
+
+    assert not shared.is_closed
+    assert http_pool.client() is shared
+    assert second.client is not None
+
+
+def test_async_client_of_a_previous_loop_is_closed(monkeypatch):
+    monkeypatch.setenv("DB_URL", "https://example.supabase.co")
+    monkeypatch.setenv("DB_KEY", "key")
+    monkeypatch.setenv("DB_BACKEND", "supabase")
+    monkeypatch.setattr(async_base_client, "acreate_client", AsyncMock(side_effect=lambda *args, **kwargs: MagicMock()))
+    client = AsyncBaseSupabaseClient()
+
+    asyncio.run(client._get_client())
+    first = client._http_client
+    asyncio.run(client._get_client())
+
+    assert first.is_closed
+    assert not client._http_client.is_closed
+    asyncio.run(client._close_http_client())
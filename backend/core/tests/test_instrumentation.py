@@ -0,0 +1,60 @@
+import time
+import pytest
+from django.http import Http404, HttpResponse
+from django.test import RequestFactory, override_settings
+from core.middleware import QueryInstrumentationMiddleware
+from core.supabase.instrumentation import collect_queries, record_query
+from core.views.metrics import MetricsView
+
+
+def test_record_query_is_noop_outside_collector():
+    record_query('users', 'select', {'id': 'u1'}, [{'id': 'u1'}], time.perf_counter())
+
+
+def test_collector_groups_repeated_filter_shapes():
+    with collect_queries() as collector:
+        for user_id in ['u1', 'u2', 'u3']:
+            record_query('users', 'select', {'id': user_id}, [{'id': user_id}], time.perf_counter())
+        record_query('users', 'select', {'id': ['u1', 'u2']}, [], time.perf_counter())
+
+    assert collector.count == 4
+    assert collector.repeated_shapes(2) == [
+        {'table': 'users', 'operation': 'select', 'filter_keys': ['id'], 'count': 3}
+    ]
+    assert collector.summary()['by_table']['users']['rows'] == 3
+
+
+def test_middleware_sets_headers_and_warns_on_repeats(caplog):
+    def view(request):
+        for expense_id in range(4):
+            record_query('splits', 'select', {'expenseid': expense_id}, [], time.perf_counter())
+        return HttpResponse("ok")
+
+    middleware = QueryInstrumentationMiddleware(view)
+    middleware.threshold = 3
+
+    response = middleware(RequestFactory().get('/api/expenses/dashboard/'))
+
+    assert response['X-DB-Queries'] == '4'
+    assert float(response['X-DB-Time-ms']) >= 0
+    assert 'db_n_plus_one' in caplog.text
+
+
+@pytest.mark.parametrize("debug, token, authorization, expected_status", [
+    (True, None, None, 200),
+    (False, None, "Bearer secret", 404),
+    (False, "secret", None, 403),
+    (False, "secret", "Bearer wrong", 403),
+    (False, "secret", "Bearer secret", 200),
+])
+def test_metrics_need_a_token_outside_debug(debug, token, authorization, expected_status):
+    headers = {"HTTP_AUTHORIZATION": authorization} if authorization else {}
+    request = RequestFactory().get("/metrics", **headers)
+
+    with override_settings(DEBUG=debug, METRICS_TOKEN=token):
+        try:
+            status_code = MetricsView.as_view()(request).status_code
+        except Http404:
+            status_code = 404
+
+    assert status_code == expected_status
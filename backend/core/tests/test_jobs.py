@@ -0,0 +1,56 @@
+import threading
+from core.jobs import JobQueue
+
+
+def test_waiting_jobs_with_the_same_key_are_merged():
+    queue = JobQueue("test", workers=1)
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def blocker():
+        started.set()
+        release.wait(5)
+
+    queue.submit("blocker", blocker)
+    assert started.wait(5)
+    assert queue.submit("user-1", lambda: runs.append("first"))
+    assert not queue.submit("user-1", lambda: runs.append("second"))
+    assert queue.stats()["depth"] == 1
+
+    release.set()
+    assert queue.wait_idle(5)
+    queue.shutdown(5)
+
+    stats = queue.stats()
+    assert runs == ["second"]
+    assert (stats["submitted"], stats["merged"], stats["completed"], stats["depth"]) == (3, 1, 2, 0)
+    assert stats["max_lag_ms"] > 0
+
+
+def test_jobs_with_the_same_key_do_not_overlap():
+    queue = JobQueue("test", workers=2)
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def first():
+        started.set()
+        release.wait(5)
+        runs.append("first")
+
+    queue.submit("user-1", first)
+    assert started.wait(5)
+    # Submitted while the first job runs, so it is queued behind it instead of merged
+    assert queue.submit("user-1", lambda: runs.append("second"))
+    release.set()
+    assert queue.wait_idle(5)
+    queue.shutdown(5)
+
+    assert runs == ["first", "second"]
+
+
+def test_inline_queue_counts_failures():
+    queue = JobQueue("test", workers=0)
+
+    queue.submit("user-1", lambda: 1 / 0)
+
+    assert queue.stats()["failed"] == 1 and queue.stats()["depth"] == 0
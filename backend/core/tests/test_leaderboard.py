@@ -0,0 +1,70 @@
+import pytest
+from core.supabase.instrumentation import collect_queries
+from core.supabase.leaderboard import CreditScoreLeaderboard
+from core.supabase.operations.credit_score_operations import CreditScoreOperations, credit_score_stats_cache
+
+
+def test_rank_top_and_histogram():
+    leaderboard = CreditScoreLeaderboard(ttl=60)
+    leaderboard.load([
+        {"id": "a", "name": "A", "credit_score": 700},
+        {"id": "b", "name": "B", "credit_score": 820},
+        {"id": "c", "name": "C", "credit_score": 700},
+        {"id": "d", "name": "D", "credit_score": None},
+        {"id": "e", "name": "E", "credit_score": 850},
+    ])
+
+    assert [user["id"] for user in leaderboard.top(3)] == ["e", "b", "a"]
+    assert [leaderboard.rank(user_id) for user_id in "abcde"] == [3, 2, 3, None, 1]
+    assert leaderboard.histogram([550, 650, 750]) == [0, 0, 2, 2]
+    assert leaderboard.count_between(700, 851) == 4
+
+    leaderboard.record({"id": "a", "name": "A", "credit_score": 540})
+    leaderboard.record({"id": "d", "name": "D", "credit_score": 860})
+    assert leaderboard.rank("d") == 1 and leaderboard.rank("a") == 5
+    assert leaderboard.histogram([550, 650, 750]) == [1, 0, 1, 3]
+    assert leaderboard.stats()["average_score"] == round((540 + 820 + 700 + 860 + 850) / 5, 2)
+
+
+@pytest.fixture
+def operations(fake_client):
+    users_table = fake_client.get_table_name("users")
+    for index, score in enumerate([640, None, 760, 700, 520]):
+        fake_client._execute_query(
+            users_table, "insert", data={"email": f"{index}@example.com", "firebase_id": f"fb-{index}", "credit_score": score}
+        )
+    operations = CreditScoreOperations(fake_client)
+    operations.leaderboard = CreditScoreLeaderboard(ttl=60)
+    return operations
+
+
+def test_leaderboard_queries_do_not_scan_users(operations):
+    alice = operations.get_leaderboard(1)[0]
+    # Alice has no splits, so her score is written as NULL and applied to the leaderboard
+    operations.update_user_credit_score(alice["user_id"])
+    with collect_queries() as collector:
+        leaders = operations.get_leaderboard(5)
+        rank = operations.get_user_rank(leaders[-1]["user_id"])
+
+    assert collector.count == 0
+    assert [leader["credit_score"] for leader in leaders] == [700, 640, 520]
+    assert rank["rank"] == 3 and rank["ranked_users"] == 3
+
+
+def test_stats_are_aggregated_in_one_call_and_cached(operations):
+    with collect_queries() as collector:
+        stats = operations.get_credit_score_stats()
+        assert operations.get_credit_score_stats() is stats
+
+    assert collector.count == 1
+    assert (stats["total_users"], stats["users_without_scores"], stats["average_score"]) == (5, 1, 655.0)
+    assert stats["score_ranges"] == {"excellent": 1, "good": 1, "fair": 1, "poor": 1}
+
+    custom = operations.get_credit_score_stats([600, 700])
+    assert [bucket["count"] for bucket in custom["histogram"]] == [1, 1, 2]
+    assert custom["histogram"][1] == {"min": 600, "max": 700, "count": 1} and "score_ranges" not in custom
+
+    # Without the database function the leaderboard gives the same numbers
+    credit_score_stats_cache.clear()
+    operations.stats_function = "missing_function"
+    assert operations.get_credit_score_stats() == stats
@@ -0,0 +1,68 @@
+import pytest
+from functools import partial
+from unittest.mock import MagicMock
+from core.supabase.base_client import BaseSupabaseClient
+from core.supabase.loaders import UserLoader, request_scope
+
+
+USERS = [
+    {'id': 'u1', 'email': 'alice@example.com', 'firebase_id': 'fb1', 'name': 'Alice'},
+    {'id': 'u2', 'email': 'bob@example.com', 'firebase_id': 'fb2', 'name': 'Bob'},
+]
+
+
+@pytest.fixture
+def base_client():
+    client = MagicMock()
+    client.get_table_name.side_effect = lambda name: name
+
+    def execute_query(table_name, operation, data=None, filters=None, limit=None, select_statement="*"):
+        (column, value), = filters.items()
+        values = value if isinstance(value, list) else [value]
+        return [user for user in USERS if user[column] in values]
+
+    client._execute_query.side_effect = execute_query
+    client.select_in.side_effect = partial(BaseSupabaseClient.select_in, client)
+    return client
+
+
+def test_load_many_batches_lookups_into_one_query(base_client):
+    users = UserLoader(base_client).load_many(['u1', 'u2', 'u1'])
+
+    assert set(users) == {'u1', 'u2'}
+    base_client._execute_query.assert_called_once()
+    assert base_client._execute_query.call_args.kwargs['filters'] == {'id': ['u1', 'u2']}
+
+
+def test_repeated_lookups_are_free_within_a_request(base_client):
+    loader = UserLoader(base_client)
+
+    with request_scope():
+        assert loader.load('fb1', column='firebase_id')['id'] == 'u1'
+        # Same row by another key, and a known-missing user, cost no queries
+        assert loader.load('u1')['name'] == 'Alice'
+        assert loader.load('missing') is None
+        assert loader.load('missing') is None
+        assert loader.load_many(['u1', 'u2']).keys() == {'u1', 'u2'}
+
+    assert base_client._execute_query.call_count == 3
+
+
+def test_lookups_are_not_memoized_outside_a_request(base_client):
+    loader = UserLoader(base_client)
+
+    loader.load('u1')
+    loader.load('u1')
+
+    assert base_client._execute_query.call_count == 2
+
+
+def test_forget_drops_all_keys_of_a_row(base_client):
+    loader = UserLoader(base_client)
+
+    with request_scope():
+        loader.load('u1')
+        loader.forget('fb1', column='firebase_id')
+        loader.load('alice@example.com', column='email')
+
+    assert base_client._execute_query.call_count == 2
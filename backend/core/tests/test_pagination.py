@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+from core.supabase.cache import TTLCache
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.friend_request_operations import FriendRequestOperations
+from core.supabase.operations.user_operations import UserOperations
+from core.supabase.pagination import (
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    parse_page_params,
+    with_keyset,
+)
+
+
+@pytest.fixture
+def group_expenses(fake_client):
+    """Seven expenses in one group, two of them created at the same moment."""
+    users = UserOperations(fake_client, cache=TTLCache())
+    alice = users.create("alice@example.com", "fb-alice")
+    bob = users.create("bob@example.com", "fb-bob")
+    group = fake_client._execute_query(
+        fake_client.get_table_name("groups"), "insert", data={"name": "Trip", "created_by": alice["id"]}
+    )
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    expenses_table = fake_client.get_table_name("expenses")
+    expenses = []
+    for index, offset in enumerate([0, 1, 2, 3, 3, 4, 5]):
+        expense = fake_client._execute_query(expenses_table, "insert", data={
+            "title": f"Expense {index}",
+            "total_amount": 1000,
+            "created_by": alice["id"],
+            "group_id": group["id"],
+            "created_at": (start + timedelta(days=offset)).isoformat(),
+        })
+        ExpenseOperations(fake_client).create_split(expense["id"], bob["id"], 500)
+        expenses.append(expense)
+    return fake_client, alice, bob, group, expenses
+
+
+def test_cursor_round_trip_and_validation():
+    cursor = encode_cursor(["2024-01-01T00:00:00+00:00", "abc"])
+
+    assert decode_cursor(cursor) == ("2024-01-01T00:00:00+00:00", "abc")
+    for invalid in ("not-a-cursor!", encode_cursor(["only-one"]), encode_cursor([None, "abc"])):
+        with pytest.raises(ValueError):
+            decode_cursor(invalid)
+
+
+def test_with_keyset_adds_missing_columns():
+    assert with_keyset("id, amount_owed") == "id, amount_owed, created_at"
+    assert with_keyset("*") == "*"
+
+
+def test_parse_page_params():
+    assert parse_page_params({}) == (None, None)
+    assert parse_page_params({"limit": "500"}) == (MAX_PAGE_SIZE, None)
+    for invalid in ({"limit": "0"}, {"limit": "ten"}, {"limit": 5, "cursor": "junk"}):
+        with pytest.raises(ValueError):
+            parse_page_params(invalid)
+
+
+def test_order_offset_and_keyset_filters(group_expenses):
+    fake_client, alice, bob, group, expenses = group_expenses
+    table = fake_client.get_table_name("expenses")
+    order_by = {"created_at": "desc", "id": "desc"}
+
+    ordered = fake_client._execute_query(table, "select", order_by=order_by)
+    assert [expense["created_at"] for expense in ordered] == sorted(
+        (expense["created_at"] for expense in expenses), reverse=True
+    )
+    assert fake_client._execute_query(table, "select", order_by=order_by, offset=2, limit=2) == ordered[2:4]
+
+    # The two expenses created at the same moment are split by the id tiebreaker
+    tied = ordered[2]
+    after = fake_client._execute_query(
+        table, "select", order_by=order_by, after=(("created_at", "id"), (tied["created_at"], tied["id"]))
+    )
+    assert after == ordered[3:]
+
+
+def test_group_expense_pages_cover_every_expense_once(group_expenses):
+    fake_client, alice, bob, group, expenses = group_expenses
+    operations = ExpenseOperations(fake_client)
+
+    seen, cursor, pages = [], None, 0
+    while True:
+        page, cursor = operations.get_group_expenses_page(group["id"], 3, cursor)
+        seen += [expense["id"] for expense in page]
+        pages += 1
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert sorted(seen) == sorted(expense["id"] for expense in expenses)
+    assert len(seen) == len(set(seen))
+
+
+def test_dashboard_page_keeps_full_totals(group_expenses):
+    fake_client, alice, bob, group, expenses = group_expenses
+    operations = ExpenseOperations(fake_client)
+    full = operations.get_user_dashboard_data(alice["id"])
+
+    page = operations.get_user_dashboard_page(alice["id"], 2)
+
+    assert len(page["lent"]["expenses"]) == 2
+    assert page["lent"]["next_cursor"]
+    assert page["lent"]["total_amount"] == full["lent"]["total_amount"]
+    assert page["net"] == full["net"]
+
+
+def test_friend_pages_merge_both_directions(fake_client):
+    operations = FriendRequestOperations(fake_client)
+    for index in range(3):
+        operations.create("me@example.com", f"friend{index}@example.com")
+        operations.create(f"other{index}@example.com", "me@example.com")
+    fake_client._execute_query(
+        operations.table_name, "update", data={"request_completed": True}, filters={"to_user": "me@example.com"}
+    )
+    fake_client._execute_query(
+        operations.table_name, "update", data={"request_completed": True}, filters={"from_user": "me@example.com"}
+    )
+
+    first, cursor = operations.get_friends_page("me@example.com", 4)
+    second, end = operations.get_friends_page("me@example.com", 4, cursor)
+
+    assert len(first) == 4 and len(second) == 2 and end is None
+    assert {row["id"] for row in first + second} == {row["id"] for row in operations.get_friends("me@example.com")}
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+import pytest
+from core.supabase.base_client import BaseSupabaseClient
+from core.supabase.filters import Condition
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.postgres import PostgresClient
+from core.supabase.postgres.client import condition_sql, select_columns
+
+
+@pytest.fixture
+def client():
+    engine = MagicMock()
+    engine.fetch_value.return_value = [{"id": "e1"}]
+    return PostgresClient(engine)
+
+
+def test_select_compiles_filters_order_and_paging(client):
+    builder = (
+        client.table("development_expenses").select("id, name:title")
+        .eq("created_by", "u1").not_.is_("paid_request", None).in_("id", ["a", "b"])
+        .or_('created_at.lt."2024-01-01",and(created_at.eq."2024-01-01",id.lt.x)')
+        .order("created_at", desc=True).order("id", desc=True, nullsfirst=False)
+        .limit(10).offset(20)
+    )
+
+    statement, params = builder.to_sql()
+
+    assert statement == (
+        "SELECT coalesce(json_agg(t), '[]'::json) FROM ("
+        'SELECT "id", "title" AS "name" FROM "development_expenses" '
+        'WHERE "created_by" = %s AND NOT ("paid_request" IS NULL) AND "id" IN %s '
+        'AND ("created_at" < %s OR ("created_at" = %s AND "id" < %s)) '
+        'ORDER BY "created_at" DESC, "id" DESC NULLS LAST LIMIT %s OFFSET %s) t'
+    )
+    assert params == ["u1", ("a", "b"), "2024-01-01", "2024-01-01", "x", 10, 20]
+    assert builder.execute().data == [{"id": "e1"}]
+
+
+def test_writes_return_affected_rows(client):
+    insert, insert_params = client.table("splits").insert([{"a": 1}, {"b": {"k": 2}}]).to_sql()
+    update, update_params = client.table("splits").update({"paid_request": "now"}).eq("id", "s1").to_sql()
+    delete, delete_params = client.table("splits").delete().eq("id", "s1").to_sql()
+
+    assert insert.startswith('WITH t AS (INSERT INTO "splits" ("a", "b") VALUES (%s, %s), (%s, %s) RETURNING *)')
+    assert insert_params[:3] == [1, None, None] and insert_params[3].adapted == {"k": 2}
+    assert update.startswith('WITH t AS (UPDATE "splits" SET "paid_request" = %s WHERE "id" = %s RETURNING *)')
+    assert update_params == ["now", "s1"]
+    assert delete.startswith('WITH t AS (DELETE FROM "splits" WHERE "id" = %s RETURNING *)')
+    assert delete_params == ["s1"]
+
+
+def test_condition_sql_edge_cases():
+    params = []
+
+    assert condition_sql(Condition("id", "in", [], negate=True), params) == "NOT (FALSE)"
+    assert condition_sql(Condition("title", "ilike", "*trip*"), params) == '"title" ILIKE %s'
+    assert params == ["%trip%"]
+    with pytest.raises(ValueError):
+        select_columns("*, splits(id)")
+
+
+def test_postgres_backend_uses_sql_joins(monkeypatch):
+    monkeypatch.setenv("DB_BACKEND", "postgres")
+    base_client = BaseSupabaseClient()
+    base_client.engine = MagicMock()
+    base_client.client = PostgresClient(base_client.engine)
+    base_client.engine.fetch_value.return_value = {
+        "lent": [{"id": "e1", "total_amount": 3000, "splits": [{"amount_owed": 1500, "paid_confirmed": None}]}],
+        "owed": [{"id": "s2", "amount_owed": 500}],
+    }
+    operations = ExpenseOperations(base_client)
+
+    dashboard = operations.get_user_dashboard_data("u1")
+
+    assert base_client.embedded_selects is False
+    assert base_client.engine.fetch_value.call_count == 1
+    statement, params = base_client.engine.fetch_value.call_args.args
+    assert "jsonb_build_object('lent'" in statement and params == {"user_id": "u1"}
+    assert dashboard["lent"]["expenses"][0]["id"] == "e1"
+    assert dashboard["owed"]["splits"][0]["id"] == "s2"
+
+    base_client.engine.fetch_value.side_effect = RuntimeError("connection lost")
+    assert operations.get_group_expenses("g1") is None
+
+
+def test_closing_one_client_keeps_the_shared_engine_open(monkeypatch):
+    monkeypatch.setenv("DB_BACKEND", "postgres")
+    base_client = BaseSupabaseClient()
+    base_client.engine = MagicMock()
+
+    base_client.close_connection()
+
+    base_client.engine.close.assert_not_called()
+
+
+def test_rpc_passes_arguments_by_name(client):
+    client.engine.fetch_value.return_value = {"lent": 10, "owed": 4, "net": 6}
+    call = client.rpc("development_get_user_dashboard_totals", {"p_user_id": "u1"})
+
+    assert call.to_sql() == (
+        'SELECT to_json("development_get_user_dashboard_totals"("p_user_id" => %(p_user_id)s))', {"p_user_id": "u1"}
+    )
+    assert call.execute().data == {"lent": 10, "owed": 4, "net": 6}
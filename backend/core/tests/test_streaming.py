@@ -0,0 +1,66 @@
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+import pytest
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+from core.supabase.cache import TTLCache
+from core.supabase.operations.expense_operations import ExpenseOperations
+from core.supabase.operations.user_operations import UserOperations
+from core.supabase.pagination import PageReadError, iterate_pages
+from core.views.expenses import ExpensesView
+from core.views.streaming import iter_json
+
+
+def test_iter_json_matches_the_whole_document():
+    rows = [{"id": index, "title": "Dinner  ", "amount": None} for index in range(50)]
+
+    chunks = list(iter_json({"expenses": iter(rows), "empty": iter(()), "next_cursor": None}, chunk_bytes=256))
+
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == {"expenses": rows, "empty": [], "next_cursor": None}
+
+
+def test_iterate_pages_reads_pages_as_rows_are_consumed():
+    pages = {None: ([1, 2], "a"), "a": ([3, 4], "b"), "b": None}
+    fetch = MagicMock(side_effect=lambda limit, cursor: pages[cursor])
+
+    rows = iterate_pages(fetch, 2)
+    assert fetch.call_count == 1
+    assert [next(rows), next(rows), next(rows)] == [1, 2, 3]
+    assert fetch.call_count == 2
+    with pytest.raises(PageReadError):
+        list(rows)
+    assert iterate_pages(lambda limit, cursor: None, 2) is None
+
+
+@override_settings(STREAM_LIST_RESPONSES=True, STREAMING_PAGE_SIZE=2)
+@patch('core.views.expenses.supabase')
+def test_group_expenses_are_streamed_from_pages(mock_supabase, fake_client):
+    users = UserOperations(fake_client, cache=TTLCache())
+    alice = users.create("alice@example.com", "fb-alice")
+    bob = users.create("bob@example.com", "fb-bob")
+    operations = ExpenseOperations(fake_client)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for day in range(5):
+        expense = fake_client._execute_query(fake_client.get_table_name("expenses"), "insert", data={
+            "title": f"Expense {day}",
+            "total_amount": 1000,
+            "created_by": alice["id"],
+            "group_id": "g1",
+            "created_at": (start + timedelta(days=day)).isoformat(),
+        })
+        operations.create_split(expense["id"], bob["id"], 500)
+    mock_supabase.groups.get_group_version.return_value = None
+    mock_supabase.expenses.get_group_expenses_page.side_effect = operations.get_group_expenses_page
+
+    view = ExpensesView.as_view({'post': 'get_group_expenses'})
+    response = view(APIRequestFactory().post('/api/expenses/group-expenses/', {'groupId': 'g1'}, format='json'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    expenses = json.loads(b"".join(response.streaming_content))["expenses"]
+    assert [expense["title"] for expense in expenses] == [f"Expense {day}" for day in range(4, -1, -1)]
+    assert all(expense["splits"][0]["amount_owed"] == 500 for expense in expenses)
+    assert mock_supabase.expenses.get_group_expenses_page.call_count == 3
@@ -0,0 +1,89 @@
+import pytest
+from functools import partial
+from unittest.mock import MagicMock
+from core.supabase.base_client import BaseSupabaseClient
+from core.supabase.cache import TTLCache
+from core.supabase.operations.user_operations import UserOperations
+from core.supabase.versions import VersionTokens
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_cache_expires_entries():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.set('key', 'value')
+
+    assert cache.get('key') == 'value'
+    clock.now = 6
+    assert cache.get('key') is None
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 1
+    assert cache.stats()['evictions'] == 1
+
+
+@pytest.fixture
+def base_client():
+    client = MagicMock()
+    client.get_table_name.side_effect = lambda name: name
+    row = {'id': 'u1', 'email': 'alice@example.com', 'firebase_id': 'fb1', 'name': 'Alice'}
+
+    def execute_query(table_name, operation, data=None, filters=None, limit=None, select_statement="*"):
+        if operation == 'update':
+            row.update(data)
+            return dict(row)
+        return [dict(row)]
+
+    client._execute_query.side_effect = execute_query
+    client.select_in.side_effect = partial(BaseSupabaseClient.select_in, client)
+    return client
+
+
+def test_user_lookups_hit_cache_under_every_key(base_client):
+    users = UserOperations(base_client, cache=TTLCache())
+
+    assert users.get_by_firebase_id('fb1')['id'] == 'u1'
+    assert users.get_by_id('u1')['email'] == 'alice@example.com'
+    assert users.get_by_email('alice@example.com')['name'] == 'Alice'
+
+    base_client._execute_query.assert_called_once()
+    assert users.cache_stats()['hits'] == 2
+
+
+def test_update_name_refreshes_cached_user(base_client):
+    # Without version tokens to replace, the update is the only extra query
+    users = UserOperations(base_client, cache=TTLCache(), versions=VersionTokens(timeout=0))
+    users.get_by_id('u1')
+
+    users.update_name('fb1', 'Alicia')
+
+    assert users.get_by_id('u1')['name'] == 'Alicia'
+    assert users.get_by_email('alice@example.com')['name'] == 'Alicia'
+    assert base_client._execute_query.call_count == 2
+
+
+def test_invalidate_removes_user_under_every_key(base_client):
+    users = UserOperations(base_client, cache=TTLCache())
+    users.get_by_id('u1')
+
+    users.invalidate('u1')
+    users.get_by_firebase_id('fb1')
+
+    assert base_client._execute_query.call_count == 2
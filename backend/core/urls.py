@@ -10,6 +10,8 @@ from core.views.groups import GroupsView
 from core.views.expenses import ExpensesView
 from core.views.notifications import NotificationsView
 from core.views.credit_score import CreditScoreView
+from core.views.metrics import MetricsView
+from core.views.async_views import AsyncDashboardView, AsyncGroupExpensesView, AsyncUserGroupsView
 
 # Create a router and register our viewsets with it
 router = DefaultRouter()
@@ -25,5 +27,9 @@ router.register("credit-score", CreditScoreView, basename="credit-score")
 urlpatterns = [
     path("", HelloWorldView.as_view(), name="hello_world"),
     path("check-db", DatabaseCheckView.as_view(), name="check_db"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
+    path("api/async/expenses/dashboard/", AsyncDashboardView.as_view(), name="async_dashboard"),
+    path("api/async/expenses/group-expenses/", AsyncGroupExpensesView.as_view(), name="async_group_expenses"),
+    path("api/async/groups/user-groups/", AsyncUserGroupsView.as_view(), name="async_user_groups"),
     path("api/", include(router.urls)),
 ]
@@ -0,0 +1,87 @@
+"""
+Async views for the hottest read endpoints, served natively when running under ASGI.
+
+DRF ViewSets are sync-only, so these are plain Django async views that accept the
+same request bodies and return the same payloads as their ExpensesView/GroupsView
+counterparts.
+"""
+
+import json
+from django.http import JsonResponse
+from django.views import View
+from core.supabase.async_client import async_supabase
+from core.views.groups import format_group
+
+
+def _request_data(request):
+    """Parse the JSON body of a request, returning None if it is not a JSON object."""
+    try:
+        data = json.loads(request.body or b"{}")
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+class AsyncDashboardView(View):
+    """Async view for a user's dashboard data."""
+
+    async def post(self, request):
+        """Get dashboard data for a user including lent and owed amounts."""
+        data = _request_data(request)
+        if data is None:
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        firebase_id = data.get("firebaseId")
+        if not firebase_id:
+            return JsonResponse({"error": "firebaseId is required"}, status=400)
+
+        user = await async_supabase.users.get_by_firebase_id(firebase_id)
+        if not user:
+            return JsonResponse({"error": "User not found"}, status=404)
+
+        dashboard_data = await async_supabase.expenses.get_user_dashboard_data(user.get("id"))
+        if dashboard_data is None:
+            return JsonResponse({"error": "Failed to retrieve dashboard data"}, status=500)
+        return JsonResponse(dashboard_data)
+
+
+class AsyncGroupExpensesView(View):
+    """Async view for the expenses of a group."""
+
+    async def post(self, request):
+        """Get all expenses for a specific group."""
+        data = _request_data(request)
+        if data is None:
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        group_id = data.get("groupId")
+        if not group_id:
+            return JsonResponse({"error": "groupId is required"}, status=400)
+
+        expenses = await async_supabase.expenses.get_group_expenses(group_id)
+        return JsonResponse({"expenses": expenses})
+
+
+class AsyncUserGroupsView(View):
+    """Async view for the groups of a user, with their members."""
+
+    async def post(self, request):
+        """Get all groups for a user."""
+        data = _request_data(request)
+        if data is None:
+            return JsonResponse({"error": "Invalid JSON body"}, status=400)
+
+        firebase_id = data.get("firebaseId")
+        if not firebase_id:
+            return JsonResponse({"error": "firebaseId is required"}, status=400)
+
+        user = await async_supabase.users.get_by_firebase_id(firebase_id)
+        if not user:
+            return JsonResponse({"error": "User not found"}, status=404)
+
+        groups = await async_supabase.groups.get_user_groups_with_members(user.get("id"))
+        if groups is None:
+            return JsonResponse({"error": "Failed to retrieve groups"}, status=500)
+
+        formatted_groups = [format_group(group, group.get("members")) for group in groups]
+        return JsonResponse(formatted_groups, safe=False)
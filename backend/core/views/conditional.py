@@ -0,0 +1,58 @@
+"""Conditional reads: ETag and If-None-Match on endpoints the app polls."""
+
+import hashlib
+import json
+from typing import Callable, Iterable, Optional
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def request_etag(request, versions: Iterable[Optional[str]]) -> Optional[str]:
+    """
+    An ETag for a read, from the version tokens of the resources it returns and the
+    request itself (path, query string and body, which hold the user and paging
+    parameters). None if a version is unknown.
+    """
+    versions = list(versions)
+    if not versions or any(version is None for version in versions):
+        return None
+    digest = hashlib.sha1()
+    digest.update(request.method.encode())
+    digest.update(request.get_full_path().encode())
+    digest.update(json.dumps(request.data, sort_keys=True, default=str).encode())
+    for version in versions:
+        digest.update(b"\0" + version.encode())
+    # Weak, since the token stands for the data rather than the exact bytes sent
+    return "W/" + quote_etag(digest.hexdigest())
+
+
+def conditional_response(request, versions: Iterable[Optional[str]], build: Callable[[], Response]) -> Response:
+    """
+    Answer 304 Not Modified without calling build() when the client's If-None-Match
+    holds the current ETag; otherwise build the response and send the ETag with it
+    if it succeeded.
+
+    Also used for the POST endpoints that only read, since the app polls them;
+    their ETag covers the request body. The version tokens come from the shared
+    Django cache, so without one (CACHE_SHARED) no ETag is sent and every
+    request is answered in full.
+    """
+    etag = request_etag(request, versions)
+    if etag is not None:
+        client_etags = parse_etags(request.headers.get("If-None-Match", ""))
+        # Weak comparison, as for GET
+        if "*" in client_etags or etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in client_etags):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=_validator_headers(etag))
+
+    response = build()
+    if etag is not None and response.status_code == status.HTTP_200_OK:
+        for header, value in _validator_headers(etag).items():
+            response[header] = value
+    return response
+
+
+def _validator_headers(etag: str) -> dict:
+    # Clients may keep the body but must check with the server before reusing it
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
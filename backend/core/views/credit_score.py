@@ -2,7 +2,10 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
-from core.supabase.operations.credit_score_operations import CreditScoreOperations
+from core.supabase.operations.credit_score_operations import CreditScoreOperations, SCORE_RANGE_EDGES
+
+# Most histogram buckets a stats request can ask for, bounding the cache and the query
+MAX_SCORE_EDGES = 20
 
 
 class CreditScoreView(viewsets.ViewSet):
@@ -10,7 +13,7 @@ class CreditScoreView(viewsets.ViewSet):
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.credit_score_ops = CreditScoreOperations(supabase)
+        self.credit_score_ops = CreditScoreOperations(supabase.base_client)
 
     @action(detail=False, methods=["get"], url_path="user/(?P<user_id>[^/.]+)")
     def get_user_credit_score(self, request, user_id=None):
@@ -66,79 +69,58 @@ class CreditScoreView(viewsets.ViewSet):
         except ValueError:
             limit = 10
         
-        # Get users with credit scores, ordered by score descending
-        users = supabase._execute_query(
-            table_name=supabase.get_table_name("users"),
-            operation='select',
-            filters={'credit_score__not': None},
-            order_by={'credit_score': 'desc'},
-            limit=limit
-        ) or []
+        leaderboard = self.credit_score_ops.get_leaderboard(limit)
         
-        leaderboard = []
-        for i, user in enumerate(users, 1):
-            leaderboard.append({
-                'rank': i,
-                'user_id': user.get('id'),
-                'name': user.get('name', 'Unknown'),
-                'email': user.get('email'),
-                'credit_score': user.get('credit_score')
-            })
+        if leaderboard is None:
+            return Response(
+                {"error": "Failed to load leaderboard"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
         
         return Response({
             'leaderboard': leaderboard,
             'total_users': len(leaderboard)
         }, status=status.HTTP_200_OK)
 
-    @action(detail=False, methods=["get"], url_path="stats")
-    def get_credit_score_stats(self, request):
-        """Get credit score statistics."""
-        # Get all users with credit scores
-        users_with_scores = supabase._execute_query(
-            table_name=supabase.get_table_name("users"),
-            operation='select',
-            filters={'credit_score__not': None}
-        ) or []
+    @action(detail=False, methods=["get"], url_path="leaderboard/rank/(?P<user_id>[^/.]+)")
+    def get_user_rank(self, request, user_id=None):
+        """Get a user's rank on the credit score leaderboard."""
+        result = self.credit_score_ops.get_user_rank(user_id)
         
-        # Get all users
-        all_users = supabase._execute_query(
-            table_name=supabase.get_table_name("users"),
-            operation='select'
-        ) or []
+        if result is None:
+            return Response(
+                {"error": "User has no credit score"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
         
-        if not users_with_scores:
-            return Response({
-                'total_users': len(all_users),
-                'users_with_scores': 0,
-                'users_without_scores': len(all_users),
-                'average_score': None,
-                'score_ranges': {
-                    'excellent': 0,
-                    'good': 0,
-                    'fair': 0,
-                    'poor': 0
-                }
-            }, status=status.HTTP_200_OK)
+        return Response(result, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=["get"], url_path="stats")
+    def get_credit_score_stats(self, request):
+        """
+        Get credit score statistics.
+
+        Optional ``edges`` query parameter: comma-separated ascending scores to
+        bucket the histogram by (default 550,650,750).
+        """
+        edges = SCORE_RANGE_EDGES
+        if request.query_params.get('edges'):
+            try:
+                edges = tuple(int(edge) for edge in request.query_params['edges'].split(','))
+            except ValueError:
+                edges = ()
+            if not edges or len(edges) > MAX_SCORE_EDGES or list(edges) != sorted(set(edges)):
+                return Response(
+                    {"error": f"edges must be 1 to {MAX_SCORE_EDGES} comma-separated ascending integers"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
         
-        # Calculate statistics
-        scores = [user.get('credit_score') for user in users_with_scores]
-        average_score = sum(scores) / len(scores)
+        stats = self.credit_score_ops.get_credit_score_stats(edges)
         
-        # Categorize scores
-        excellent = len([s for s in scores if s >= 750])
-        good = len([s for s in scores if 650 <= s < 750])
-        fair = len([s for s in scores if 550 <= s < 650])
-        poor = len([s for s in scores if s < 550])
+        if stats is None:
+            return Response(
+                {"error": "Failed to load credit score statistics"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
         
-        return Response({
-            'total_users': len(all_users),
-            'users_with_scores': len(users_with_scores),
-            'users_without_scores': len(all_users) - len(users_with_scores),
-            'average_score': round(average_score, 2),
-            'score_ranges': {
-                'excellent': excellent,
-                'good': good,
-                'fair': fair,
-                'poor': poor
-            }
-        }, status=status.HTTP_200_OK) 
\ No newline at end of file
+        return Response(stats, status=status.HTTP_200_OK)
@@ -4,6 +4,7 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
+from core.views.conditional import conditional_response
 
 
 class DashboardView(viewsets.ViewSet):
@@ -19,15 +20,18 @@ class DashboardView(viewsets.ViewSet):
                 {"error": "user_id is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        dashboard_data = supabase.expenses.get_user_dashboard_data(user_id)
-        
-        if dashboard_data is None:
-            return Response(
-                {"error": "Failed to retrieve dashboard data"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            
-        return Response(dashboard_data)
+        def build():
+            dashboard_data = supabase.expenses.get_user_dashboard_data(user_id)
+
+            if dashboard_data is None:
+                return Response(
+                    {"error": "Failed to retrieve dashboard data"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            return Response(dashboard_data)
+
+        return conditional_response(request, [supabase.expenses.get_user_dashboard_version(user_id)], build)
 
     @action(detail=False, methods=["get"], url_path="lent")
     def get_lent_expenses(self, request):
@@ -39,15 +43,18 @@ class DashboardView(viewsets.ViewSet):
                 {"error": "user_id is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        lent_expenses = supabase.expenses.get_user_lent_expenses(user_id)
-        
-        if lent_expenses is None:
-            return Response(
-                {"error": "Failed to retrieve lent expenses"}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            
-        return Response({"lent_expenses": lent_expenses})
+        def build():
+            lent_expenses = supabase.expenses.get_user_lent_expenses(user_id)
+
+            if lent_expenses is None:
+                return Response(
+                    {"error": "Failed to retrieve lent expenses"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            return Response({"lent_expenses": lent_expenses})
+
+        return conditional_response(request, [supabase.expenses.get_user_dashboard_version(user_id)], build)
 
     @action(detail=False, methods=["get"], url_path="owed")
     def get_owed_splits(self, request):
@@ -59,6 +66,16 @@ class DashboardView(viewsets.ViewSet):
                 {"error": "user_id is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        owed_splits = supabase.expenses.get_user_owed_splits(user_id)
-        
-        return Response({"owed_splits": owed_splits}) 
\ No newline at end of file
+        def build():
+            owed_splits = supabase.expenses.get_user_owed_splits(user_id)
+
+            if owed_splits is None:
+                return Response(
+                    {"error": "Failed to retrieve owed splits"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                )
+
+            return Response({"owed_splits": owed_splits})
+
+        return conditional_response(request, [supabase.expenses.get_user_dashboard_version(user_id)], build)
+ 
\ No newline at end of file
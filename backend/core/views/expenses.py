@@ -2,7 +2,10 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
-from core.supabase.operations.credit_score_operations import CreditScoreOperations
+from core.supabase.pagination import parse_page_params
+from core.views.conditional import conditional_response
+from core.views.streaming import stream_pages, streaming_enabled, streaming_json_response
+from core.jobs import schedule_credit_score_updates
 
 
 class ExpensesView(viewsets.ViewSet):
@@ -14,7 +17,7 @@ class ExpensesView(viewsets.ViewSet):
         title = request.data.get("title")
         total_amount = request.data.get("totalAmount")
         firebase_id = request.data.get("firebaseId")
-        splits = request.data.get("splits", [])
+        splits = request.data.get("splits") or []
         due_date = request.data.get("dueDate")
         category = request.data.get("category")
 
@@ -24,6 +27,12 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        if not isinstance(splits, list) or not all(isinstance(split, dict) for split in splits):
+            return Response(
+                {"error": "splits must be a list of objects"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
         # Get user by Firebase ID
         user = supabase.users.get_by_firebase_id(firebase_id)
         if not user:
@@ -46,50 +55,24 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        expense_id = expense.get("id")
-
-        # Create splits if provided
-        created_splits = []
-        if splits:
-            for split in splits:
-                user_email = split.get("userEmail")
-                amount_owed = split.get("amountOwed")
-
-                if user_email and amount_owed is not None:
-                    # Get user by email
-                    split_user = supabase.users.get_by_email(user_email)
-                    if split_user:
-                        # Handle negative amounts (credits for expense creator)
-                        # If amount is negative, it means the user is getting credited for their portion
-                        # We store the absolute value but mark it as a credit
-                        actual_amount = abs(amount_owed)
-                        split_data = supabase.expenses.create_split(
-                            expense_id, split_user.get("id"), actual_amount
-                        )
-                        if split_data:
-                            # If this is a credit (negative amount), mark it as paid
-                            if amount_owed < 0:
-                                # Mark the split as paid since the creator is getting credited
-                                supabase.expenses.confirm_payment(split_data.get("id"), created_by)
-                            created_splits.append(split_data)
+        # Create splits if provided, skipping ones without an email, an amount or a known user
+        splits = [
+            split for split in splits
+            if split.get("userEmail") and split.get("amountOwed") is not None
+        ]
+        split_users = supabase.users.get_by_emails(split.get("userEmail") for split in splits)
+        # Negative amounts are credits for the expense creator, created as already paid
+        created_splits = supabase.expenses.create_splits(expense, [
+            (split_users[split.get("userEmail")].get("id"), split.get("amountOwed"))
+            for split in splits if split.get("userEmail") in split_users
+        ]) or []
 
         # Update group budget if group_id is provided
         if group_id:
             supabase.expenses.update_group_budget_after_expense(group_id, total_amount)
 
-        # Update credit scores for all users involved in the expense
-        try:
-            credit_score_ops = CreditScoreOperations(supabase.base_client)
-            # Update credit score for the expense creator
-            credit_score_ops.update_user_credit_score(created_by)
-            
-            # Update credit scores for all users who owe money
-            for split in created_splits:
-                if split and split.get('userid'):
-                    credit_score_ops.update_user_credit_score(split.get('userid'))
-        except Exception as e:
-            # Log error but don't fail the expense creation
-            print(f"Credit score update failed: {e}")
+        # Update credit scores of the creator and everyone who owes money, after responding
+        schedule_credit_score_updates([created_by] + [split.get('userid') for split in created_splits])
 
         return Response(
             {
@@ -129,6 +112,18 @@ class ExpensesView(viewsets.ViewSet):
 
         user_id = user.get("id")
 
+        if streaming_enabled():
+            lent_expenses = stream_pages(
+                lambda limit, cursor: supabase.expenses.get_user_lent_expenses_page(user_id, limit, cursor)
+            )
+            owed_splits = stream_pages(
+                lambda limit, cursor: supabase.expenses.get_user_owed_splits_page(user_id, limit, cursor)
+            )
+            return streaming_json_response({
+                "lent_expenses": lent_expenses or iter(()),
+                "owed_splits": owed_splits or iter(()),
+            })
+
         # Get expenses where user lent money
         lent_expenses = supabase.expenses.get_user_lent_expenses(user_id) or []
 
@@ -337,10 +332,60 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+        try:
+            limit, lent_cursor = parse_page_params(request.data, cursor_key="lentCursor")
+            owed_limit, owed_cursor = parse_page_params(request.data, cursor_key="owedCursor")
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
         user_id = user.get("id")
-        dashboard_data = supabase.expenses.get_user_dashboard_data(user_id)
 
-        return Response(dashboard_data)
+        def build():
+            if limit is None and owed_limit is None:
+                dashboard_data = supabase.expenses.get_user_dashboard_data(user_id)
+            else:
+                dashboard_data = supabase.expenses.get_user_dashboard_page(
+                    user_id, limit or owed_limit, lent_cursor, owed_cursor
+                )
+            if dashboard_data is None:
+                return Response(
+                    {"error": "Failed to retrieve dashboard data"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            return Response(dashboard_data)
+
+        return conditional_response(request, [supabase.expenses.get_user_dashboard_version(user_id)], build)
+
+    @action(detail=False, methods=["post"], url_path="dashboard-summary")
+    def get_dashboard_summary(self, request):
+        """Get the lent, owed and net totals of a user, without the expense and split lists."""
+        firebase_id = request.data.get("firebaseId")
+
+        if not firebase_id:
+            return Response(
+                {"error": "firebaseId is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = supabase.users.get_by_firebase_id(firebase_id)
+        if not user:
+            return Response(
+                {"error": "User not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        def build():
+            summary = supabase.expenses.get_user_dashboard_summary(user.get("id"))
+            if summary is None:
+                return Response(
+                    {"error": "Failed to retrieve dashboard summary"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            return Response(summary)
+
+        return conditional_response(request, [supabase.expenses.get_user_dashboard_version(user.get("id"))], build)
 
     @action(detail=False, methods=["post"], url_path="group-expenses")
     def get_group_expenses(self, request):
@@ -353,9 +398,38 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        expenses = supabase.expenses.get_group_expenses(group_id)
+        try:
+            limit, cursor = parse_page_params(request.data)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build():
+            if limit is None and streaming_enabled():
+                expenses = stream_pages(
+                    lambda size, page_cursor: supabase.expenses.get_group_expenses_page(group_id, size, page_cursor)
+                )
+                if expenses is None:
+                    return Response(
+                        {"error": "Failed to retrieve group expenses"},
+                        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    )
+                return streaming_json_response({"expenses": expenses})
+
+            if limit is None:
+                expenses = supabase.expenses.get_group_expenses(group_id)
+                return Response({"expenses": expenses})
+
+            page = supabase.expenses.get_group_expenses_page(group_id, limit, cursor)
+            if page is None:
+                return Response(
+                    {"error": "Failed to retrieve group expenses"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            expenses, next_cursor = page
+            return Response({"expenses": expenses, "next_cursor": next_cursor})
 
-        return Response({"expenses": expenses})
+        return conditional_response(request, [supabase.groups.get_group_version(group_id)], build)
 
     @action(detail=False, methods=["post"], url_path="expense-notification")
     def post_expense_notification(self, request):
@@ -435,13 +509,8 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        # Update credit score for the user who requested payment
-        try:
-            credit_score_ops = CreditScoreOperations(supabase.base_client)
-            credit_score_ops.update_user_credit_score(user_id)
-        except Exception as e:
-            # Log error but don't fail the payment request
-            print(f"Credit score update failed: {e}")
+        # Update credit score for the user who requested payment, after responding
+        schedule_credit_score_updates([user_id])
         
         return Response({"message": "Payment confirmation requested", "split": result})
 
@@ -465,23 +534,8 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        # Update credit score for the user who paid
-        try:
-            credit_score_ops = CreditScoreOperations(supabase.base_client)
-            # Get the user ID from the split
-            split_data = supabase.base_client._execute_query(
-                table_name=supabase.base_client.get_table_name("splits"),
-                operation='select',
-                filters={'id': split_id}
-            )
-            
-            if split_data:
-                user_id = split_data[0].get('userid')
-                if user_id:
-                    credit_score_ops.update_user_credit_score(user_id)
-        except Exception as e:
-            # Log error but don't fail the payment confirmation
-            print(f"Credit score update failed: {e}")
+        # Update credit score for the user who paid, after responding
+        schedule_credit_score_updates([result.get('userid')])
         
         return Response({"message": "Payment confirmed", "split": result})
 
@@ -505,23 +559,8 @@ class ExpensesView(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST,
             )
         
-        # Update credit score for the user whose payment was rejected
-        try:
-            credit_score_ops = CreditScoreOperations(supabase.base_client)
-            # Get the user ID from the split
-            split_data = supabase.base_client._execute_query(
-                table_name=supabase.base_client.get_table_name("splits"),
-                operation='select',
-                filters={'id': split_id}
-            )
-            
-            if split_data:
-                user_id = split_data[0].get('userid')
-                if user_id:
-                    credit_score_ops.update_user_credit_score(user_id)
-        except Exception as e:
-            # Log error but don't fail the payment rejection
-            print(f"Credit score update failed: {e}")
+        # Update credit score for the user whose payment was rejected, after responding
+        schedule_credit_score_updates([result.get('userid')])
         
         return Response({"message": "Payment rejected", "split": result})
 
@@ -4,6 +4,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
+from core.supabase.pagination import parse_page_params
+from core.views.conditional import conditional_response
+from core.views.streaming import stream_pages, streaming_enabled, streaming_json_response
 from core.supabase.operations.credit_score_operations import CreditScoreOperations
 from core.supabase.operations.expense_operations import ExpenseOperations
 from datetime import datetime, timedelta
@@ -170,12 +173,15 @@ class FriendRequestView(viewsets.ViewSet):
                 {"error": "Username is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        requests = supabase.friend_requests.get_incoming(to_user)
-        
-        if requests is None:
-            return Response({"error": "Failed to retrieve requests"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-        return Response({"requests": requests})
+        def build():
+            requests = supabase.friend_requests.get_incoming(to_user)
+
+            if requests is None:
+                return Response({"error": "Failed to retrieve requests"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            return Response({"requests": requests})
+
+        return conditional_response(request, [supabase.friend_requests.get_version(to_user)], build)
 
     @action(detail=False, methods=["post"], url_path="add-friend")
     def add_friend(self, request):
@@ -254,12 +260,15 @@ class FriendRequestView(viewsets.ViewSet):
                 {"error": "Username is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        requests = supabase.friend_requests.get_outgoing(from_user)
-        
-        if requests is None:
-            return Response({"error": "Failed to retrieve outgoing requests"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-        return Response({"requests": requests})
+        def build():
+            requests = supabase.friend_requests.get_outgoing(from_user)
+
+            if requests is None:
+                return Response({"error": "Failed to retrieve outgoing requests"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            return Response({"requests": requests})
+
+        return conditional_response(request, [supabase.friend_requests.get_version(from_user)], build)
 
     @action(detail=False, methods=["get"], url_path="get-friends")
     def get_friends(self, request):
@@ -270,12 +279,35 @@ class FriendRequestView(viewsets.ViewSet):
                 {"error": "Username is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        friends = supabase.friend_requests.get_friends(username)
-        
-        if friends is None:
-            return Response({"error": "Failed to retrieve friends"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
-        return Response({"friends": friends})
+        try:
+            limit, cursor = parse_page_params(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build():
+            if limit is not None:
+                page = supabase.friend_requests.get_friends_page(username, limit, cursor)
+                if page is None:
+                    return Response({"error": "Failed to retrieve friends"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                friends, next_cursor = page
+                return Response({"friends": friends, "next_cursor": next_cursor})
+
+            if streaming_enabled():
+                friends = stream_pages(
+                    lambda size, page_cursor: supabase.friend_requests.get_friends_page(username, size, page_cursor)
+                )
+                if friends is None:
+                    return Response({"error": "Failed to retrieve friends"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                return streaming_json_response({"friends": friends})
+
+            friends = supabase.friend_requests.get_friends(username)
+
+            if friends is None:
+                return Response({"error": "Failed to retrieve friends"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+            return Response({"friends": friends})
+
+        return conditional_response(request, [supabase.friend_requests.get_version(username)], build)
 
     @action(detail=False, methods=["post"], url_path="friend-analytics")
     def get_friend_analytics(self, request):
@@ -2,6 +2,20 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
+from core.views.conditional import conditional_response
+
+
+def format_group(group, members):
+    """Format a group and its members to match frontend expectations."""
+    return {
+        "id": group.get("id"),
+        "name": group.get("name"),
+        "description": group.get("description"),
+        "total_budget": group.get("total_budget"),
+        "creator_id": group.get("created_by"),
+        "created_at": group.get("created_at"),
+        "members": members or []
+    }
 
 
 class GroupsView(viewsets.ViewSet):
@@ -78,32 +92,26 @@ class GroupsView(viewsets.ViewSet):
             )
 
         user_id = user.get("id")
-        groups = supabase.groups.get_user_groups(user_id)
 
-        if groups is None:
-            return Response(
-                {"error": "Failed to retrieve groups"},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            )
+        def build():
+            groups = supabase.groups.get_user_groups(user_id)
 
-        # Format groups to match frontend expectations
-        formatted_groups = []
-        for group in groups:
-            # Get members for this group
-            members = supabase.groups.get_group_members(group.get("id"))
-            
-            formatted_group = {
-                "id": group.get("id"),
-                "name": group.get("name"),
-                "description": group.get("description"),
-                "total_budget": group.get("total_budget"),
-                "creator_id": group.get("created_by"),
-                "created_at": group.get("created_at"),
-                "members": members or []
-            }
-            formatted_groups.append(formatted_group)
+            if groups is None:
+                return Response(
+                    {"error": "Failed to retrieve groups"},
+                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                )
+
+            # Format groups to match frontend expectations
+            formatted_groups = []
+            for group in groups:
+                # Get members for this group
+                members = supabase.groups.get_group_members(group.get("id"))
+                formatted_groups.append(format_group(group, members))
+
+            return Response(formatted_groups)
 
-        return Response(formatted_groups)
+        return conditional_response(request, [supabase.groups.get_user_groups_version(user_id)], build)
 
     @action(detail=True, methods=["get"], url_path="detail")
     def get_group(self, request, pk=None):
@@ -126,17 +134,7 @@ class GroupsView(viewsets.ViewSet):
         # Get members for this group
         members = supabase.groups.get_group_members(group_id)
 
-        formatted_group = {
-            "id": group.get("id"),
-            "name": group.get("name"),
-            "description": group.get("description"),
-            "total_budget": group.get("total_budget"),
-            "creator_id": group.get("created_by"),
-            "created_at": group.get("created_at"),
-            "members": members or []
-        }
-
-        return Response(formatted_group)
+        return Response(format_group(group, members))
 
     @action(detail=True, methods=["put"], url_path="update")
     def update_group(self, request, pk=None):
@@ -0,0 +1,46 @@
+"""Views exposing runtime metrics of the backend."""
+
+import hmac
+
+from django.conf import settings
+from django.http import Http404, JsonResponse
+from django.views import View
+from core.jobs import credit_score_jobs
+from core.supabase import supabase
+from core.supabase.http_pool import http_pool
+from core.supabase.leaderboard import credit_score_leaderboard
+from core.supabase.operations.credit_score_operations import credit_score_stats_cache
+
+
+def _has_bearer_token(request, token: str) -> bool:
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+class MetricsView(View):
+    """
+    View for returning cache and data-access metrics of this worker process.
+
+    Open in DEBUG; otherwise the request needs the METRICS_TOKEN bearer token, and
+    without a configured token the view is not served.
+    """
+
+    def get(self, request):
+        """Handle GET requests."""
+        if not settings.DEBUG:
+            if not settings.METRICS_TOKEN:
+                raise Http404
+            if not _has_bearer_token(request, settings.METRICS_TOKEN):
+                return JsonResponse({"error": "Invalid metrics token"}, status=403)
+        metrics = {
+            "user_cache": supabase.users.cache_stats(),
+            "http_pool": http_pool.stats(),
+            "credit_score_jobs": credit_score_jobs.stats(),
+            "credit_score_leaderboard": credit_score_leaderboard.stats(),
+            "credit_score_stats_cache": credit_score_stats_cache.stats(),
+            "dashboard_cache": supabase.expenses.dashboard_cache.stats(),
+        }
+        engine = supabase.base_client.engine
+        if engine:
+            metrics["postgres_pool"] = engine.stats()
+        return JsonResponse(metrics)
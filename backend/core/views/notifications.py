@@ -2,6 +2,9 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from core.supabase import supabase
+from core.supabase.operations.notification_operations import NOTIFICATION_KEYSET
+from core.supabase.pagination import parse_page_params
+from core.views.conditional import conditional_response
 
 
 class NotificationsView(viewsets.ViewSet):
@@ -28,12 +31,31 @@ class NotificationsView(viewsets.ViewSet):
 
         # user_id = user.get("id")
 
-        notifications = supabase.notifications.get_all_unprocessed_notifications(firebase_id)
-        
-        if not notifications:
-            return Response([])
-        
-        return Response(notifications)
+        try:
+            limit, cursor = parse_page_params(request.data, columns=NOTIFICATION_KEYSET)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        def build():
+            if limit is not None:
+                # The response is a bare list, so the next cursor goes in a header
+                notifications, next_cursor = (
+                    supabase.notifications.get_unprocessed_notifications_page(firebase_id, limit, cursor)
+                    or ([], None)
+                )
+                response = Response(notifications)
+                if next_cursor:
+                    response["X-Next-Cursor"] = next_cursor
+                return response
+
+            notifications = supabase.notifications.get_all_unprocessed_notifications(firebase_id)
+
+            if not notifications:
+                return Response([])
+
+            return Response(notifications)
+
+        return conditional_response(request, [supabase.notifications.get_notifications_version(firebase_id)], build)
 
     @action(detail=False, methods=["post"], url_path="update-notification-processed")
     def update_notification_processed(self, request):
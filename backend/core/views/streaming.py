@@ -0,0 +1,69 @@
+"""Streamed JSON bodies for list endpoints, encoded as their rows are read."""
+
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from core.renderers import FastJSONRenderer
+from core.supabase.pagination import iterate_pages
+
+# Encoded rows are sent in chunks of about this many bytes
+STREAMING_CHUNK_BYTES = 16 * 1024
+
+
+def streaming_enabled() -> bool:
+    """Whether unpaged list requests are streamed (STREAM_LIST_RESPONSES)."""
+    return getattr(settings, "STREAM_LIST_RESPONSES", False)
+
+
+def stream_pages(fetch: Callable[[int, Optional[str]], Optional[Tuple[List[Dict], Optional[str]]]]) -> Optional[Iterator[Dict]]:
+    """The rows of a paged list, read STREAMING_PAGE_SIZE at a time. None if the first page fails."""
+    return iterate_pages(fetch, getattr(settings, "STREAMING_PAGE_SIZE", 200))
+
+
+def iter_json(fields: Mapping[str, Any], chunk_bytes: int = STREAMING_CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Encode a JSON object whose iterator values become arrays, one item at a time,
+    yielding chunks of about ``chunk_bytes``. Items are encoded as FastJSONRenderer
+    would encode them in a list.
+    """
+    renderer = FastJSONRenderer()
+
+    def encode(value: Any) -> bytes:
+        # render() returns an empty body for None
+        return b"null" if value is None else renderer.render(value)
+
+    def parts() -> Iterator[bytes]:
+        yield b"{"
+        for index, (key, value) in enumerate(fields.items()):
+            yield (b"," if index else b"") + encode(str(key)) + b":"
+            if not isinstance(value, Iterator):
+                yield encode(value)
+                continue
+            yield b"["
+            for position, item in enumerate(value):
+                yield (b"," if position else b"") + encode(item)
+            yield b"]"
+        yield b"}"
+
+    buffer = bytearray()
+    for part in parts():
+        buffer += part
+        if len(buffer) >= chunk_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    if buffer:
+        yield bytes(buffer)
+
+
+def streaming_json_response(fields: Mapping[str, Any]) -> StreamingHttpResponse:
+    """
+    A 200 response with the JSON of iter_json(fields), sent as it is encoded.
+
+    Rows read while the body is sent happen after the middleware has returned, so
+    X-DB-Queries and X-DB-Time-ms only count the queries made before the first
+    byte. If a later page fails the body is cut short rather than turned into an
+    error response.
+    """
+    return StreamingHttpResponse(iter_json(fields), content_type="application/json")
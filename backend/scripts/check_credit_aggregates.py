@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""
+Script to compare the stored credit score totals with a full recompute.
+Pass --repair to rebuild the totals of users that differ.
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.supabase import supabase
+
+
+def main():
+    """Check the credit score totals of all users."""
+    repair = '--repair' in sys.argv
+    print("🔍 Checking credit score totals against the split history...")
+
+    report = supabase.credit_scores.check_credit_aggregates(repair=repair)
+
+    print(f"📊 Results:")
+    print(f"   - Checked users: {report['checked']}")
+    print(f"   - Without totals yet: {report['missing']}")
+    print(f"   - Mismatched: {report['mismatched']}")
+    for mismatch in report['mismatches']:
+        print(f"     • {mismatch['user_id']}: totals give {mismatch['aggregate_score']}, "
+              f"full recompute gives {mismatch['expected_score']}")
+    if repair:
+        print(f"   - Repaired: {report['repaired']}")
+    elif report['mismatched']:
+        print("Run with --repair to rebuild the mismatched totals.")
+
+    return report['mismatched'] == report['repaired']
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,165 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+
+from create_tables import SupabaseTableCreator
+
+
+class SupabaseFunctionCreator(SupabaseTableCreator):
+    """Create the database functions called through BaseSupabaseClient.rpc, for the tables of create_tables.py."""
+
+    def create_dashboard_totals_function(self):
+        """Create the function returning a user's lent, owed and net totals for the dashboard"""
+        function_name = self.get_table_name("get_user_dashboard_totals")
+        expenses_table = self.get_table_name("expenses")
+        splits_table = self.get_table_name("splits")
+        sql = f"""
+        CREATE OR REPLACE FUNCTION {function_name}(p_user_id UUID)
+        RETURNS JSON
+        LANGUAGE sql
+        STABLE
+        AS $$
+            WITH lent AS (
+                -- Expenses with no splits or at least one unconfirmed split
+                SELECT COALESCE(SUM(e.total_amount), 0) AS total
+                FROM {expenses_table} e
+                WHERE e.created_by = p_user_id
+                  AND NOT COALESCE((
+                      SELECT BOOL_AND(s.paid_confirmed IS NOT NULL)
+                      FROM {splits_table} s
+                      WHERE s.expenseId = e.id
+                  ), FALSE)
+            ),
+            owed AS (
+                SELECT COALESCE(SUM(s.amount_owed), 0) AS total
+                FROM {splits_table} s
+                WHERE s.userId = p_user_id AND s.paid_confirmed IS NULL
+            )
+            SELECT json_build_object('lent', lent.total, 'owed', owed.total, 'net', lent.total - owed.total)
+            FROM lent, owed
+        $$;
+
+        -- Make the function visible to the REST API without a restart
+        NOTIFY pgrst, 'reload schema';
+        """
+
+        print(f"🔧 Creating function: {function_name}")
+        return self.execute_sql(sql)
+
+    def create_credit_score_stats_function(self):
+        """Create the function returning user counts, the average credit score and a score histogram"""
+        function_name = self.get_table_name("get_credit_score_stats")
+        users_table = self.get_table_name("users")
+        sql = f"""
+        CREATE OR REPLACE FUNCTION {function_name}(p_edges INTEGER[] DEFAULT ARRAY[550, 650, 750])
+        RETURNS JSON
+        LANGUAGE sql
+        STABLE
+        AS $$
+            WITH totals AS (
+                SELECT COUNT(*) AS total_users,
+                       COUNT(credit_score) AS users_with_scores,
+                       ROUND(AVG(credit_score), 2) AS average_score
+                FROM {users_table}
+            ),
+            buckets AS (
+                -- Bucket 0 is below the first edge, bucket i from edge i up to edge i + 1
+                SELECT width_bucket(credit_score, p_edges) AS bucket, COUNT(*) AS users
+                FROM {users_table}
+                WHERE credit_score IS NOT NULL
+                GROUP BY 1
+            )
+            SELECT json_build_object(
+                'total_users', totals.total_users,
+                'users_with_scores', totals.users_with_scores,
+                'average_score', totals.average_score,
+                'histogram', (
+                    SELECT json_agg(COALESCE(buckets.users, 0) ORDER BY n)
+                    FROM generate_series(0, COALESCE(array_length(p_edges, 1), 0)) AS n
+                    LEFT JOIN buckets ON buckets.bucket = n
+                )
+            )
+            FROM totals
+        $$;
+
+        -- Make the function visible to the REST API without a restart
+        NOTIFY pgrst, 'reload schema';
+        """
+
+        print(f"🔧 Creating function: {function_name}")
+        return self.execute_sql(sql)
+
+    def create_credit_score_aggregate_deltas_function(self):
+        """Create the function adding split changes to users' stored credit score totals"""
+        function_name = self.get_table_name("add_credit_score_aggregate_deltas")
+        aggregates_table = self.get_table_name("credit_score_aggregates")
+        sql = f"""
+        CREATE OR REPLACE FUNCTION {function_name}(p_deltas JSON)
+        RETURNS INTEGER
+        LANGUAGE sql
+        AS $$
+            -- One atomic increment per user, so concurrent callers cannot lose updates.
+            -- Users without stored totals are skipped; they are rebuilt from the splits.
+            WITH updated AS (
+                UPDATE {aggregates_table} a
+                SET split_count = a.split_count + d.split_count,
+                    on_time_count = a.on_time_count + d.on_time_count,
+                    late_count = a.late_count + d.late_count,
+                    unpaid_count = a.unpaid_count + d.unpaid_count,
+                    paid_count = a.paid_count + d.paid_count,
+                    request_count = a.request_count + d.request_count,
+                    confirmation_count = a.confirmation_count + d.confirmation_count,
+                    confirmation_hours_sum = a.confirmation_hours_sum + d.confirmation_hours_sum,
+                    outstanding_debt = a.outstanding_debt + d.outstanding_debt,
+                    historical_debt = a.historical_debt + d.historical_debt,
+                    payment_time_count = a.payment_time_count + d.payment_time_count,
+                    payment_time_sum = a.payment_time_sum + d.payment_time_sum,
+                    payment_time_sq_sum = a.payment_time_sq_sum + d.payment_time_sq_sum,
+                    updated_at = NOW()
+                FROM json_to_recordset(p_deltas) AS d(
+                    user_id UUID,
+                    split_count INTEGER,
+                    on_time_count INTEGER,
+                    late_count INTEGER,
+                    unpaid_count INTEGER,
+                    paid_count INTEGER,
+                    request_count INTEGER,
+                    confirmation_count INTEGER,
+                    confirmation_hours_sum DOUBLE PRECISION,
+                    outstanding_debt BIGINT,
+                    historical_debt BIGINT,
+                    payment_time_count INTEGER,
+                    payment_time_sum DOUBLE PRECISION,
+                    payment_time_sq_sum DOUBLE PRECISION
+                )
+                WHERE a.user_id = d.user_id
+                RETURNING 1
+            )
+            SELECT COUNT(*)::INTEGER FROM updated
+        $$;
+
+        -- Make the function visible to the REST API without a restart
+        NOTIFY pgrst, 'reload schema';
+        """
+
+        print(f"🔧 Creating function: {function_name}")
+        return self.execute_sql(sql)
+
+    def create_all_functions(self):
+        """Create all functions. The tables must exist already."""
+        if not self.create_dashboard_totals_function():
+            return False
+        if not self.create_credit_score_stats_function():
+            return False
+        if not self.create_credit_score_aggregate_deltas_function():
+            return False
+
+        print("\n🎉 All functions created successfully!")
+        return True
+
+
+# Run the function creation
+if __name__ == "__main__":
+    creator = SupabaseFunctionCreator()
+    creator.create_all_functions()
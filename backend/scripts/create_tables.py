@@ -243,6 +243,32 @@ class SupabaseTableCreator:
         
         return self.execute_sql(sql)
     
+    def create_credit_score_aggregates_table(self):
+        """Create credit score aggregates table (running split totals per user, rebuilt from splits when missing)"""
+        table_name = self.get_table_name("credit_score_aggregates")
+        sql = f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            user_id UUID PRIMARY KEY,
+            split_count INTEGER NOT NULL DEFAULT 0,
+            on_time_count INTEGER NOT NULL DEFAULT 0,
+            late_count INTEGER NOT NULL DEFAULT 0,
+            unpaid_count INTEGER NOT NULL DEFAULT 0,
+            paid_count INTEGER NOT NULL DEFAULT 0,
+            request_count INTEGER NOT NULL DEFAULT 0,
+            confirmation_count INTEGER NOT NULL DEFAULT 0,
+            confirmation_hours_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            outstanding_debt BIGINT NOT NULL DEFAULT 0,
+            historical_debt BIGINT NOT NULL DEFAULT 0,
+            payment_time_count INTEGER NOT NULL DEFAULT 0,
+            payment_time_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            payment_time_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+            FOREIGN KEY (user_id) REFERENCES {self.get_table_name('users')}(id) ON DELETE CASCADE
+        );
+        """
+        
+        return self.execute_sql(sql)
+    
     def backup_and_recreate_all_tables(self):
         """Backup existing tables, delete them, and recreate them."""
         users_table = self.get_table_name("users")
@@ -251,8 +277,12 @@ class SupabaseTableCreator:
         group_memberships_table = self.get_table_name("group_memberships")
         expenses_table = self.get_table_name("expenses")
         splits_table = self.get_table_name("splits")
+        credit_score_aggregates_table = self.get_table_name("credit_score_aggregates")
         
         # Backup and delete in reverse dependency order
+        if not self.backup_and_delete_table(credit_score_aggregates_table):
+            return False
+            
         if not self.backup_and_delete_table(splits_table):
             return False
             
@@ -290,6 +320,9 @@ class SupabaseTableCreator:
         if not self.create_splits_table():
             return False
         
+        if not self.create_credit_score_aggregates_table():
+            return False
+        
         print("\n🎉 All tables backed up and recreated successfully!")
         return True
     
@@ -313,6 +346,9 @@ class SupabaseTableCreator:
         if not self.create_splits_table():
             return False
         
+        if not self.create_credit_score_aggregates_table():
+            return False
+        
         print("\n🎉 All tables created successfully!")
         return True
 
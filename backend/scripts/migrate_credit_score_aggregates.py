@@ -0,0 +1,50 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(__file__))
+
+from create_tables import SupabaseTableCreator
+
+
+class CreditScoreAggregatesMigrator(SupabaseTableCreator):
+    """Move stored payment time totals from a running mean and variance to plain sums."""
+
+    def migrate_payment_time_columns(self):
+        """Replace payment_time_mean and payment_time_m2 with payment_time_sum and payment_time_sq_sum (safe to re-run)"""
+        table_name = self.get_table_name("credit_score_aggregates")
+        sql = f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name = '{table_name}' AND column_name = 'payment_time_m2'
+            ) THEN
+                ALTER TABLE {table_name}
+                    ADD COLUMN IF NOT EXISTS payment_time_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                    ADD COLUMN IF NOT EXISTS payment_time_sq_sum DOUBLE PRECISION NOT NULL DEFAULT 0;
+                -- sum = n * mean and sum of squares = m2 + n * mean^2, so no totals are lost
+                UPDATE {table_name}
+                SET payment_time_sum = payment_time_count * payment_time_mean,
+                    payment_time_sq_sum = payment_time_m2 + payment_time_count * payment_time_mean * payment_time_mean;
+                ALTER TABLE {table_name}
+                    DROP COLUMN payment_time_mean,
+                    DROP COLUMN payment_time_m2;
+            END IF;
+        END
+        $$;
+
+        -- Make the new columns visible to the REST API without a restart
+        NOTIFY pgrst, 'reload schema';
+        """
+
+        print(f"🔧 Migrating table: {table_name}")
+        return self.execute_sql(sql)
+
+
+# Run the migration
+if __name__ == "__main__":
+    migrator = CreditScoreAggregatesMigrator()
+    if migrator.migrate_payment_time_columns():
+        print("\n🎉 Migration completed successfully!")
+    else:
+        print("\n❌ Migration failed!")
@@ -1,6 +1,12 @@
 import os
+import sys
 from dotenv import load_dotenv
-from supabase import create_client
+from supabase import create_client, ClientOptions
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from core.supabase.http_pool import http_pool
 
 load_dotenv()
 
@@ -13,8 +19,8 @@ try:
         print("❌ DB_URL and DB_KEY must be set in environment variables")
         exit(1)
     
-    # Create Supabase client
-    supabase = create_client(supabase_url, supabase_key)
+    # Create Supabase client on the shared connection pool
+    supabase = create_client(supabase_url, supabase_key, options=ClientOptions(httpx_client=http_pool.client()))
     
     # Test connection by trying a simple query
     result = supabase.table("development_users").select("id").limit(1).execute()
@@ -27,4 +33,6 @@ try:
     # This would be handled by the create_tables.py script
     
 except Exception as e:
-    print("❌ Connection failed:", e) 
\ No newline at end of file
+    print("❌ Connection failed:", e)
+finally:
+    http_pool.close() 
\ No newline at end of file